@@ -12,7 +12,7 @@ from application.srs_adapter import VocabularyReviewProvider
 from domain.models import VocabularyStatus
 from fastapi import APIRouter, Depends, HTTPException
 from infrastructure.database import get_db
-from infrastructure.repositories import VocabularyRepository
+from infrastructure.repositories import CHANGE_ADD, VocabularyRepository, record_changes
 from sqlalchemy.orm import Session
 from srs_core.models import LearningStatus, ReviewSession
 from srs_core.scheduler import SpacedRepetitionEngine
@@ -48,6 +48,7 @@ async def ensure_user_has_cards(user_id: str, vocab_repo: VocabularyRepository):
     # Import VocabularyEntryModel for SQL execution
     from infrastructure.models import VocabularyEntryModel
 
+    added = []
     for word in default_words:
         # Check if word already exists for this user
         existing = db.query(VocabularyEntryModel).filter_by(
@@ -66,7 +67,10 @@ async def ensure_user_has_cards(user_id: str, vocab_repo: VocabularyRepository):
                 review_interval=0
             )
             db.add(entry)
+            added.append(word)
 
+    db.flush()
+    record_changes(db, user_id, [("vocabulary", word, CHANGE_ADD) for word in added])
     db.commit()
 
 router = APIRouter(
@@ -5,8 +5,9 @@ Presentation layer that exposes the application services via HTTP
 """
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
+from datetime import datetime
 from typing import List, Optional
 
 from infrastructure.database import get_db
@@ -21,6 +22,24 @@ class MarkWordRequest(BaseModel):
     word: str
 
 
+# Largest accepted batch for the bulk word endpoints
+MAX_BATCH_WORDS = 1000
+
+
+# Largest page of the library / vocabulary listings
+MAX_PAGE_SIZE = 500
+SORT_PATTERN = "^(added_at|word)$"
+ORDER_PATTERN = "^(asc|desc)$"
+
+# Most change log entries returned by one /changes call
+MAX_CHANGES_PAGE = 5000
+
+
+class MarkWordsRequest(BaseModel):
+    """Request model for marking many words at once"""
+    words: List[str] = Field(..., max_length=MAX_BATCH_WORDS)
+
+
 class HighlightWordsRequest(BaseModel):
     """Request model for getting highlighted words"""
     user_id: str
@@ -78,6 +97,21 @@ async def get_user(user_id: str, db: Session = Depends(get_db)):
     return result
 
 
+@router.get("/{user_id}/changes")
+async def get_changes(
+    user_id: str,
+    since: int = Query(0, ge=0),
+    limit: int = Query(1000, ge=1, le=MAX_CHANGES_PAGE),
+    service: UserApplicationService = Depends(get_user_service)
+):
+    """
+    Incremental sync: words added to / removed from the user's lists since
+    change sequence `since`. Pass the returned seq as `since` next time;
+    repeat while has_more; reload everything if reset is true.
+    """
+    return service.get_changes(user_id, since, limit)
+
+
 @router.get("/{user_id}/known-words")
 async def get_known_words(user_id: str, db: Session = Depends(get_db)):
     """Get user's known words list"""
@@ -97,6 +131,26 @@ async def mark_word_as_known(
     return result
 
 
+@router.post("/{user_id}/known-words/batch")
+async def mark_words_as_known(
+    user_id: str,
+    request: MarkWordsRequest,
+    service: UserApplicationService = Depends(get_user_service)
+):
+    """Mark multiple words as known (one transaction, per-word results)"""
+    return service.mark_words_as_known(user_id, request.words)
+
+
+@router.post("/{user_id}/known-words/batch-remove")
+async def unmark_words_as_known(
+    user_id: str,
+    request: MarkWordsRequest,
+    service: UserApplicationService = Depends(get_user_service)
+):
+    """Remove multiple words from known words"""
+    return service.unmark_words_as_known(user_id, request.words)
+
+
 @router.delete("/{user_id}/known-words/{word}")
 async def unmark_word_as_known(
     user_id: str,
@@ -127,6 +181,26 @@ async def mark_word_as_unknown(
     return result
 
 
+@router.post("/{user_id}/unknown-words/batch")
+async def mark_words_as_unknown(
+    user_id: str,
+    request: MarkWordsRequest,
+    service: UserApplicationService = Depends(get_user_service)
+):
+    """Mark multiple words as unknown (one transaction, per-word results)"""
+    return service.mark_words_as_unknown(user_id, request.words)
+
+
+@router.post("/{user_id}/unknown-words/batch-remove")
+async def unmark_words_as_unknown(
+    user_id: str,
+    request: MarkWordsRequest,
+    service: UserApplicationService = Depends(get_user_service)
+):
+    """Remove multiple words from unknown words"""
+    return service.unmark_words_as_unknown(user_id, request.words)
+
+
 @router.delete("/{user_id}/unknown-words/{word}")
 async def unmark_word_as_unknown(
     user_id: str,
@@ -139,14 +213,52 @@ async def unmark_word_as_unknown(
 
 
 @router.get("/{user_id}/vocabulary")
-async def get_vocabulary(user_id: str, db: Session = Depends(get_db)):
-    """Get user's vocabulary list"""
-    service = UserApplicationService(UserRepository(db))
-    user_data = service.get_user_data(user_id)
-    return {
-        "success": True,
-        "vocabulary": user_data["vocabulary"]
-    }
+async def get_vocabulary(
+    user_id: str,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    sort: Optional[str] = Query(None, pattern=SORT_PATTERN),
+    order: Optional[str] = Query(None, pattern=ORDER_PATTERN),
+    status: Optional[str] = None,
+    added_after: Optional[datetime] = None,
+    added_before: Optional[datetime] = None,
+    service: UserApplicationService = Depends(get_user_service)
+):
+    """
+    Get user's vocabulary list
+
+    Without limit / cursor: every word, as a list of strings (in the order
+    they were added unless sort / order is given).
+    With them: one page of entries plus next_cursor for the following page
+    (default: sort=added_at, order=desc).
+    """
+    try:
+        result = service.list_vocabulary(
+            user_id, limit, cursor, sort, order, status, added_after, added_before
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if limit is None and cursor is None:
+        return {
+            "success": True,
+            "vocabulary": [entry["word"] for entry in result["vocabulary"]]
+        }
+    return result
+
+
+@router.get("/{user_id}/vocabulary/count")
+async def count_vocabulary(
+    user_id: str,
+    status: Optional[str] = None,
+    added_after: Optional[datetime] = None,
+    added_before: Optional[datetime] = None,
+    service: UserApplicationService = Depends(get_user_service)
+):
+    """Count user's vocabulary words (total and per status)"""
+    try:
+        return service.count_vocabulary(user_id, status, added_after, added_before)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.post("/{user_id}/vocabulary")
@@ -174,13 +286,56 @@ async def remove_from_vocabulary(
 # Library Routes (for words user wants to learn)
 
 @router.get("/{user_id}/library")
-async def get_library(user_id: str, db: Session = Depends(get_db)):
-    """Get user's library words (words to learn) with context"""
-    service = UserApplicationService(UserRepository(db))
-    result = service.get_library(user_id)
+async def get_library(
+    user_id: str,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    sort: Optional[str] = Query(None, pattern=SORT_PATTERN),
+    order: Optional[str] = Query(None, pattern=ORDER_PATTERN),
+    status: Optional[str] = None,
+    added_after: Optional[datetime] = None,
+    added_before: Optional[datetime] = None,
+    include_contexts: Optional[bool] = None,
+    service: UserApplicationService = Depends(get_user_service)
+):
+    """
+    Get user's library words (words to learn) with context
+
+    Without limit / cursor: every entry with its contexts (in the order they
+    were added unless sort / order is given).
+    With them: one page plus next_cursor for the following page (default:
+    sort=added_at, order=desc); contexts only with include_contexts=true
+    (otherwise a context_count per entry).
+    """
+    paginated = limit is not None or cursor is not None
+    if include_contexts is None:
+        include_contexts = not paginated
+    try:
+        result = service.list_library(
+            user_id, limit, cursor, sort, order, status, added_after, added_before, include_contexts
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not paginated:
+        del result["next_cursor"]
     return result
 
 
+@router.get("/{user_id}/library/count")
+async def count_library(
+    user_id: str,
+    status: Optional[str] = None,
+    added_after: Optional[datetime] = None,
+    added_before: Optional[datetime] = None,
+    service: UserApplicationService = Depends(get_user_service)
+):
+    """Count user's library words (total and per status)"""
+    try:
+        return service.count_library(user_id, status, added_after, added_before)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @router.post("/{user_id}/library")
 async def add_to_library(
     user_id: str,
@@ -203,6 +358,21 @@ async def remove_from_library(
     return result
 
 
+@router.get("/{user_id}/library/{word}/contexts")
+async def get_library_contexts(
+    user_id: str,
+    word: str,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    service: UserApplicationService = Depends(get_user_service)
+):
+    """Get the sentences captured for a library word, newest first (cursor paginated)"""
+    try:
+        return service.get_library_contexts(user_id, word, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 # ========== Domain Management Routes ==========
 
 # Blacklist endpoints
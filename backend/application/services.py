@@ -5,13 +5,40 @@ Coordinates domain logic, infrastructure, and data access
 Implements specific business use cases
 """
 
-from typing import Dict, List, Optional
+import os
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
 
-from domain.models import User, Word
+from domain.models import User, VocabularyStatus, Word
 from domain.services import DifficultyService, HighlightService
+from domain.tokenizer import tokenize_with_offsets
+from infrastructure.highlight_cache import HighlightResultCache, highlight_result_cache, page_fingerprint
 from infrastructure.models import DomainPolicyType
 from infrastructure.repositories import DomainManagementPolicyRepository, UserRepository
 
+# Tokens per chunk of a streamed highlight response
+HIGHLIGHT_STREAM_CHUNK_SIZE = int(os.getenv("HIGHLIGHT_STREAM_CHUNK_SIZE", "2000"))
+
+
+def _list_order(limit: Optional[int], cursor: Optional[str], sort: Optional[str], order: Optional[str]):
+    """
+    (sort, descending) of a listing: newest first by default when paging;
+    insertion order for an unpaginated listing without sort / order, as
+    before the listings were paginated
+    """
+    if limit is None and cursor is None and sort is None and order is None:
+        return "id", False
+    return sort or "added_at", (order or "desc") == "desc"
+
+
+def _parse_status(status: Optional[str]) -> Optional[VocabularyStatus]:
+    if status is None:
+        return None
+    try:
+        return VocabularyStatus(status.lower())
+    except ValueError:
+        raise ValueError(f"Unknown status: {status}")
+
 
 class UserApplicationService:
     """
@@ -26,9 +53,7 @@ class UserApplicationService:
         Use case: User marks a word as known
         Returns the updated user
         """
-        user = self.user_repository.get_user(user_id)
-        user.add_known_word(word)
-        self.user_repository.save_user(user)
+        self.user_repository.mark_known_word(user_id, word)
         return {"success": True, "message": "Word marked as known"}
 
     def mark_word_as_unknown(self, user_id: str, word: str):
@@ -36,61 +61,113 @@ class UserApplicationService:
         Use case: User marks a word as unknown/not knowing
         Returns the updated user
         """
-        user = self.user_repository.get_user(user_id)
-        user.add_unknown_word(word)
-        self.user_repository.save_user(user)
+        self.user_repository.mark_unknown_word(user_id, word)
         return {"success": True, "message": "Word marked as unknown"}
 
     def unmark_word_as_known(self, user_id: str, word: str):
         """
         Use case: User removes a word from known list
         """
-        user = self.user_repository.get_user(user_id)
-        user.remove_known_word(word)
-        self.user_repository.save_user(user)
+        self.user_repository.remove_known_word(user_id, word)
         return {"success": True, "message": "Word removed from known list"}
 
     def unmark_word_as_unknown(self, user_id: str, word: str):
         """
         Use case: User removes a word from unknown list
         """
-        user = self.user_repository.get_user(user_id)
-        user.remove_unknown_word(word)
-        self.user_repository.save_user(user)
+        self.user_repository.remove_unknown_word(user_id, word)
         return {"success": True, "message": "Word removed from unknown list"}
 
     def add_to_vocabulary(self, user_id: str, word: str):
         """
         Use case: User adds a word to vocabulary for learning
         """
-        user = self.user_repository.get_user(user_id)
-        user.add_to_vocabulary(word)
-        self.user_repository.save_user(user)
+        self.user_repository.add_vocabulary_word(user_id, word)
         return {"success": True, "message": "Word added to vocabulary"}
 
     def remove_from_vocabulary(self, user_id: str, word: str):
         """
         Use case: User removes a word from vocabulary
         """
-        user = self.user_repository.get_user(user_id)
-        user.remove_from_vocabulary(word)
-        self.user_repository.save_user(user)
+        self.user_repository.remove_vocabulary_word(user_id, word)
         return {"success": True, "message": "Word removed from vocabulary"}
 
+    def mark_words_as_known(self, user_id: str, words: List[str]):
+        """
+        Use case: User marks many words as known at once (batch marking panel)
+        """
+        return self._bulk_result(user_id, words, self.user_repository.mark_known_words)
+
+    def mark_words_as_unknown(self, user_id: str, words: List[str]):
+        """
+        Use case: User marks many words as unknown at once
+        """
+        return self._bulk_result(user_id, words, self.user_repository.mark_unknown_words)
+
+    def unmark_words_as_known(self, user_id: str, words: List[str]):
+        """
+        Use case: User removes many words from the known list
+        """
+        return self._bulk_result(user_id, words, self.user_repository.remove_known_words)
+
+    def unmark_words_as_unknown(self, user_id: str, words: List[str]):
+        """
+        Use case: User removes many words from the unknown list
+        """
+        return self._bulk_result(user_id, words, self.user_repository.remove_unknown_words)
+
+    @staticmethod
+    def _bulk_result(user_id: str, words: List[str], command) -> Dict:
+        """Run a bulk repository command; one outcome per distinct word, in request order"""
+        valid = [word.strip() for word in words if word and word.strip()]
+        outcomes = command(user_id, valid) if valid else {}
+
+        results = []
+        seen = set()
+        for word in words:
+            word_lower = (word or "").strip().lower()
+            if not word_lower:
+                results.append({"word": word, "status": "invalid", "removed_from": []})
+                continue
+            if word_lower in seen:
+                continue
+            seen.add(word_lower)
+            results.append({"word": word_lower, **outcomes[word_lower]})
+
+        counts = {}
+        for result in results:
+            counts[result["status"]] = counts.get(result["status"], 0) + 1
+        return {
+            "success": True,
+            "results": results,
+            "counts": counts
+        }
+
     def get_user_data(self, user_id: str):
         """
         Use case: Get user's complete data
-        Returns known_words, unknown_words, and vocabulary
+        Returns known_words, unknown_words, and vocabulary, plus the change
+        sequence they reflect (the starting point for get_changes)
         """
+        # Read before the lists: changes made meanwhile are then re-sent, never missed
+        seq = self.user_repository.get_change_seq(user_id)
         user = self.user_repository.get_user(user_id)
         return {
             "success": True,
             "user_id": user.user_id,
             "known_words": list(user.known_words),
             "unknown_words": list(user.unknown_words),
-            "vocabulary": list(user.vocabulary.keys())
+            "vocabulary": list(user.vocabulary.keys()),
+            "seq": seq
         }
 
+    def get_changes(self, user_id: str, since: int, limit: int = 1000):
+        """
+        Use case: Incremental sync - adds and removes since change sequence `since`
+        (the seq of GET /users/{user_id} or of the previous call)
+        """
+        return {"success": True, **self.user_repository.get_changes(user_id, since, limit)}
+
     def get_known_words(self, user_id: str):
         """Get user's known words list"""
         words = self.user_repository.get_known_words(user_id)
@@ -111,49 +188,123 @@ class UserApplicationService:
         """
         Use case: Get user's library words with learning context
         """
-        user = self.user_repository.get_user(user_id)
+        page = self.user_repository.list_library(user_id, sort="id", descending=False, include_contexts=True)
         return {
             "success": True,
-            "library": user.get_library_with_context()
+            "library": page["items"]
         }
 
+    def list_library(
+        self,
+        user_id: str,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        sort: Optional[str] = None,
+        order: Optional[str] = None,
+        status: Optional[str] = None,
+        added_after: Optional[datetime] = None,
+        added_before: Optional[datetime] = None,
+        include_contexts: bool = False
+    ):
+        """
+        Use case: Page through the library, sorted and filtered in the database
+        Raises ValueError for an unknown status, sort field or a malformed cursor.
+        """
+        sort, descending = _list_order(limit, cursor, sort, order)
+        page = self.user_repository.list_library(
+            user_id, limit, cursor, sort, descending, _parse_status(status),
+            added_after, added_before, include_contexts
+        )
+        return {
+            "success": True,
+            "library": page["items"],
+            "next_cursor": page["next_cursor"]
+        }
+
+    def list_vocabulary(
+        self,
+        user_id: str,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        sort: Optional[str] = None,
+        order: Optional[str] = None,
+        status: Optional[str] = None,
+        added_after: Optional[datetime] = None,
+        added_before: Optional[datetime] = None
+    ):
+        """
+        Use case: Page through the vocabulary, sorted and filtered in the database
+        Raises ValueError for an unknown status, sort field or a malformed cursor.
+        """
+        sort, descending = _list_order(limit, cursor, sort, order)
+        page = self.user_repository.list_vocabulary(
+            user_id, limit, cursor, sort, descending, _parse_status(status),
+            added_after, added_before
+        )
+        return {
+            "success": True,
+            "vocabulary": page["items"],
+            "next_cursor": page["next_cursor"]
+        }
+
+    def count_library(self, user_id: str, status: Optional[str] = None,
+                      added_after: Optional[datetime] = None, added_before: Optional[datetime] = None):
+        """Use case: Number of library words (total and per status)"""
+        counts = self.user_repository.count_library(user_id, _parse_status(status), added_after, added_before)
+        return {"success": True, **counts}
+
+    def count_vocabulary(self, user_id: str, status: Optional[str] = None,
+                         added_after: Optional[datetime] = None, added_before: Optional[datetime] = None):
+        """Use case: Number of vocabulary words (total and per status)"""
+        counts = self.user_repository.count_vocabulary(user_id, _parse_status(status), added_after, added_before)
+        return {"success": True, **counts}
+
     def add_to_library(self, user_id: str, words: List[str], contexts: List[Dict] = None):
         """
         Use case: Add words to library with learning context
+        Runs as a narrow repository command: only new entries and new
+        context sentences are written.
         """
-        user = self.user_repository.get_user(user_id)
+        word_contexts: Dict[str, list] = {}
 
         # Handle contexts: if provided, associate them with the words
         if contexts:
             # If contexts provided, assume first word gets all contexts
             # (for backward compatibility with current frontend)
             if len(words) == 1:
-                user.add_to_library(words, contexts)
+                word_contexts[words[0]] = list(contexts)
             else:
                 # Multiple words: distribute contexts evenly or assign empty contexts
                 contexts_per_word = len(contexts) // len(words) if contexts else 0
                 for i, word in enumerate(words):
                     start_idx = i * contexts_per_word
                     end_idx = (i + 1) * contexts_per_word if i < len(words) - 1 else len(contexts)
-                    word_contexts = contexts[start_idx:end_idx] if contexts else []
-                    user.add_to_library([word], word_contexts)
+                    word_contexts.setdefault(word.lower(), []).extend(contexts[start_idx:end_idx])
         else:
-            user.add_to_library(words, [])
+            for word in words:
+                word_contexts.setdefault(word.lower(), [])
 
-        self.user_repository.save_user(user)
+        self.user_repository.add_library_words(user_id, word_contexts)
         return {
             "success": True,
             "message": f"{len(words)} word(s) added to library",
             "added_count": len(words)
         }
 
+    def get_library_contexts(self, user_id: str, word: str, limit: int = 20, cursor: Optional[str] = None):
+        """
+        Use case: Page through the sentences captured for a library word
+        """
+        page = self.user_repository.get_library_contexts(user_id, word, limit, cursor)
+        if page is None:
+            return {"success": False, "error": "Word not in library"}
+        return {"success": True, "word": word.lower(), **page}
+
     def remove_from_library(self, user_id: str, word: str):
         """
         Use case: Remove a word from library
         """
-        user = self.user_repository.get_user(user_id)
-        user.remove_from_library(word)
-        self.user_repository.save_user(user)
+        self.user_repository.remove_library_word(user_id, word)
         return {"success": True, "message": "Word removed from library"}
 
 
@@ -162,21 +313,39 @@ class HighlightApplicationService:
     Highlight application service - coordinates word highlighting logic
     """
 
-    def __init__(self, user_repository: UserRepository, dictionary_service):
+    def __init__(
+        self,
+        user_repository: UserRepository,
+        dictionary_service,
+        result_cache: Optional[HighlightResultCache] = None
+    ):
         self.user_repository = user_repository
         self.dictionary_service = dictionary_service
+        self.result_cache = result_cache if result_cache is not None else highlight_result_cache
 
     def get_highlighted_words(
         self,
         user_id: str,
         words: List[str],
         difficulty_level: str,
-        difficulty_mrs: Optional[int] = None
+        difficulty_mrs: Optional[int] = None,
+        fingerprint: Optional[str] = None,
+        compact: bool = False
     ) -> Dict:
         """
         Use case: Get words that should be highlighted based on:
         1. user_id's known_words and unknown_words (Priority 1)
         2. difficulty_level (Priority 2) - OR difficulty_mrs if provided
+
+        Tokens are collapsed to unique lowercased forms before any lookup
+        and expanded back only when the response is built. By default
+        highlighted_words / word_details follow the request, one entry per
+        occurrence. With `compact=True`, highlighted_words is the sorted
+        list of distinct requested forms and word_details has one entry per
+        lowercased word.
+
+        Every response carries the page fingerprint; when the caller passes
+        the current one back, only {"unchanged": True} is returned.
         """
         # Validate difficulty level if MRS not provided
         if difficulty_mrs is None and not DifficultyService.is_valid_level(difficulty_level):
@@ -185,56 +354,245 @@ class HighlightApplicationService:
                 "error": f"Invalid difficulty level: {difficulty_level}"
             }
 
-        # Load user data
-        user = self.user_repository.get_user(user_id)
+        # Load only the known / unknown sets (cached per user)
+        user = self.user_repository.get_highlight_profile(user_id)
 
-        highlighted = []
-        word_details = []
-
-        for word_text in words:
-            word_lower = word_text.lower()
-            
-            # Lookup word info using Hybrid Dictionary Service
-            word_info = self.dictionary_service.lookup(word_text)
-            
-            # Priority 1: Check if user explicitly marked as unknown
-            if word_lower in user.unknown_words:
-                highlighted.append(word_text)
-                word_details.append({
-                    "word": word_text,
-                    "cefr_level": word_info.get("level", "Unknown"),
-                    "mrs": word_info.get("mrs", 0),
-                    "phonetic": word_info.get("phonetic", ""),
-                    "pos": word_info.get("pos", "unknown"),
-                    "chinese": word_info.get("translation", ""),
-                    "reason": "user_marked_unknown"
-                })
-                continue
+        unique_forms = list(dict.fromkeys(words))
+        unique_words = list(dict.fromkeys(form.lower() for form in unique_forms))
+        current = page_fingerprint(
+            unique_words, difficulty_level, difficulty_mrs, user.version,
+            self.dictionary_service.generation, compact
+        )
+        if fingerprint == current:
+            return {
+                "success": True,
+                "unchanged": True,
+                "fingerprint": current
+            }
 
-            # Priority 2: Check if user explicitly marked as known
-            if word_lower in user.known_words:
-                continue
+        details = self._page_details(current, unique_words, user, difficulty_level, difficulty_mrs)
 
-            # Priority 3: Apply Difficulty Logic
+        # Detail per distinct requested form, echoing its original casing
+        form_details = {}
+        for form in unique_forms:
+            detail = details.get(form.lower())
+            if detail is not None:
+                form_details[form] = detail if detail["word"] == form else {**detail, "word": form}
+
+        highlighted = [word_text for word_text in words if word_text in form_details]
+        result = {
+            "success": True,
+            "difficulty_level": difficulty_level,
+            "difficulty_mrs": difficulty_mrs,
+            "total_words": len(words),
+            "highlighted_count": len(highlighted),
+            "fingerprint": current
+        }
+
+        if compact:
+            result["compact"] = True
+            result["unique_words"] = len(unique_words)
+            result["highlighted_words"] = sorted(form_details)
+            result["word_details"] = [details[word] for word in sorted({form.lower() for form in form_details})]
+            return result
+
+        result["highlighted_words"] = highlighted
+        result["word_details"] = [form_details[word_text] for word_text in highlighted]
+        return result
+
+    def highlight_text(
+        self,
+        user_id: str,
+        blocks: List[str],
+        difficulty_level: str,
+        difficulty_mrs: Optional[int] = None
+    ) -> Dict:
+        """
+        Use case: Highlight raw text blocks (e.g. a page's text nodes)
+
+        The blocks are tokenized here, with the extension's word pattern, and
+        run through the same collapsed pipeline as get_highlighted_words.
+        For each block the response lists the [start, end] offsets of the
+        highlighted words (UTF-16 code units, as JavaScript indexes strings);
+        word_details has one entry per lowercased highlighted word.
+        """
+        if difficulty_mrs is None and not DifficultyService.is_valid_level(difficulty_level):
+            return {
+                "success": False,
+                "error": f"Invalid difficulty level: {difficulty_level}"
+            }
+
+        user = self.user_repository.get_highlight_profile(user_id)
+
+        tokenized = [
+            [(start, end, word.lower()) for start, end, word in tokenize_with_offsets(block)]
+            for block in blocks
+        ]
+        unique_words = list(dict.fromkeys(word for tokens in tokenized for _, _, word in tokens))
+        current = page_fingerprint(
+            unique_words, difficulty_level, difficulty_mrs, user.version, self.dictionary_service.generation
+        )
+        details = self._page_details(current, unique_words, user, difficulty_level, difficulty_mrs)
+
+        block_offsets = [
+            [[start, end] for start, end, word in tokens if word in details]
+            for tokens in tokenized
+        ]
+        highlighted = {word for tokens in tokenized for _, _, word in tokens if word in details}
+        return {
+            "success": True,
+            "difficulty_level": difficulty_level,
+            "difficulty_mrs": difficulty_mrs,
+            "total_words": sum(len(tokens) for tokens in tokenized),
+            "unique_words": len(unique_words),
+            "highlighted_count": sum(len(offsets) for offsets in block_offsets),
+            "fingerprint": current,
+            "blocks": block_offsets,
+            "word_details": [details[word] for word in sorted(highlighted)]
+        }
+
+    def stream_highlighted_words(
+        self,
+        user_id: str,
+        words: List[str],
+        difficulty_level: str,
+        difficulty_mrs: Optional[int] = None,
+        chunk_size: int = HIGHLIGHT_STREAM_CHUNK_SIZE
+    ) -> Iterator[Dict]:
+        """
+        Use case: Highlight a long document chunk by chunk
+
+        Yields a header first, then one message per `chunk_size` tokens as
+        soon as that chunk is decided, then a summary:
+        - {"type": "start", ...} (or {"success": False, "error"} and nothing else)
+        - {"type": "chunk", "index", "start", "end", "highlighted_words",
+           "word_details"}: highlighted_words are the distinct highlighted
+           forms in words[start:end]; word_details only covers lowercased
+           words not detailed in an earlier chunk
+        - {"type": "end", "total_words", "highlighted_count", "unique_words"}
+
+        The user's profile is loaded when the header is produced, so callers
+        may release the database session after the first message. Only one
+        chunk's results are held at a time; what persists across chunks is
+        the set of words already decided, which is bounded by the vocabulary
+        rather than the document length. The page result cache is bypassed.
+        """
+        if difficulty_mrs is None and not DifficultyService.is_valid_level(difficulty_level):
+            yield {
+                "success": False,
+                "error": f"Invalid difficulty level: {difficulty_level}"
+            }
+            return
+
+        user = self.user_repository.get_highlight_profile(user_id)
+        chunk_size = max(1, chunk_size)
+        yield {
+            "type": "start",
+            "success": True,
+            "difficulty_level": difficulty_level,
+            "difficulty_mrs": difficulty_mrs,
+            "total_words": len(words),
+            "chunk_size": chunk_size
+        }
+
+        # Decided lowercased words, and which of them are highlighted
+        seen = set()
+        highlighted = set()
+        highlighted_count = 0
+        for index, start in enumerate(range(0, len(words), chunk_size)):
+            chunk = words[start:start + chunk_size]
+            unique_forms = list(dict.fromkeys(chunk))
+            new_words = [
+                word for word in dict.fromkeys(form.lower() for form in unique_forms)
+                if word not in seen
+            ]
+            details = self._highlight_details(new_words, user, difficulty_level, difficulty_mrs) if new_words else {}
+            seen.update(new_words)
+            highlighted.update(details)
+
+            forms = [form for form in unique_forms if form.lower() in highlighted]
+            form_set = set(forms)
+            highlighted_count += sum(1 for word_text in chunk if word_text in form_set)
+            yield {
+                "type": "chunk",
+                "index": index,
+                "start": start,
+                "end": start + len(chunk),
+                "highlighted_words": forms,
+                "word_details": list(details.values())
+            }
+
+        yield {
+            "type": "end",
+            "total_words": len(words),
+            "highlighted_count": highlighted_count,
+            "unique_words": len(seen)
+        }
+
+    def _page_details(
+        self,
+        fingerprint: str,
+        unique_words: List[str],
+        user,
+        difficulty_level: str,
+        difficulty_mrs: Optional[int]
+    ) -> Dict[str, dict]:
+        """Page highlight details, from the result cache when the fingerprint is known"""
+        details = self.result_cache.get(fingerprint)
+        if details is None:
+            details = self._highlight_details(unique_words, user, difficulty_level, difficulty_mrs)
+            self.result_cache.put(fingerprint, details)
+        return details
+
+    def _highlight_details(
+        self,
+        unique_words: List[str],
+        user,
+        difficulty_level: str,
+        difficulty_mrs: Optional[int]
+    ) -> Dict[str, dict]:
+        """Word detail for each distinct lowercased word that should be highlighted"""
+        details = {}
+
+        # Priority 1 / 2: the user's own marks decide before any dictionary work
+        marked_unknown = [w for w in unique_words if w in user.unknown_words]
+        unmarked = [w for w in unique_words if w not in user.unknown_words and w not in user.known_words]
+
+        # Priority 3: Core Library words are decided at once by the precomputed
+        # difficulty index; only words it cannot resolve are scored one by one
+        passing, unresolved = self.dictionary_service.partition_by_difficulty(
+            unmarked, difficulty_level, difficulty_mrs
+        )
+
+        # Fetch details only for words that may be highlighted, in one batch
+        # (highlighting never shows definitions, so skip the long text)
+        word_infos = self.dictionary_service.lookup_many(
+            marked_unknown + passing + unresolved, with_definition=False
+        )
+
+        for word_lower in marked_unknown:
+            word_info = word_infos[word_lower]
+            details[word_lower] = {
+                "word": word_lower,
+                "cefr_level": word_info.get("level", "Unknown"),
+                "mrs": word_info.get("mrs", 0),
+                "phonetic": word_info.get("phonetic", ""),
+                "pos": word_info.get("pos", "unknown"),
+                "chinese": word_info.get("translation", ""),
+                "reason": "user_marked_unknown"
+            }
+
+        for word_lower in passing:
+            details[word_lower] = self._difficulty_detail(word_lower, word_infos[word_lower])
+
+        for word_lower in unresolved:
+            word_info = word_infos[word_lower]
             if not word_info["found"]:
                 continue
-                
-            # Use dynamic MRS from dictionary service if curated one is missing
-            mrs_score = word_info.get("mrs")
-            if mrs_score is None:
-                # If truly unknown, default to 100, but dictionary_service.lookup
-                # should now provide dynamic MRS for Tier 2 words.
-                mrs_score = 100
-            
-            cefr_level = word_info.get("level") or "C2"
-            
-            # Create domain Word object
-            word_obj = Word(word_text, cefr_level)
-            # Inject MRS into word object (monkey patch for now, or update model later)
-            word_obj.mrs = mrs_score
+
+            word_obj = self._scored_word(word_lower, word_info)
 
             # Check if should highlight
-            should_highlight = False
             if difficulty_mrs is not None:
                 # Use granular MRS logic
                 should_highlight = HighlightService.should_highlight_mrs(
@@ -253,25 +611,35 @@ class HighlightApplicationService:
                 )
 
             if should_highlight:
-                highlighted.append(word_text)
-                word_details.append({
-                    "word": word_text,
-                    "cefr_level": cefr_level,
-                    "mrs": mrs_score,
-                    "phonetic": word_info.get("phonetic", ""),
-                    "pos": word_info.get("pos"),
-                    "chinese": word_info.get("translation", ""),
-                    "reason": "difficulty_based"
-                })
-
+                details[word_lower] = self._difficulty_detail(word_lower, word_info)
+
+        return details
+
+    @staticmethod
+    def _scored_word(word_lower: str, word_info: Dict) -> Word:
+        """Domain Word carrying the level and MRS used by the difficulty rules"""
+        # Use dynamic MRS from dictionary service if curated one is missing
+        mrs_score = word_info.get("mrs")
+        if mrs_score is None:
+            # If truly unknown, default to 100, but dictionary_service.lookup
+            # should now provide dynamic MRS for Tier 2 words.
+            mrs_score = 100
+
+        word_obj = Word(word_lower, word_info.get("level") or "C2")
+        # Inject MRS into word object (monkey patch for now, or update model later)
+        word_obj.mrs = mrs_score
+        return word_obj
+
+    def _difficulty_detail(self, word_lower: str, word_info: Dict) -> Dict:
+        word_obj = self._scored_word(word_lower, word_info)
         return {
-            "success": True,
-            "difficulty_level": difficulty_level,
-            "difficulty_mrs": difficulty_mrs,
-            "total_words": len(words),
-            "highlighted_count": len(highlighted),
-            "highlighted_words": highlighted,
-            "word_details": word_details
+            "word": word_lower,
+            "cefr_level": word_obj.cefr_level,
+            "mrs": word_obj.mrs,
+            "phonetic": word_info.get("phonetic", ""),
+            "pos": word_info.get("pos"),
+            "chinese": word_info.get("translation", ""),
+            "reason": "difficulty_based"
         }
 
 
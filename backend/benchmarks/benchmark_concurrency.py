@@ -0,0 +1,145 @@
+"""
+Load test: highlight latency under rising concurrency
+
+Fires POST /highlight-words at increasing concurrency against the app
+in-process (httpx ASGI transport) and reports p50 / p99 latency, plus the
+p99 of a /health probe that runs alongside the load. Two modes:
+
+- inline:    handlers call the session / DictionaryService on the event
+             loop (the previous behaviour)
+- offloaded: handlers hand the work to the bounded blocking_executor pool
+
+Usage:
+    python benchmarks/benchmark_concurrency.py
+
+Runs against a temporary database with a synthetic Tier 2 dictionary and
+the lookup cache disabled, so every request reaches SQLite.
+"""
+
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+TMP_DIR = tempfile.TemporaryDirectory()
+DB_PATH = os.path.join(TMP_DIR.name, "mixread.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+os.environ["DICTIONARY_CACHE_SIZE"] = "0"
+
+import httpx
+
+from benchmark_tier2_projection import create_synthetic_dictionary
+from build_dictionary_slim import build_slim_table
+
+DICTIONARY_WORDS = 100000
+WORDS_PER_PAGE = 400
+REQUESTS_PER_LEVEL = 200
+CONCURRENCY_LEVELS = [1, 4, 16, 64]
+PROBE_INTERVAL = 0.01
+
+
+class InlineExecutor:
+    """Runs the blocking call directly on the event loop"""
+
+    async def run(self, func, *args, **kwargs):
+        return func(*args, **kwargs)
+
+    def stats(self):
+        return {}
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+async def run_level(client, words, concurrency):
+    rng = random.Random(concurrency)
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, probes = [], []
+    done = asyncio.Event()
+
+    async def highlight(i):
+        async with semaphore:
+            payload = {
+                "user_id": f"load_user_{i % 8}",
+                "words": rng.sample(words, WORDS_PER_PAGE),
+                "difficulty_level": "B1",
+            }
+            start = time.perf_counter()
+            response = await client.post("/highlight-words", json=payload)
+            latencies.append((time.perf_counter() - start) * 1000)
+            response.raise_for_status()
+
+    async def probe():
+        while not done.is_set():
+            start = time.perf_counter()
+            await client.get("/health")
+            probes.append((time.perf_counter() - start) * 1000)
+            await asyncio.sleep(PROBE_INTERVAL)
+
+    probe_task = asyncio.create_task(probe())
+    start = time.perf_counter()
+    await asyncio.gather(*(highlight(i) for i in range(REQUESTS_PER_LEVEL)))
+    elapsed = time.perf_counter() - start
+    done.set()
+    await probe_task
+    return latencies, probes, REQUESTS_PER_LEVEL / elapsed
+
+
+async def run_mode(app, words):
+    rows = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await run_level(client, words, 1)  # warm up connections and user rows
+        for concurrency in CONCURRENCY_LEVELS:
+            latencies, probes, throughput = await run_level(client, words, concurrency)
+            rows.append((
+                concurrency,
+                statistics.median(latencies),
+                percentile(latencies, 99),
+                percentile(probes, 99),
+                throughput,
+            ))
+    return rows
+
+
+def main():
+    print(f"Generating {DICTIONARY_WORDS:,}-word synthetic dictionary...")
+    writer = create_synthetic_dictionary(DB_PATH, DICTIONARY_WORDS)
+    build_slim_table(writer)
+    writer.dispose()
+
+    import main as app_module
+    from infrastructure.database import init_db
+    from infrastructure.executor import blocking_executor
+
+    init_db()
+    from sqlalchemy import create_engine, text
+    with create_engine(f"sqlite:///{DB_PATH}").connect() as conn:
+        words = [row[0] for row in conn.execute(text("SELECT word FROM dictionary"))]
+    words += [f"unknownword{i}" for i in range(DICTIONARY_WORDS // 10)]
+
+    results = {}
+    for mode, executor in (("inline", InlineExecutor()), ("offloaded", blocking_executor)):
+        app_module.blocking_executor = executor
+        results[mode] = asyncio.run(run_mode(app_module.app, words))
+    blocking_executor.shutdown()
+
+    print(f"\n{REQUESTS_PER_LEVEL} requests x {WORDS_PER_PAGE} words per level, "
+          f"pool size {blocking_executor.max_workers}\n")
+    print(f"{'mode':<11}{'conc':>6}{'p50 ms':>10}{'p99 ms':>10}{'health p99':>12}{'req/s':>9}")
+    for mode, rows in results.items():
+        for concurrency, p50, p99, probe_p99, throughput in rows:
+            print(f"{mode:<11}{concurrency:>6}{p50:>10.1f}{p99:>10.1f}{probe_p99:>12.1f}{throughput:>9.0f}")
+
+    TMP_DIR.cleanup()
+
+
+if __name__ == "__main__":
+    main()
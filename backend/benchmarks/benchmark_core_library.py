@@ -0,0 +1,99 @@
+"""
+Benchmark: Tier 1 Core Library memory footprint
+
+Compares the legacy dict-of-dicts layout of cefr_words.json with the
+columnar CoreLibrary used by DictionaryService.
+
+Usage:
+    python benchmarks/benchmark_core_library.py [path/to/cefr_words.json]
+
+Without a path, data/cefr_words.json is used; if that is missing a
+synthetic 30k-word library with the same shape is generated.
+"""
+
+import gc
+import json
+import os
+import random
+import string
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from infrastructure.core_library import CoreLibrary
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "cefr_words.json")
+SYNTHETIC_WORDS = 30000
+
+
+def synthetic_library(size: int) -> str:
+    """Generate a cefr_words.json-shaped document"""
+    rng = random.Random(42)
+    levels = ["A1", "A2", "B1", "B2", "C1", "C2", "Unknown"]
+    pos_values = ["n", "v", "adj", "adv", "n:60/v:40", "prep", "conj"]
+    data = {}
+    for rank in range(1, size + 1):
+        word = "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 12)))
+        data[f"{word}{rank}"] = {
+            "pos": rng.choice(pos_values),
+            "cefr": rng.choice(levels),
+            "level": rng.choice(levels),
+            "mrs": min(120, rank // 250),
+            "rank": rank,
+            "chn": "".join(chr(0x4e00 + rng.randint(0, 2000)) for _ in range(rng.randint(2, 6))),
+            "def": " ".join(rng.choice(["a", "the", "to", "of", "thing", "act", "state", "person"]) for _ in range(rng.randint(4, 14))),
+            "ph": "".join(rng.choice("ɪəæʌʊɒeɔːstnrdkl") for _ in range(rng.randint(3, 9))),
+        }
+    return json.dumps(data, ensure_ascii=False)
+
+
+def measure(build):
+    """Return (retained_bytes, seconds, result) for building a structure"""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    retained, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return retained, elapsed, result
+
+
+def time_lookups(get_mrs, words, rounds: int = 5) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for word in words:
+            get_mrs(word)
+    return (time.perf_counter() - start) / (rounds * len(words)) * 1e9
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PATH
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            raw = f.read()
+        source = path
+    else:
+        raw = synthetic_library(SYNTHETIC_WORDS)
+        source = f"synthetic ({SYNTHETIC_WORDS} words)"
+
+    dict_bytes, dict_secs, legacy = measure(lambda: json.loads(raw))
+    columnar_bytes, columnar_secs, library = measure(lambda: CoreLibrary.from_dict(json.loads(raw)))
+
+    words = list(legacy)
+    dict_ns = time_lookups(lambda w: legacy[w].get("mrs"), words)
+    columnar_ns = time_lookups(lambda w: library.mrs_of(library.row(w)), words)
+
+    print(f"Core Library: {source}, {len(library)} words\n")
+    print(f"{'layout':<14}{'retained MB':>14}{'build s':>10}{'mrs lookup ns':>16}")
+    print(f"{'dict of dicts':<14}{dict_bytes / 1e6:>14.1f}{dict_secs:>10.2f}{dict_ns:>16.0f}")
+    print(f"{'columnar':<14}{columnar_bytes / 1e6:>14.1f}{columnar_secs:>10.2f}{columnar_ns:>16.0f}")
+    print(f"\nMemory saved per worker: {(dict_bytes - columnar_bytes) / 1e6:.1f} MB "
+          f"({(1 - columnar_bytes / dict_bytes) * 100:.0f}%)")
+
+
+if __name__ == "__main__":
+    main()
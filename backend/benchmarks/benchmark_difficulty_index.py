@@ -0,0 +1,82 @@
+"""
+Benchmark: difficulty decisions for a 5k-token page
+
+Compares, for the Core Library words of one page (distinct lowercased
+words, no user marks):
+
+- per-word: lookup_many() formats every word, then a domain Word is
+  built and HighlightService.should_highlight_mrs() is called per word
+  (the previous _highlight_details loop)
+- index:    partition_by_difficulty() resolves rows and ANDs the page
+  bitset with the precomputed threshold bitset
+
+Usage:
+    python benchmarks/benchmark_difficulty_index.py
+"""
+
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmark_core_library import SYNTHETIC_WORDS, synthetic_library
+
+from application.services import HighlightApplicationService
+from domain.services import HighlightService
+from infrastructure.core_library import CoreLibrary, resolve_surface_forms
+from infrastructure.dictionary import LookupCache, dictionary_service
+
+PAGE_TOKENS = 5000
+THRESHOLD = 60
+RUNS = 50
+
+
+def per_word(words):
+    infos = dictionary_service.lookup_many(words, with_definition=False)
+    passing = []
+    for word in words:
+        word_obj = HighlightApplicationService._scored_word(word, infos[word])
+        if HighlightService.should_highlight_mrs(word_obj, THRESHOLD, set(), set()):
+            passing.append(word)
+    return passing
+
+
+def with_index(words):
+    passing, _unresolved = dictionary_service.partition_by_difficulty(words, "B1", THRESHOLD)
+    return passing
+
+
+def main():
+    library = CoreLibrary.from_dict(json.loads(synthetic_library(SYNTHETIC_WORDS)))
+    dictionary_service.cefr_data = library
+    dictionary_service.variant_map = {}
+    dictionary_service.resolved_forms = resolve_surface_forms(library, {})
+    dictionary_service.cache = LookupCache()
+
+    rng = random.Random(11)
+    vocabulary = list(library)
+    page = rng.choices(vocabulary, k=PAGE_TOKENS)
+    words = list(dict.fromkeys(page))
+
+    start = time.perf_counter()
+    dictionary_service.difficulty_index
+    build_ms = (time.perf_counter() - start) * 1000
+    assert per_word(words) == with_index(words)
+
+    print(f"{len(library):,} Core Library rows, index built in {build_ms:.0f} ms")
+    print(f"{PAGE_TOKENS} tokens -> {len(words)} distinct words, MRS threshold {THRESHOLD}\n")
+    for name, decide in (("per-word", per_word), ("index", with_index)):
+        timings = []
+        for _ in range(RUNS):
+            start = time.perf_counter()
+            decide(words)
+            timings.append((time.perf_counter() - start) * 1e6)
+        print(f"{name:<10}{statistics.median(timings):>10.0f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Benchmark: Tier 3 external-definition fallback for /batch-word-info misses
+
+Runs a local stub of the Free Dictionary API (fixed per-request latency)
+and compares:
+
+- sequential: one new httpx.AsyncClient per word, awaited one after another
+  (the previous get_word_definition_external behaviour)
+- fetch_many: ExternalDefinitionSource with a shared pooled client and
+  bounded concurrent fan-out
+- warm: the same words from a fresh source (restart / another worker),
+  served by the persistent definition cache
+
+Usage:
+    python benchmarks/benchmark_external_fallback.py
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from sqlalchemy import create_engine
+
+from infrastructure.definition_cache import DefinitionCache
+from infrastructure.external_dictionary import ExternalDefinitionSource, parse_entries
+
+STUB_LATENCY = 0.05
+MISS_COUNTS = [1, 10, 40]
+
+
+class StubServer(ThreadingHTTPServer):
+    # The default listen backlog of 5 drops connects when the pool opens 8 at once
+    request_queue_size = 64
+    daemon_threads = True
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        time.sleep(STUB_LATENCY)
+        word = self.path.rsplit("/", 1)[-1]
+        body = json.dumps([{"word": word, "meanings": [{"definitions": [{"definition": f"meaning of {word}"}]}]}]).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+async def sequential(base_url, words):
+    for word in words:
+        async with httpx.AsyncClient(timeout=5.0) as client:
+            response = await client.get(f"{base_url}/{word}")
+            parse_entries(response.json())
+
+
+async def pooled(source, words):
+    await source.fetch_many(words)
+
+
+def main():
+    server = StubServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}/api/v2/entries/en"
+
+    tmp_dir = tempfile.TemporaryDirectory()
+    cache = DefinitionCache(engine=create_engine(f"sqlite:///{os.path.join(tmp_dir.name, 'cache.db')}"))
+    cache.create_table()
+
+    async def run():
+        print(f"Stub latency {STUB_LATENCY * 1000:.0f} ms\n")
+        print(f"{'misses':>7}{'sequential ms':>16}{'fetch_many ms':>16}{'warm ms':>10}")
+        for count in MISS_COUNTS:
+            words = [f"word{count}_{i}" for i in range(count)]
+            start = time.perf_counter()
+            await sequential(base_url, words)
+            before = (time.perf_counter() - start) * 1000
+
+            source = ExternalDefinitionSource(base_url=base_url, budget=30.0, cache=cache)
+            start = time.perf_counter()
+            await pooled(source, words)
+            after = (time.perf_counter() - start) * 1000
+            await source.aclose()
+
+            restarted = ExternalDefinitionSource(base_url=base_url, budget=30.0, cache=cache)
+            start = time.perf_counter()
+            await pooled(restarted, words)
+            warm = (time.perf_counter() - start) * 1000
+            await restarted.aclose()
+            print(f"{count:>7}{before:>16.1f}{after:>16.1f}{warm:>10.1f}")
+
+    asyncio.run(run())
+    server.shutdown()
+    tmp_dir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark: highlight pipeline CPU time and JSON payload per page
+
+Builds a 3,000-token page with a Zipf-like word distribution (so "the"
+and friends repeat hundreds of times, some capitalized) and times
+HighlightApplicationService.get_highlighted_words with the page result
+cache disabled, in the default per-occurrence response mode and in
+compact mode. Reports the serialized response size of each.
+
+Usage:
+    python benchmarks/benchmark_highlight_payload.py
+"""
+
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+TMP_DIR = tempfile.TemporaryDirectory()
+DB_PATH = os.path.join(TMP_DIR.name, "mixread.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+
+from sqlalchemy import create_engine, text
+
+from benchmark_tier2_projection import create_synthetic_dictionary
+from build_dictionary_slim import build_slim_table
+
+DICTIONARY_WORDS = 50000
+VOCABULARY = 1200
+PAGE_TOKENS = 3000
+RUNS = 30
+
+
+def zipf_page(words, rng):
+    vocabulary = rng.sample(words, VOCABULARY)
+    weights = [1 / (rank + 1) for rank in range(VOCABULARY)]
+    page = rng.choices(vocabulary, weights=weights, k=PAGE_TOKENS)
+    # Sentence starts are capitalized
+    return [w.capitalize() if rng.random() < 0.08 else w for w in page]
+
+
+def main():
+    writer = create_synthetic_dictionary(DB_PATH, DICTIONARY_WORDS)
+    build_slim_table(writer)
+    writer.dispose()
+
+    import infrastructure.models  # noqa: F401  (registers tables for init_db)
+    from application.services import HighlightApplicationService
+    from infrastructure.database import SessionLocal, init_db
+    from infrastructure.dictionary import dictionary_service
+    from infrastructure.highlight_cache import HighlightResultCache
+    from infrastructure.repositories import UserRepository
+
+    init_db()
+    with create_engine(f"sqlite:///{DB_PATH}").connect() as conn:
+        words = [row[0] for row in conn.execute(text("SELECT word FROM dictionary"))]
+    page = zipf_page(words, random.Random(3))
+
+    db = SessionLocal()
+    service = HighlightApplicationService(UserRepository(db), dictionary_service, HighlightResultCache(max_size=0))
+    service.get_highlighted_words("bench_user", page, "A1")  # warm the lookup cache
+
+    print(f"\n{PAGE_TOKENS} tokens, {len(set(page))} distinct forms, "
+          f"{len({w.lower() for w in page})} distinct words\n")
+    print(f"{'mode':<10}{'p50 ms':>10}{'payload KB':>13}{'details':>10}")
+    for mode, compact in (("default", False), ("compact", True)):
+        timings = []
+        for _ in range(RUNS):
+            start = time.perf_counter()
+            result = service.get_highlighted_words("bench_user", page, "A1", compact=compact)
+            body = json.dumps(result, ensure_ascii=False).encode("utf-8")
+            timings.append((time.perf_counter() - start) * 1000)
+        print(f"{mode:<10}{statistics.median(timings):>10.2f}{len(body) / 1024:>13.1f}{len(result['word_details']):>10}")
+
+    db.close()
+    TMP_DIR.cleanup()
+
+
+if __name__ == "__main__":
+    main()
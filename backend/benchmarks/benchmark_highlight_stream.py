@@ -0,0 +1,97 @@
+"""
+Benchmark: streamed vs whole-document highlighting of a long document
+
+Builds a 200,000-token document (Zipf-like over a 20k-word vocabulary,
+roughly a novel) and compares, with the page result cache disabled:
+
+- whole:   get_highlighted_words() + json.dumps of the full response
+- stream:  stream_highlighted_words(), serializing each NDJSON line
+
+Reports time until the first highlights are available, total time, and
+the Python heap peak (tracemalloc) while producing the response.
+
+Usage:
+    python benchmarks/benchmark_highlight_stream.py
+"""
+
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+TMP_DIR = tempfile.TemporaryDirectory()
+DB_PATH = os.path.join(TMP_DIR.name, "mixread.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+
+from sqlalchemy import create_engine, text
+
+from benchmark_tier2_projection import create_synthetic_dictionary
+from build_dictionary_slim import build_slim_table
+
+DICTIONARY_WORDS = 50000
+VOCABULARY = 20000
+DOCUMENT_TOKENS = 200000
+
+
+def whole(service, document):
+    start = time.perf_counter()
+    body = json.dumps(service.get_highlighted_words("bench_user", document, "A1"), ensure_ascii=False)
+    elapsed = time.perf_counter() - start
+    return elapsed, elapsed, len(body)
+
+
+def stream(service, document):
+    start = time.perf_counter()
+    first = None
+    size = 0
+    for message in service.stream_highlighted_words("bench_user", document, "A1"):
+        size += len(json.dumps(message, ensure_ascii=False)) + 1
+        if first is None and message.get("type") == "chunk":
+            first = time.perf_counter() - start
+    return first, time.perf_counter() - start, size
+
+
+def main():
+    writer = create_synthetic_dictionary(DB_PATH, DICTIONARY_WORDS)
+    build_slim_table(writer)
+    writer.dispose()
+
+    import infrastructure.models  # noqa: F401  (registers tables for init_db)
+    from application.services import HighlightApplicationService
+    from infrastructure.database import SessionLocal, init_db
+    from infrastructure.dictionary import LookupCache, dictionary_service
+    from infrastructure.highlight_cache import HighlightResultCache
+    from infrastructure.repositories import UserRepository
+
+    init_db()
+    with create_engine(f"sqlite:///{DB_PATH}").connect() as conn:
+        words = [row[0] for row in conn.execute(text("SELECT word FROM dictionary"))]
+    rng = random.Random(5)
+    vocabulary = rng.sample(words, VOCABULARY)
+    weights = [1 / (rank + 1) for rank in range(VOCABULARY)]
+    document = rng.choices(vocabulary, weights=weights, k=DOCUMENT_TOKENS)
+
+    db = SessionLocal()
+    service = HighlightApplicationService(UserRepository(db), dictionary_service, HighlightResultCache(max_size=0))
+
+    print(f"\n{DOCUMENT_TOKENS:,} tokens, {len(set(document)):,} distinct words\n")
+    print(f"{'mode':<8}{'first ms':>10}{'total ms':>10}{'output MB':>11}{'peak MB':>9}")
+    for name, run in (("whole", whole), ("stream", stream)):
+        dictionary_service.cache = LookupCache()  # cold lookups for both
+        tracemalloc.start()
+        first, total, size = run(service, document)
+        _current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{name:<8}{first * 1000:>10.0f}{total * 1000:>10.0f}{size / 2**20:>11.1f}{peak / 2**20:>9.1f}")
+
+    db.close()
+    TMP_DIR.cleanup()
+
+
+if __name__ == "__main__":
+    main()
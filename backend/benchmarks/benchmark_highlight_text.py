@@ -0,0 +1,119 @@
+"""
+Benchmark: /highlight-text request size and server time vs /highlight-words
+
+Builds a 3,000-token page as 150 text blocks (Zipf-like words, capitalized
+sentence starts, punctuation) and compares:
+
+- words:      the extension tokenizes and posts every token (compact reply)
+- text:       the raw blocks are posted and tokenized server-side
+- text+gzip:  the same JSON body sent with Content-Encoding: gzip
+
+Server time includes body decoding, JSON parsing and the highlight use
+case, with the page result cache disabled.
+
+Usage:
+    python benchmarks/benchmark_highlight_text.py
+"""
+
+import gzip
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+TMP_DIR = tempfile.TemporaryDirectory()
+DB_PATH = os.path.join(TMP_DIR.name, "mixread.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+
+from sqlalchemy import create_engine, text
+
+from benchmark_tier2_projection import create_synthetic_dictionary
+from build_dictionary_slim import build_slim_table
+
+DICTIONARY_WORDS = 50000
+VOCABULARY = 1200
+PAGE_TOKENS = 3000
+BLOCK_TOKENS = 20
+RUNS = 30
+
+# Synthetic words end in their row number; spell the digits as letters so
+# they survive tokenization
+LETTERS_ONLY = str.maketrans("0123456789", "abcdefghij")
+
+
+def zipf_page(words, rng):
+    vocabulary = rng.sample(words, VOCABULARY)
+    weights = [1 / (rank + 1) for rank in range(VOCABULARY)]
+    page = rng.choices(vocabulary, weights=weights, k=PAGE_TOKENS)
+    # Sentence starts are capitalized
+    return [w.capitalize() if rng.random() < 0.08 else w for w in page]
+
+
+def main():
+    writer = create_synthetic_dictionary(DB_PATH, DICTIONARY_WORDS)
+    with writer.begin() as conn:
+        words = [row[0] for row in conn.execute(text("SELECT word FROM dictionary"))]
+        conn.execute(
+            text("UPDATE OR IGNORE dictionary SET word = :new WHERE word = :old"),
+            [{"new": word.translate(LETTERS_ONLY), "old": word} for word in words],
+        )
+    build_slim_table(writer)
+    writer.dispose()
+
+    import infrastructure.models  # noqa: F401  (registers tables for init_db)
+    from application.services import HighlightApplicationService
+    from domain.tokenizer import tokenize
+    from infrastructure.compression import decode_body
+    from infrastructure.database import SessionLocal, init_db
+    from infrastructure.dictionary import dictionary_service
+    from infrastructure.highlight_cache import HighlightResultCache
+    from infrastructure.repositories import UserRepository
+
+    init_db()
+    with create_engine(f"sqlite:///{DB_PATH}").connect() as conn:
+        words = [row[0] for row in conn.execute(text("SELECT word FROM dictionary"))]
+    page = zipf_page(words, random.Random(3))
+    blocks = [
+        " ".join(page[i:i + BLOCK_TOKENS]) + "."
+        for i in range(0, len(page), BLOCK_TOKENS)
+    ]
+    tokens = [word for block in blocks for word in tokenize(block)]
+
+    db = SessionLocal()
+    service = HighlightApplicationService(UserRepository(db), dictionary_service, HighlightResultCache(max_size=0))
+    service.highlight_text("bench_user", blocks, "A1")  # warm the lookup cache
+
+    words_body = json.dumps({"user_id": "bench_user", "words": tokens, "compact": True}).encode("utf-8")
+    text_body = json.dumps({"user_id": "bench_user", "blocks": blocks}).encode("utf-8")
+    cases = (
+        ("words", words_body, None),
+        ("text", text_body, None),
+        ("text+gzip", gzip.compress(text_body), "gzip"),
+    )
+
+    print(f"\n{len(tokens)} tokens in {len(blocks)} blocks\n")
+    print(f"{'request':<12}{'body KB':>10}{'reply KB':>10}{'p50 ms':>10}")
+    for name, body, encoding in cases:
+        timings = []
+        for _ in range(RUNS):
+            start = time.perf_counter()
+            request = json.loads(decode_body(body, encoding))
+            if "words" in request:
+                result = service.get_highlighted_words("bench_user", request["words"], "A1", compact=True)
+            else:
+                result = service.highlight_text("bench_user", request["blocks"], "A1")
+            reply = json.dumps(result, ensure_ascii=False).encode("utf-8")
+            timings.append((time.perf_counter() - start) * 1000)
+        print(f"{name:<12}{len(body) / 1024:>10.1f}{len(reply) / 1024:>10.1f}{statistics.median(timings):>10.2f}")
+
+    db.close()
+    TMP_DIR.cleanup()
+
+
+if __name__ == "__main__":
+    main()
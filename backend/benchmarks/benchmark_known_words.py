@@ -0,0 +1,89 @@
+"""
+Benchmark: marking a word known, JSON blob vs known_words table
+
+For users with 100 / 5,000 / 20,000 known words, times one
+add_known_word + remove_known_word pair (each its own commit):
+
+- blob:   the previous storage - decode users.known_words_json, change
+          one word, re-encode and rewrite the row
+- table:  UserRepository (single-row insert / delete on known_words)
+
+Usage:
+    python benchmarks/benchmark_known_words.py
+"""
+
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from infrastructure.database import Base
+from infrastructure.models import KnownWordModel, UserModel
+from infrastructure.repositories import UserRepository, highlight_profile_cache
+
+SIZES = (100, 5000, 20000)
+RUNS = 50
+
+
+def blob_mark(db, user_id, word, add):
+    user_model = db.query(UserModel).filter(UserModel.user_id == user_id).first()
+    known_words = set(json.loads(user_model.known_words_json))
+    if add:
+        known_words.add(word)
+    else:
+        known_words.discard(word)
+    user_model.known_words_json = json.dumps(list(known_words))
+    db.commit()
+
+
+def table_mark(repo, user_id, word, add):
+    if add:
+        repo.add_known_word(user_id, word)
+    else:
+        repo.remove_known_word(user_id, word)
+
+
+def timed(mark):
+    timings = []
+    for i in range(RUNS):
+        start = time.perf_counter()
+        mark(f"fresh{i}", True)
+        mark(f"fresh{i}", False)
+        timings.append((time.perf_counter() - start) * 1000 / 2)
+    return statistics.median(timings)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        db = sessionmaker(bind=engine)()
+        repo = UserRepository(db)
+        highlight_profile_cache.max_size = 0
+
+        print(f"\n{'known words':>12}{'blob ms':>10}{'table ms':>10}")
+        for size in SIZES:
+            words = [f"word{i}" for i in range(size)]
+            db.add(UserModel(user_id=f"blob{size}", known_words_json=json.dumps(words)))
+            db.add(UserModel(user_id=f"table{size}"))
+            db.flush()
+            db.bulk_insert_mappings(KnownWordModel, [{"user_id": f"table{size}", "word": w} for w in words])
+            db.commit()
+
+            blob = timed(lambda word, add: blob_mark(db, f"blob{size}", word, add))
+            table = timed(lambda word, add: table_mark(repo, f"table{size}", word, add))
+            print(f"{size:>12,}{blob:>10.2f}{table:>10.2f}")
+
+        db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
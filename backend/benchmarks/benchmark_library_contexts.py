@@ -0,0 +1,99 @@
+"""
+Benchmark: capturing one sentence, contexts JSON blob vs library_contexts table
+
+For a library word with 10 / 500 / 5,000 captured sentences, times adding
+one more (each its own commit):
+
+- blob:   the previous storage - decode library_entries.contexts_json,
+          append one context, re-encode and rewrite the row
+- table:  UserRepository.add_library_words (one row insert)
+
+Usage:
+    python benchmarks/benchmark_library_contexts.py
+"""
+
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from infrastructure.database import Base
+from infrastructure.library_contexts import context_rows
+from infrastructure.models import LibraryContextModel, LibraryEntryModel, UserModel
+from infrastructure.repositories import UserRepository, highlight_profile_cache
+
+SIZES = (10, 500, 5000)
+RUNS = 50
+
+
+def capture(i):
+    return {
+        "page_url": f"https://example.com/article/{i}",
+        "page_title": f"Article {i}",
+        "sentences": [f"This is captured sentence number {i} about the word."],
+        "timestamp": 1700000000000 + i,
+    }
+
+
+def blob_append(db, user_id, context):
+    entry = db.query(LibraryEntryModel).filter(
+        LibraryEntryModel.user_id == user_id,
+        LibraryEntryModel.word == "word"
+    ).first()
+    contexts = json.loads(entry.contexts_json)
+    contexts.append(context)
+    entry.contexts_json = json.dumps(contexts)
+    db.commit()
+
+
+def timed(append, size):
+    timings = []
+    for i in range(RUNS):
+        start = time.perf_counter()
+        append(capture(size + i))
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        db = sessionmaker(bind=engine)()
+        repo = UserRepository(db)
+        highlight_profile_cache.max_size = 0
+
+        print(f"\n{'sentences':>10}{'blob ms':>10}{'table ms':>10}")
+        for size in SIZES:
+            contexts = [capture(i) for i in range(size)]
+            db.add(UserModel(user_id=f"blob{size}"))
+            db.add(UserModel(user_id=f"table{size}"))
+            db.flush()
+            db.add(LibraryEntryModel(user_id=f"blob{size}", word="word", contexts_json=json.dumps(contexts)))
+            entry = LibraryEntryModel(user_id=f"table{size}", word="word")
+            db.add(entry)
+            db.flush()
+            now = datetime.now()
+            db.bulk_insert_mappings(LibraryContextModel, [
+                row for context in contexts for row in context_rows(entry.id, context, now)
+            ])
+            db.commit()
+
+            blob = timed(lambda context: blob_append(db, f"blob{size}", context), size)
+            table = timed(lambda context: repo.add_library_words(f"table{size}", {"word": [context]}), size)
+            print(f"{size:>10,}{blob:>10.2f}{table:>10.2f}")
+
+        db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
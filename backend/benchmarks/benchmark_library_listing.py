@@ -0,0 +1,97 @@
+"""
+Benchmark: loading the library page for a 5,000-word library
+
+Library with 5,000 words, three captured sentences each. Times producing
+the GET /users/{id}/library response and reports its JSON size:
+
+- full:  the previous endpoint - get_user() loads the whole aggregate and
+         returns every entry with every context
+- page:  UserRepository.list_library - first page of 50 entries, context
+         counts only (what a paginated library page needs to render)
+
+Usage:
+    python benchmarks/benchmark_library_listing.py
+"""
+
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from infrastructure.database import Base
+from infrastructure.library_contexts import context_rows
+from infrastructure.models import LibraryContextModel, LibraryEntryModel, UserModel
+from infrastructure.repositories import UserRepository, highlight_profile_cache
+
+LIBRARY = 5000
+CONTEXTS = 3
+PAGE_SIZE = 50
+RUNS = 10
+
+
+def seed(db):
+    db.add(UserModel(user_id="heavy"))
+    db.flush()
+    start = datetime(2024, 1, 1)
+    db.bulk_insert_mappings(LibraryEntryModel, [
+        {"user_id": "heavy", "word": f"word{i}", "added_at": start + timedelta(minutes=i)} for i in range(LIBRARY)
+    ])
+    db.bulk_insert_mappings(LibraryContextModel, [
+        row
+        for (entry_id,) in db.query(LibraryEntryModel.id).filter(LibraryEntryModel.user_id == "heavy")
+        for i in range(CONTEXTS)
+        for row in context_rows(entry_id, {
+            "page_url": f"https://example.com/article/{entry_id}/{i}",
+            "page_title": f"Article {entry_id}",
+            "sentences": [f"A fairly typical captured sentence number {i} for entry {entry_id}."],
+        }, start)
+    ])
+    db.commit()
+
+
+def timed(produce):
+    timings = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        body = json.dumps(produce())
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), len(body)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        db = sessionmaker(bind=engine)()
+        repo = UserRepository(db)
+        highlight_profile_cache.max_size = 0
+        seed(db)
+
+        def full():
+            db.expire_all()
+            return repo.get_user("heavy").get_library_with_context()
+
+        def page():
+            db.expire_all()
+            return repo.list_library("heavy", limit=PAGE_SIZE)
+
+        print(f"\nLibrary with {LIBRARY:,} words, {CONTEXTS} sentences each\n")
+        print(f"{'response':<10}{'p50 ms':>10}{'bytes':>12}")
+        for name, produce in (("full", full), ("page", page)):
+            ms, size = timed(produce)
+            print(f"{name:<10}{ms:>10.1f}{size:>12,}")
+
+        db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
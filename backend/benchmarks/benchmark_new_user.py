@@ -0,0 +1,92 @@
+"""
+Benchmark: a new user's first highlight request
+
+Times get_highlight_profile() (what /highlight-words does first) for a
+user_id seen for the first time, with statement counts:
+
+- previous:  commit the users row, then one SELECT per DEFAULT_BLACKLIST
+             domain before adding it, and a second commit
+- bulk:      UserRepository - users row and default blacklist inserted
+             with one statement each, one commit
+- returning: an existing user, for comparison
+
+Usage:
+    python benchmarks/benchmark_new_user.py
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from infrastructure.database import Base
+from infrastructure.models import DomainManagementPolicy, DomainPolicyType, UserModel
+from infrastructure.repositories import DEFAULT_BLACKLIST, UserRepository, highlight_profile_cache
+
+RUNS = 50
+
+
+class PreviousUserRepository(UserRepository):
+    """UserRepository with the previous new-user provisioning"""
+
+    def _create_user(self, user_id: str):
+        user_model = UserModel(user_id=user_id)
+        self.db.add(user_model)
+        self.db.commit()
+        self.db.refresh(user_model)
+        for item in DEFAULT_BLACKLIST:
+            existing = self.db.query(DomainManagementPolicy).filter(
+                DomainManagementPolicy.user_id == user_id,
+                DomainManagementPolicy.domain == item["domain"],
+                DomainManagementPolicy.policy_type == DomainPolicyType.BLACKLIST
+            ).first()
+            if existing:
+                continue
+            self.db.add(DomainManagementPolicy(
+                user_id=user_id,
+                domain=item["domain"],
+                policy_type=DomainPolicyType.BLACKLIST,
+                description=item.get("description"),
+                is_active=True
+            ))
+        self.db.commit()
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        statements = []
+        event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        db = sessionmaker(bind=engine)()
+        highlight_profile_cache.max_size = 0
+
+        print(f"\n{'first request':<14}{'p50 ms':>10}{'statements':>12}")
+        for name, repo in (
+            ("previous", PreviousUserRepository(db)),
+            ("bulk", UserRepository(db)),
+            ("returning", UserRepository(db)),
+        ):
+            timings = []
+            for i in range(RUNS):
+                user_id = "returning" if name == "returning" else f"{name}{i}"
+                if name == "returning" and i == 0:
+                    repo.get_highlight_profile(user_id)
+                statements.clear()
+                start = time.perf_counter()
+                repo.get_highlight_profile(user_id)
+                timings.append((time.perf_counter() - start) * 1000)
+            print(f"{name:<14}{statistics.median(timings):>10.2f}{len(statements):>12}")
+
+        db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
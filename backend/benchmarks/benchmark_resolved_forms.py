@@ -0,0 +1,83 @@
+"""
+Benchmark: materialized surface-form resolution
+
+Compares the per-request Tier 1 path (variant probe + original/lemma MRS
+arbitration) with a single probe into the precomputed resolved-form table,
+for both the in-memory CoreLibrary and the mmap'd artifact.
+
+Usage:
+    python benchmarks/benchmark_resolved_forms.py [path/to/cefr_words.json]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmark_core_library import DEFAULT_PATH, SYNTHETIC_WORDS, synthetic_library
+from infrastructure.core_library import (
+    CoreLibrary,
+    MappedCoreLibrary,
+    arbitrate_core_row,
+    read_lemma_index,
+    resolve_surface_forms,
+    write_core_artifact,
+)
+from infrastructure.dictionary import LEMMA_INDEX_PATH
+
+
+def per_lookup_ns(resolve, words, rounds: int = 3) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for word in words:
+            resolve(word)
+    return (time.perf_counter() - start) / (rounds * len(words)) * 1e9
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PATH
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            library = CoreLibrary.from_dict(json.load(f))
+    else:
+        library = CoreLibrary.from_dict(json.loads(synthetic_library(SYNTHETIC_WORDS)))
+        # Make the lemma index point at real rows by mapping a few suffixes onto synthetic words
+        path = f"synthetic ({SYNTHETIC_WORDS} words)"
+    variant_map = read_lemma_index(LEMMA_INDEX_PATH)
+    for word in list(library)[:10000]:
+        for suffix in ("s", "ed", "ing"):
+            variant_map.setdefault(word + suffix, word)
+
+    start = time.perf_counter()
+    resolved = resolve_surface_forms(library, variant_map)
+    precompute_secs = time.perf_counter() - start
+
+    known_forms = set(library) | set(variant_map)
+    print(f"Core Library: {path}, {len(library):,} words, {len(variant_map):,} variants")
+    print(f"Resolved forms: {len(resolved):,} of {len(known_forms):,} known surface forms "
+          f"({len(resolved) / len(known_forms) * 100:.1f}%), precomputed in {precompute_secs:.2f}s\n")
+
+    words = list(known_forms)
+    legacy_ns = per_lookup_ns(lambda w: arbitrate_core_row(w, library, variant_map.get(w)), words)
+    resolved_ns = per_lookup_ns(resolved.get, words)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        artifact_path = os.path.join(tmp, "core_library.bin")
+        write_core_artifact(artifact_path, library, variant_map)
+        mapped = MappedCoreLibrary(artifact_path)
+        sample = words[:20000]
+        mapped_legacy_ns = per_lookup_ns(
+            lambda w: arbitrate_core_row(w, mapped, mapped.variant_map.get(w)), sample)
+        mapped_resolved_ns = per_lookup_ns(mapped.resolved_forms.get, sample)
+
+    print(f"{'store':<12}{'arbitrate ns':>14}{'resolved ns':>14}{'speedup':>10}")
+    print(f"{'in-memory':<12}{legacy_ns:>14.0f}{resolved_ns:>14.0f}{legacy_ns / resolved_ns:>9.1f}x")
+    print(f"{'mmap':<12}{mapped_legacy_ns:>14.0f}{mapped_resolved_ns:>14.0f}"
+          f"{mapped_legacy_ns / mapped_resolved_ns:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
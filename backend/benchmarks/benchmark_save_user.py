@@ -0,0 +1,146 @@
+"""
+Benchmark: save_user for a 10k-entry user after marking one word
+
+User with 4,000 known, 2,000 unknown, 2,000 vocabulary and 2,000 library
+words (two contexts each). After get_user() and one add_unknown_word(),
+times persisting the aggregate:
+
+- full:  the previous save_user - reload every unknown / vocabulary /
+         library row, match vocabulary and library with a linear next()
+         scan per word, rewrite every library row's contexts JSON
+- diff:  UserRepository.save_user - only the rows of dirty words
+
+Usage:
+    python benchmarks/benchmark_save_user.py
+"""
+
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from infrastructure.database import Base
+from infrastructure.library_contexts import context_rows
+from infrastructure.models import (
+    KnownWordModel,
+    LibraryContextModel,
+    LibraryEntryModel,
+    UnknownWordModel,
+    UserModel,
+    VocabularyEntryModel,
+)
+from infrastructure.repositories import UserRepository, highlight_profile_cache
+
+KNOWN, UNKNOWN, VOCABULARY, LIBRARY = 4000, 2000, 2000, 2000
+RUNS = 10
+
+
+def full_save(db, user):
+    """The previous save_user (known words already live in their table)"""
+    current_known = db.query(KnownWordModel).filter(KnownWordModel.user_id == user.user_id).all()
+    current_known_set = {w.word for w in current_known}
+    for word_model in current_known:
+        if word_model.word not in user.known_words:
+            db.delete(word_model)
+    for word in user.known_words - current_known_set:
+        db.add(KnownWordModel(user_id=user.user_id, word=word))
+
+    current_unknown = db.query(UnknownWordModel).filter(UnknownWordModel.user_id == user.user_id).all()
+    current_unknown_set = {w.word.lower() for w in current_unknown}
+    for word_model in current_unknown:
+        if word_model.word.lower() not in user.unknown_words:
+            db.delete(word_model)
+    for word in user.unknown_words:
+        if word not in current_unknown_set:
+            db.add(UnknownWordModel(user_id=user.user_id, word=word))
+
+    current_vocab = db.query(VocabularyEntryModel).filter(VocabularyEntryModel.user_id == user.user_id).all()
+    for vocab_model in current_vocab:
+        if vocab_model.word.lower() not in user.vocabulary:
+            db.delete(vocab_model)
+    for word, entry in user.vocabulary.items():
+        vocab_model = next((v for v in current_vocab if v.word.lower() == word.lower()), None)
+        if vocab_model:
+            vocab_model.status = entry.status
+            vocab_model.attempt_count = entry.attempt_count
+            vocab_model.last_reviewed = entry.last_reviewed
+        else:
+            db.add(VocabularyEntryModel(user_id=user.user_id, word=word, status=entry.status, added_at=entry.added_at))
+
+    current_library = db.query(LibraryEntryModel).filter(LibraryEntryModel.user_id == user.user_id).all()
+    for library_model in current_library:
+        if library_model.word.lower() not in user.library:
+            db.delete(library_model)
+    for word, entry in user.library.items():
+        library_model = next((l for l in current_library if l.word.lower() == word.lower()), None)
+        if library_model:
+            library_model.status = entry.status
+            library_model.contexts_json = json.dumps(entry.contexts)
+        else:
+            library_model = LibraryEntryModel(user_id=user.user_id, word=word, status=entry.status, added_at=entry.added_at)
+            library_model.contexts_json = json.dumps(entry.contexts)
+            db.add(library_model)
+    db.commit()
+    user.clear_changes()
+
+
+def seed(db):
+    db.add(UserModel(user_id="heavy"))
+    db.flush()
+    db.bulk_insert_mappings(KnownWordModel, [{"user_id": "heavy", "word": f"known{i}"} for i in range(KNOWN)])
+    db.bulk_insert_mappings(UnknownWordModel, [{"user_id": "heavy", "word": f"unknown{i}"} for i in range(UNKNOWN)])
+    db.bulk_insert_mappings(VocabularyEntryModel, [{"user_id": "heavy", "word": f"vocab{i}"} for i in range(VOCABULARY)])
+    db.bulk_insert_mappings(LibraryEntryModel, [{"user_id": "heavy", "word": f"lib{i}"} for i in range(LIBRARY)])
+    contexts = [
+        {"page_url": "https://example.com/a", "sentences": ["One sentence here."]},
+        {"page_url": "https://example.com/b", "sentences": ["Another sentence."]},
+    ]
+    now = datetime.now()
+    db.bulk_insert_mappings(LibraryContextModel, [
+        row
+        for (entry_id,) in db.query(LibraryEntryModel.id).filter(LibraryEntryModel.user_id == "heavy")
+        for context in contexts
+        for row in context_rows(entry_id, context, now)
+    ])
+    db.commit()
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        statements = []
+        event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        db = sessionmaker(bind=engine)()
+        repo = UserRepository(db)
+        highlight_profile_cache.max_size = 0
+        seed(db)
+
+        print(f"\nUser with {KNOWN + UNKNOWN + VOCABULARY + LIBRARY:,} entries, one word marked unknown per save\n")
+        print(f"{'save':<6}{'p50 ms':>10}{'statements':>12}")
+        for name, save in (("full", lambda user: full_save(db, user)), ("diff", repo.save_user)):
+            timings = []
+            for i in range(RUNS):
+                user = repo.get_user("heavy")
+                user.add_unknown_word(f"vocab{i}" if name == "full" else f"vocab{RUNS + i}")
+                db.expire_all()
+                statements.clear()
+                start = time.perf_counter()
+                save(user)
+                timings.append((time.perf_counter() - start) * 1000)
+            print(f"{name:<6}{statistics.median(timings):>10.1f}{len(statements):>12}")
+
+        db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Benchmark: Tier 2 full rows vs slim highlight projection
+
+Measures, for the same page-sized batches of words, the latency and bytes
+returned when reading full `dictionary` rows (word, ranking, translation,
+definition, phonetic, tag) versus the slim `dictionary_slim` projection
+used by /highlight-words.
+
+Usage:
+    python benchmarks/benchmark_tier2_projection.py [path/to/mixread.db]
+
+Point it at a database with the full ECDICT import (download_ecdict_full.py).
+If the given database has no `dictionary` table, a synthetic 770k-word one is
+generated in a temp directory. The slim table is built if it is missing.
+"""
+
+import os
+import random
+import statistics
+import string
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, inspect, text
+
+from build_dictionary_slim import build_slim_table
+from infrastructure.dictionary_store import SLIM_TABLE, DictionaryStore
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "mixread.db")
+SYNTHETIC_WORDS = 770000
+BATCH_SIZE = 300
+BATCHES = 50
+
+
+def create_synthetic_dictionary(path: str, size: int = SYNTHETIC_WORDS):
+    rng = random.Random(7)
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE dictionary (word TEXT PRIMARY KEY, ranking INTEGER, "
+            "translation TEXT, definition TEXT, phonetic TEXT, tag TEXT)"
+        ))
+        rows = []
+        for i in range(size):
+            rows.append({
+                "word": "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 10))) + str(i),
+                "ranking": i + 1,
+                "translation": "\\n".join(f"{p}. " + "".join(chr(0x4e00 + rng.randint(0, 2000)) for _ in range(6))
+                                          for p in ("n", "v", "adj")[:rng.randint(1, 3)]),
+                "definition": "\\n".join(" ".join(rng.choice(["a", "the", "of", "thing", "state", "person", "act"])
+                                                  for _ in range(rng.randint(8, 30))) for _ in range(rng.randint(1, 4))),
+                "phonetic": "".join(rng.choice("ɪəæʌʊɒeɔːstnrdkl") for _ in range(rng.randint(3, 9))),
+                "tag": "cet4 cet6 ky",
+            })
+            if len(rows) == 20000:
+                conn.execute(text("INSERT INTO dictionary VALUES (:word, :ranking, :translation, "
+                                  ":definition, :phonetic, :tag)"), rows)
+                rows = []
+        if rows:
+            conn.execute(text("INSERT INTO dictionary VALUES (:word, :ranking, :translation, "
+                              ":definition, :phonetic, :tag)"), rows)
+    return engine
+
+
+def table_bytes(engine, table: str):
+    """On-disk size of a table (needs SQLite built with dbstat)"""
+    try:
+        with engine.connect() as conn:
+            return conn.execute(text("SELECT SUM(pgsize) FROM dbstat WHERE name = :t"), {"t": table}).scalar()
+    except Exception:
+        return None
+
+
+def run(store: DictionaryStore, batches, slim: bool):
+    latencies = []
+    returned = 0
+    for batch in batches:
+        start = time.perf_counter()
+        rows = store.fetch_many(batch, slim=slim)
+        latencies.append((time.perf_counter() - start) * 1000)
+        returned += sum(len(str(v).encode("utf-8")) for row in rows for v in row if v is not None)
+    latencies.sort()
+    return statistics.median(latencies), latencies[int(len(latencies) * 0.95) - 1], returned
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PATH
+    tmp = None
+    writer = create_engine(f"sqlite:///{path}") if os.path.exists(path) else None
+    if writer is None or not inspect(writer).has_table("dictionary"):
+        tmp = tempfile.TemporaryDirectory()
+        path = os.path.join(tmp.name, "dictionary.db")
+        print(f"No dictionary table found, generating {SYNTHETIC_WORDS:,} synthetic words...")
+        writer = create_synthetic_dictionary(path)
+    if not inspect(writer).has_table(SLIM_TABLE):
+        print(f"Building {SLIM_TABLE}...")
+        build_slim_table(writer)
+
+    with writer.connect() as conn:
+        words = [row[0] for row in conn.execute(text("SELECT word FROM dictionary"))]
+    rng = random.Random(1)
+    batches = [rng.sample(words, BATCH_SIZE) for _ in range(BATCHES)]
+
+    full_size, slim_size = table_bytes(writer, "dictionary"), table_bytes(writer, SLIM_TABLE)
+    writer.dispose()
+
+    results = {}
+    for name, slim in (("full rows", False), ("slim", True)):
+        store = DictionaryStore(url=f"sqlite:///{path}")
+        store.fetch_many(batches[0], slim=slim)  # open the pool
+        results[name] = run(store, batches, slim)
+        store.dispose()
+
+    print(f"\n{len(words):,} words, {BATCHES} batches x {BATCH_SIZE} words\n")
+    print(f"{'path':<12}{'table MB':>10}{'bytes/batch':>14}{'p50 ms':>10}{'p95 ms':>10}")
+    for name, table_size in (("full rows", full_size), ("slim", slim_size)):
+        p50, p95, returned = results[name]
+        size = f"{table_size / 1e6:.1f}" if table_size else "n/a"
+        print(f"{name:<12}{size:>10}{returned // BATCHES:>14,}{p50:>10.2f}{p95:>10.2f}")
+
+    if tmp:
+        tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
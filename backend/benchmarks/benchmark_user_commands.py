@@ -0,0 +1,89 @@
+"""
+Benchmark: single-word use cases, aggregate round trip vs narrow command
+
+User with 4,000 known, 2,000 unknown, 2,000 vocabulary and 2,000 library
+words. For each use case, times:
+
+- aggregate:  get_user() + User method + save_user() (diff-based)
+- command:    the UserApplicationService use case (narrow repository command)
+
+Then marks a 200-word batch as unknown: one single-word command per word
+vs one bulk command (mark_words_as_unknown), with statement counts.
+
+Usage:
+    python benchmarks/benchmark_user_commands.py
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from benchmark_save_user import seed
+
+from application.services import UserApplicationService
+from infrastructure.database import Base
+from infrastructure.repositories import UserRepository, highlight_profile_cache
+
+RUNS = 20
+BATCH = 200
+
+USE_CASES = [
+    ("mark_word_as_known", "add_known_word", "unknown{}"),
+    ("mark_word_as_unknown", "add_unknown_word", "vocab{}"),
+    ("add_to_vocabulary", "add_to_vocabulary", "fresh{}"),
+    ("remove_from_library", "remove_from_library", "lib{}"),
+]
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        db = sessionmaker(bind=engine)()
+        repo = UserRepository(db)
+        service = UserApplicationService(repo)
+        highlight_profile_cache.max_size = 0
+        seed(db)
+
+        print(f"\n{'use case':<24}{'aggregate ms':>14}{'command ms':>12}")
+        for use_case, method, word in USE_CASES:
+            aggregate, command = [], []
+            for i in range(RUNS):
+                start = time.perf_counter()
+                user = repo.get_user("heavy")
+                getattr(user, method)(word.format(i))
+                repo.save_user(user)
+                aggregate.append((time.perf_counter() - start) * 1000)
+
+                start = time.perf_counter()
+                getattr(service, use_case)("heavy", word.format(RUNS + i))
+                command.append((time.perf_counter() - start) * 1000)
+            print(f"{use_case:<24}{statistics.median(aggregate):>14.1f}{statistics.median(command):>12.2f}")
+
+        statements = []
+        event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        print(f"\n{BATCH}-word batch{'ms':>16}{'statements':>12}")
+        for offset, name, mark in (
+            (1000, "per word", lambda words: [service.mark_word_as_unknown("heavy", w) for w in words]),
+            (1500, "bulk", lambda words: service.mark_words_as_unknown("heavy", words)),
+        ):
+            # Half new words, half moved out of the vocabulary
+            words = [f"new{offset + i}" for i in range(BATCH // 2)] + [f"vocab{offset + i}" for i in range(BATCH // 2)]
+            statements.clear()
+            start = time.perf_counter()
+            mark(words)
+            print(f"{name:<16}{(time.perf_counter() - start) * 1000:>10.1f}{len(statements):>12}")
+
+        db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
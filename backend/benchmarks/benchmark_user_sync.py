@@ -0,0 +1,73 @@
+"""
+Benchmark: keeping a client's word lists in sync, full reload vs change feed
+
+User with 4,000 known, 2,000 unknown, 2,000 vocabulary and 2,000 library
+words. After 10 words are marked, times bringing a client up to date and
+reports the JSON size:
+
+- full:   GET /users/{id} (get_user_data) - every list, every time
+- delta:  GET /users/{id}/changes?since=N (get_changes) - only the 10 marks
+
+Usage:
+    python benchmarks/benchmark_user_sync.py
+"""
+
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from benchmark_save_user import seed
+
+from application.services import UserApplicationService
+from infrastructure.database import Base
+from infrastructure.repositories import UserRepository, highlight_profile_cache
+
+RUNS = 10
+MARKS = 10
+
+
+def timed(produce):
+    timings = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        body = json.dumps(produce())
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), len(body)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        db = sessionmaker(bind=engine)()
+        service = UserApplicationService(UserRepository(db))
+        highlight_profile_cache.max_size = 0
+        seed(db)
+
+        since = service.get_user_data("heavy")["seq"]
+        for i in range(MARKS):
+            service.mark_word_as_known("heavy", f"unknown{i}")
+
+        print(f"\nUser with 10,000 entries, {MARKS} words marked since the last sync\n")
+        print(f"{'sync':<8}{'p50 ms':>10}{'bytes':>12}")
+        for name, produce in (
+            ("full", lambda: service.get_user_data("heavy")),
+            ("delta", lambda: service.get_changes("heavy", since)),
+        ):
+            ms, size = timed(produce)
+            print(f"{name:<8}{ms:>10.1f}{size:>12,}")
+
+        db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Compile the Tier 1 Core Library into a binary artifact
+
+Reads data/cefr_words.json, data/lemma.en.txt and (if present)
+data/lemma.generated.txt from build_lemma_table.py, and writes
+data/core_library.bin, which DictionaryService mmaps at startup instead of
+parsing both files in every worker.
+
+Re-run after updating either source file; the service ignores an artifact
+that is older than its sources.
+"""
+
+import os
+import sys
+import time
+
+from infrastructure.core_library import (
+    CoreLibrary,
+    MappedCoreLibrary,
+    read_core_library_json,
+    write_core_artifact,
+)
+from infrastructure.dictionary import CORE_ARTIFACT_PATH, CORE_LIBRARY_PATH, load_variant_map
+
+
+def main():
+    output_path = sys.argv[1] if len(sys.argv) > 1 else CORE_ARTIFACT_PATH
+
+    start = time.perf_counter()
+    if os.path.exists(CORE_LIBRARY_PATH):
+        library = read_core_library_json(CORE_LIBRARY_PATH)
+    else:
+        print(f"⚠ {CORE_LIBRARY_PATH} not found, compiling an empty Core Library")
+        library = CoreLibrary()
+    variant_map = load_variant_map()
+    parse_secs = time.perf_counter() - start
+
+    write_core_artifact(output_path, library, variant_map)
+
+    start = time.perf_counter()
+    mapped = MappedCoreLibrary(output_path)
+    map_secs = time.perf_counter() - start
+
+    print(f"✅ Wrote {output_path} ({os.path.getsize(output_path) / 1024 / 1024:.1f} MB)")
+    print(f"   {len(mapped):,} words, {len(mapped.variant_map):,} variants, "
+          f"{len(mapped.resolved_forms):,} surface forms resolved to final entries")
+    print(f"   Parse sources: {parse_secs * 1000:.0f} ms -> mmap artifact: {map_secs * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Build the slim Tier 2 projection used at highlight time
+
+Creates `dictionary_slim` (word, ranking, short translation, phonetic) from
+the full `dictionary` table imported by the download_ecdict_* scripts.
+Highlight lookups read this narrow table; /word/{word} and /batch-word-info
+still read full rows with definitions.
+
+Re-run after re-importing the dictionary, then restart the workers (or call
+dictionary_service.reload_tier2()).
+"""
+
+import time
+
+from sqlalchemy import text
+
+from infrastructure.database import DATABASE_URL, engine
+from infrastructure.dictionary_store import SLIM_TABLE, short_translation
+
+BATCH_SIZE = 10000
+
+
+def build_slim_table(target_engine=engine) -> int:
+    """(Re)create the slim table from `dictionary`; returns the row count"""
+    without_rowid = " WITHOUT ROWID" if target_engine.url.get_backend_name() == "sqlite" else ""
+
+    count = 0
+    with target_engine.begin() as conn:
+        conn.execute(text(f"DROP TABLE IF EXISTS {SLIM_TABLE}"))
+        conn.execute(text(
+            f"CREATE TABLE {SLIM_TABLE} ("
+            "word TEXT PRIMARY KEY, ranking INTEGER, translation TEXT, phonetic TEXT"
+            f"){without_rowid}"
+        ))
+
+        rows = conn.execute(text("SELECT word, ranking, translation, phonetic FROM dictionary"))
+        insert = text(
+            f"INSERT INTO {SLIM_TABLE} (word, ranking, translation, phonetic) "
+            "VALUES (:word, :ranking, :translation, :phonetic)"
+        )
+        while True:
+            batch = rows.fetchmany(BATCH_SIZE)
+            if not batch:
+                break
+            conn.execute(insert, [
+                {
+                    "word": word,
+                    "ranking": ranking,
+                    "translation": short_translation(translation),
+                    "phonetic": phonetic,
+                }
+                for word, ranking, translation, phonetic in batch
+            ])
+            count += len(batch)
+            print(f"   Copied {count:,} words...", end="\r")
+    return count
+
+
+def main():
+    print(f"Building {SLIM_TABLE} in {DATABASE_URL}")
+    start = time.perf_counter()
+    count = build_slim_table()
+    print(f"\n✅ {SLIM_TABLE}: {count:,} words in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Precompute lemminflect lemmas into a static lemma table
+
+Runs the same lemminflect lookup DictionaryService used to do per request
+over every word we can anticipate:
+- Tier 1 Core Library words
+- Tier 2 `dictionary` table words
+- every inflection lemminflect generates for Core Library lemmas
+
+Forms already covered by lemma.en.txt are skipped. The rest are written
+to data/lemma.generated.txt (lemma.en.txt format), which the service and
+build_core_library.py merge into the static variant index, so a runtime
+lookup is a single hash probe.
+
+Requires: pip install lemminflect
+"""
+
+import os
+import sys
+import time
+
+from sqlalchemy import text
+
+from infrastructure.core_library import (
+    CoreLibrary,
+    lemminflect_lemma,
+    read_core_library_json,
+    read_lemma_index,
+    write_lemma_index,
+)
+from infrastructure.dictionary import CORE_LIBRARY_PATH, GENERATED_LEMMA_PATH, LEMMA_INDEX_PATH
+from infrastructure.dictionary_store import dictionary_store
+
+
+def load_tier2_words() -> set:
+    """All lowercased words from the Tier 2 dictionary table (empty if missing)"""
+    try:
+        with dictionary_store.engine.connect() as conn:
+            return {row[0].lower() for row in conn.execute(text("SELECT word FROM dictionary")) if row[0]}
+    except Exception as e:
+        print(f"⚠ Tier 2 dictionary not available: {e}")
+        return set()
+
+
+def inflections_of(library: CoreLibrary) -> set:
+    """Every inflected form lemminflect knows for Core Library lemmas"""
+    from lemminflect import getAllInflections
+
+    forms = set()
+    for lemma in library:
+        for inflected in getAllInflections(lemma).values():
+            forms.update(form.lower() for form in inflected)
+    return forms
+
+
+def main():
+    try:
+        import lemminflect  # noqa: F401
+    except ImportError:
+        print("❌ lemminflect is not installed: pip install lemminflect")
+        sys.exit(1)
+
+    output_path = sys.argv[1] if len(sys.argv) > 1 else GENERATED_LEMMA_PATH
+    start = time.perf_counter()
+
+    library = read_core_library_json(CORE_LIBRARY_PATH)
+    static_map = read_lemma_index(LEMMA_INDEX_PATH) if os.path.exists(LEMMA_INDEX_PATH) else {}
+
+    candidates = set(library)
+    candidates |= load_tier2_words()
+    candidates |= inflections_of(library)
+    candidates.difference_update(static_map)
+    print(f"📝 {len(candidates):,} candidate forms not covered by lemma.en.txt")
+
+    generated = {}
+    for word in candidates:
+        lemma = lemminflect_lemma(word, library)
+        if lemma and lemma != word:
+            generated[word] = lemma
+
+    write_lemma_index(output_path, generated, header=[
+        "Generated by build_lemma_table.py from lemminflect - do not edit",
+        f"{len(generated)} variants for {len(set(generated.values()))} Core Library lemmas",
+    ])
+    print(f"✅ Wrote {len(generated):,} variants to {output_path} "
+          f"in {time.perf_counter() - start:.1f}s")
+    print("   Re-run build_core_library.py to include them in the compiled artifact")
+
+
+if __name__ == "__main__":
+    main()
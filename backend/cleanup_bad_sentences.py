@@ -7,10 +7,10 @@ This script filters out sentences that:
 - Don't meet minimum quality requirements
 """
 
-import json
 from sqlalchemy.orm import Session
 from infrastructure.database import SessionLocal
-from infrastructure.models import LibraryEntryModel
+from infrastructure.models import LibraryContextModel, LibraryEntryModel
+from infrastructure.repositories import UserRepository
 
 
 def is_bad_sentence(sentence: str) -> bool:
@@ -55,44 +55,31 @@ def is_bad_sentence(sentence: str) -> bool:
 def cleanup_library_entries(db: Session):
     """Clean up all library entries, removing bad sentences"""
 
-    # Get all library entries
-    entries = db.query(LibraryEntryModel).all()
-    print(f"Found {len(entries)} library entries")
+    # Move remaining legacy contexts_json blobs into library_contexts first
+    UserRepository(db).migrate_legacy_contexts()
 
-    cleaned_count = 0
-    total_sentences_removed = 0
+    # Get all captured sentences (page-only captures have no sentence)
+    rows = db.query(LibraryContextModel, LibraryEntryModel.word, LibraryEntryModel.user_id).join(
+        LibraryEntryModel
+    ).filter(LibraryContextModel.sentence != "").all()
+    print(f"Found {len(rows)} library sentences")
 
-    for entry in entries:
-        contexts = entry.get_contexts()
-        original_count = len(contexts)
+    removed_per_entry = {}
+    for context, word, user_id in rows:
+        if is_bad_sentence(context.sentence):
+            db.delete(context)
+            key = (word, user_id)
+            removed_per_entry[key] = removed_per_entry.get(key, 0) + 1
 
-        if not contexts:
-            continue
-
-        # Filter out bad sentences from contexts
-        cleaned_contexts = []
-        for context in contexts:
-            if isinstance(context, dict) and 'sentence' in context:
-                if not is_bad_sentence(context['sentence']):
-                    cleaned_contexts.append(context)
-            elif isinstance(context, str):
-                if not is_bad_sentence(context):
-                    cleaned_contexts.append(context)
-
-        removed_count = original_count - len(cleaned_contexts)
-
-        if removed_count > 0:
-            entry.set_contexts(cleaned_contexts)
-            cleaned_count += 1
-            total_sentences_removed += removed_count
-            print(f"  {entry.word} ({entry.user_id}): removed {removed_count}/{original_count} bad sentences")
+    for (word, user_id), removed_count in removed_per_entry.items():
+        print(f"  {word} ({user_id}): removed {removed_count} bad sentences")
 
     # Commit changes
     db.commit()
 
     print(f"\nCleanup complete:")
-    print(f"  Entries with bad sentences removed: {cleaned_count}")
-    print(f"  Total bad sentences removed: {total_sentences_removed}")
+    print(f"  Entries with bad sentences removed: {len(removed_per_entry)}")
+    print(f"  Total bad sentences removed: {sum(removed_per_entry.values())}")
 
 
 if __name__ == "__main__":
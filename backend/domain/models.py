@@ -75,18 +75,43 @@ class LibraryEntry:
         self.added_at = added_at or datetime.now()
         self.contexts = []  # List of context objects with page info and sentences
         self.status = VocabularyStatus.LEARNING
+        self.new_contexts = []  # Contexts added since loaded / saved (contexts are append-only)
 
     def add_context(self, context: dict):
         """Add learning context (page URL, sentences, etc.)"""
         self.contexts.append(context)
+        self.new_contexts.append(context)
 
     def get_contexts(self) -> list:
         """Get all learning contexts"""
         return self.contexts
 
 
+class HighlightProfile:
+    """
+    Read-only slice of a User needed for highlighting:
+    the known / unknown word sets plus a version stamp that changes
+    whenever either set changes
+    """
+
+    def __init__(self, user_id: str, known_words: frozenset, unknown_words: frozenset, version: str):
+        self.user_id = user_id
+        self.known_words = known_words
+        self.unknown_words = unknown_words
+        self.version = version
+
+
 class User:
-    """User entity - represents a MixRead user"""
+    """
+    User entity - represents a MixRead user
+
+    Every mutation records the words it touched per collection ("dirty"
+    words), so a repository can persist only those entries instead of
+    rewriting the whole aggregate. Mutating the collections directly
+    bypasses this; use mark_dirty() for in-place entry changes.
+    """
+
+    TRACKED_COLLECTIONS = ("known_words", "unknown_words", "vocabulary", "library")
 
     def __init__(self, user_id: str, created_at: datetime = None):
         self.user_id = user_id
@@ -98,12 +123,16 @@ class User:
         self.vocabulary: dict = {}  # Words user wants to learn (VocabularyEntry)
         self.library: dict = {}  # Words user wants to learn with context (LibraryEntry)
 
+        # Words changed since the aggregate was loaded / last saved
+        self._dirty = {collection: set() for collection in self.TRACKED_COLLECTIONS}
+
     def add_known_word(self, word: str):
         """Mark a word as known"""
         word_lower = word.lower()
         self.known_words.add(word_lower)
         # Remove from unknown words if present
         self.unknown_words.discard(word_lower)
+        self.mark_dirty(word_lower, "known_words", "unknown_words")
 
     def add_unknown_word(self, word: str):
         """Mark a word as not knowing"""
@@ -113,26 +142,32 @@ class User:
         self.known_words.discard(word_lower)
         # Remove from vocabulary if present
         self.vocabulary.pop(word_lower, None)
+        self.mark_dirty(word_lower, "unknown_words", "known_words", "vocabulary")
 
     def remove_known_word(self, word: str):
         """Remove a word from known list"""
         self.known_words.discard(word.lower())
+        self.mark_dirty(word.lower(), "known_words")
 
     def remove_unknown_word(self, word: str):
         """Remove a word from unknown list"""
         self.unknown_words.discard(word.lower())
+        self.mark_dirty(word.lower(), "unknown_words")
 
     def add_to_vocabulary(self, word: str):
         """Add a word to vocabulary for learning"""
         word_lower = word.lower()
         if word_lower not in self.vocabulary:
             self.vocabulary[word_lower] = VocabularyEntry(word_lower)
+            self.mark_dirty(word_lower, "vocabulary")
         # Remove from unknown words
         self.unknown_words.discard(word_lower)
+        self.mark_dirty(word_lower, "unknown_words")
 
     def remove_from_vocabulary(self, word: str):
         """Remove a word from vocabulary"""
         self.vocabulary.pop(word.lower(), None)
+        self.mark_dirty(word.lower(), "vocabulary")
 
     def move_unknown_to_vocabulary(self, word: str):
         """Move a word from unknown_words to vocabulary (user decides to learn it)"""
@@ -147,6 +182,7 @@ class User:
             word_lower = word.lower()
             if word_lower not in self.library:
                 self.library[word_lower] = LibraryEntry(word_lower)
+            self.mark_dirty(word_lower, "library")
 
             # Add contexts if provided
             if contexts:
@@ -164,6 +200,7 @@ class User:
     def remove_from_library(self, word: str):
         """Remove a word from library"""
         self.library.pop(word.lower(), None)
+        self.mark_dirty(word.lower(), "library")
 
     def get_library_with_context(self) -> list:
         """Get library words with their contexts"""
@@ -176,3 +213,22 @@ class User:
                 "contexts": entry.get_contexts()
             })
         return result
+
+    # ========== Change tracking ==========
+
+    def mark_dirty(self, word: str, *collections: str):
+        """Record that `word` changed in the given collections"""
+        for collection in collections:
+            self._dirty[collection].add(word.lower())
+
+    def dirty_words(self, collection: str) -> set:
+        """Words of `collection` changed since loading (their current state is in the collection)"""
+        return self._dirty[collection]
+
+    def has_changes(self) -> bool:
+        return any(self._dirty.values())
+
+    def clear_changes(self):
+        """Called by the repository once the aggregate matches storage"""
+        for words in self._dirty.values():
+            words.clear()
@@ -0,0 +1,40 @@
+"""
+Text Tokenizer
+
+Server-side counterpart of the extension's tokenizeText(): the same word
+pattern, compiled once, so every client gets identical tokens.
+
+Offsets are reported in UTF-16 code units, which is how JavaScript indexes
+strings; they only differ from Python indices when the text contains
+characters outside the Basic Multilingual Plane (e.g. emoji).
+"""
+
+import bisect
+import re
+from typing import List, Tuple
+
+# Same as the extension's /\b[a-z''-]+\b/gi: ASCII letters, apostrophe (U+0027
+# only, so "isn’t" splits like it does there) and hyphen, ASCII word boundaries
+WORD_PATTERN = re.compile(r"\b[a-z'-]+\b", re.IGNORECASE | re.ASCII)
+
+_ASTRAL_PATTERN = re.compile("[\U00010000-\U0010FFFF]")
+
+
+def tokenize(text: str) -> List[str]:
+    """Words in order of appearance"""
+    return WORD_PATTERN.findall(text)
+
+
+def tokenize_with_offsets(text: str) -> List[Tuple[int, int, str]]:
+    """(start, end, word) for each word, with UTF-16 offsets"""
+    astral = [] if text.isascii() else [m.start() for m in _ASTRAL_PATTERN.finditer(text)]
+    if not astral:
+        return [(m.start(), m.end(), m.group()) for m in WORD_PATTERN.finditer(text)]
+
+    # Each astral character before an offset takes two UTF-16 code units
+    tokens = []
+    for match in WORD_PATTERN.finditer(text):
+        start, end = match.span()
+        shift = bisect.bisect_left(astral, start)
+        tokens.append((start + shift, end + shift, match.group()))
+    return tokens
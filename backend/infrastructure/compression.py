@@ -0,0 +1,47 @@
+"""
+Compressed Request Bodies
+
+Page text compresses well (typically 3-4x with gzip), so clients may send
+large bodies with `Content-Encoding: gzip` or `deflate` (browsers can do this
+with CompressionStream). Decompression is capped so a small compressed body
+cannot expand into an unbounded amount of memory.
+"""
+
+import os
+import zlib
+
+# Largest accepted body after decompression
+MAX_DECODED_BODY_BYTES = int(os.getenv("MAX_DECODED_BODY_BYTES", str(8 * 1024 * 1024)))
+
+# zlib wbits for each supported Content-Encoding
+_WBITS = {
+    "gzip": 16 + zlib.MAX_WBITS,
+    "x-gzip": 16 + zlib.MAX_WBITS,
+    # Auto-detect: "deflate" is meant to be zlib-wrapped, but some clients send raw
+    "deflate": 32 + zlib.MAX_WBITS,
+}
+
+
+class BodyDecodingError(ValueError):
+    """Body cannot be decoded (unknown encoding, corrupt, or too large)"""
+
+
+def decode_body(body: bytes, content_encoding: str = None, max_size: int = MAX_DECODED_BODY_BYTES) -> bytes:
+    """Return the request body with its Content-Encoding removed"""
+    encoding = (content_encoding or "identity").strip().lower()
+    if encoding == "identity":
+        decoded = body
+    elif encoding in _WBITS:
+        decompressor = zlib.decompressobj(_WBITS[encoding])
+        try:
+            decoded = decompressor.decompress(body, max_size + 1)
+        except zlib.error as e:
+            raise BodyDecodingError(f"Invalid {encoding} body: {e}")
+        if len(decoded) <= max_size and not decompressor.eof:
+            raise BodyDecodingError(f"Truncated {encoding} body")
+    else:
+        raise BodyDecodingError(f"Unsupported Content-Encoding: {content_encoding}")
+
+    if len(decoded) > max_size:
+        raise BodyDecodingError(f"Body exceeds {max_size} bytes")
+    return decoded
@@ -0,0 +1,514 @@
+"""
+Compact Tier 1 Core Library
+
+Columnar in-memory representation of cefr_words.json.
+Instead of one dict per word, every field is stored as a column indexed
+by a dense row id:
+- Low-cardinality strings (pos, level) are dictionary-encoded into small
+  code tables with an array of codes per row
+- Free-text strings (chn, def, ph) live in plain lists, interned when shared
+- Integers (mrs, rank) live in typed arrays, with MISSING standing in for None
+
+The same columns (plus the lemma.en.txt variant index) can be compiled into
+a versioned binary artifact (see build_core_library.py). Workers mmap that
+file read-only, so startup skips JSON/text parsing and all workers on a host
+share the same page-cache pages.
+
+Surface forms (Core Library words and all known variants) are resolved ahead
+of time into the row of their final entry - the original-vs-lemma MRS
+arbitration runs once per form instead of once per request.
+"""
+
+import functools
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+# Sentinel for a missing integer value in the typed arrays
+MISSING = -1
+
+# ========== Binary Artifact Format ==========
+# Header: magic, version, section count, then (offset, length) per section.
+# Each section is 8-byte aligned. String tables are: u32 count,
+# u32 offsets[count + 1], then the UTF-8 blob. Sorted tables allow binary search.
+ARTIFACT_MAGIC = b"MXRDCORE"
+ARTIFACT_VERSION = 2
+ARTIFACT_SECTIONS = (
+    "words",           # sorted string table, row id = position
+    "mrs",             # i32 per row
+    "rank",            # i32 per row
+    "pos_codes",       # u16 per row
+    "pos_values",      # string table
+    "level_codes",     # u16 per row
+    "level_values",    # string table
+    "chn",             # string table, row aligned
+    "def",             # string table, row aligned
+    "ph",              # string table, row aligned
+    "variants",        # sorted string table (lemma.en.txt variants)
+    "variant_lemmas",  # string table aligned with variants
+    "forms",           # sorted string table of every resolvable surface form
+    "form_rows",       # i32 per form: row of its final (post-arbitration) entry
+)
+_HEADER = struct.Struct("<8sII")
+_SECTION = struct.Struct("<QQ")
+_NULL = b"\x00"  # encodes None inside string tables
+
+
+class _CodeTable:
+    """Dictionary-encoded column for low-cardinality strings (pos, level)"""
+
+    def __init__(self):
+        self.values: List[Optional[str]] = [None]  # code 0 is always None
+        self.codes = array("H")
+        self._lookup: Dict[Optional[str], int] = {None: 0}
+
+    def append(self, value: Optional[str]):
+        code = self._lookup.get(value)
+        if code is None:
+            code = len(self.values)
+            self.values.append(sys.intern(value) if isinstance(value, str) else value)
+            self._lookup[value] = code
+        self.codes.append(code)
+
+    def __getitem__(self, row: int) -> Optional[str]:
+        return self.values[self.codes[row]]
+
+
+class _RowAccessors:
+    """Row-level accessors shared by the in-memory and mmap-backed libraries"""
+
+    def __contains__(self, word: str) -> bool:
+        return self.row(word) is not None
+
+    def mrs_of(self, row: int) -> Optional[int]:
+        value = self.mrs[row]
+        return None if value == MISSING else value
+
+    def rank_of(self, row: int) -> Optional[int]:
+        value = self.rank[row]
+        return None if value == MISSING else value
+
+    def entry(self, row: int) -> Dict[str, Any]:
+        """Rebuild the original cefr_words.json entry for a row"""
+        return {
+            "pos": self.pos[row],
+            "level": self.level[row],
+            "chn": self.chn[row],
+            "def": self.definition[row],
+            "ph": self.phonetic[row],
+            "mrs": self.mrs_of(row),
+            "rank": self.rank_of(row)
+        }
+
+
+class CoreLibrary(_RowAccessors):
+    """
+    Read-only columnar store for the Tier 1 Core Library.
+    Supports `len()`, `in` and iteration over words like the dict it replaces.
+    """
+
+    def __init__(self):
+        self.index: Dict[str, int] = {}  # word -> row id
+        self.pos = _CodeTable()
+        self.level = _CodeTable()
+        self.chn: List[Optional[str]] = []
+        self.definition: List[Optional[str]] = []
+        self.phonetic: List[Optional[str]] = []
+        self.mrs = array("i")
+        self.rank = array("i")
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Dict[str, Any]]) -> "CoreLibrary":
+        """Build from the cefr_words.json layout (word -> {pos, chn, def, ph, mrs, rank, level})"""
+        library = cls()
+        for word, entry in data.items():
+            library.append(word, entry)
+        return library
+
+    def append(self, word: str, entry: Dict[str, Any]):
+        """Add one word; later duplicates of the same word are ignored"""
+        if word in self.index:
+            return
+        self.index[sys.intern(word)] = len(self.mrs)
+        self.pos.append(entry.get("pos"))
+        self.level.append(entry.get("level") or entry.get("cefr"))
+        self.chn.append(_intern(entry.get("chn")))
+        self.definition.append(entry.get("def"))
+        self.phonetic.append(_intern(entry.get("ph")))
+        self.mrs.append(_to_int(entry.get("mrs")))
+        self.rank.append(_to_int(entry.get("rank")))
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self.index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.index)
+
+    def row(self, word: str) -> Optional[int]:
+        """Row id for a word, or None if not in the library"""
+        return self.index.get(word)
+
+
+class _MappedStringTable:
+    """Zero-copy view of a string table inside the mmap'd artifact"""
+
+    def __init__(self, buf: mmap.mmap, start: int):
+        self._buf = buf
+        (self.count,) = struct.unpack_from("<I", buf, start)
+        offsets_start = start + 4
+        self._blob = offsets_start + 4 * (self.count + 1)
+        self._offsets = memoryview(buf)[offsets_start:self._blob].cast("I")
+
+    def __len__(self) -> int:
+        return self.count
+
+    def raw(self, index: int) -> bytes:
+        return self._buf[self._blob + self._offsets[index]:self._blob + self._offsets[index + 1]]
+
+    def __getitem__(self, index: int) -> Optional[str]:
+        raw = self.raw(index)
+        return None if raw == _NULL else raw.decode("utf-8")
+
+    def find(self, value: str) -> Optional[int]:
+        """Binary search a sorted table; returns the index or None"""
+        key = value.encode("utf-8")
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            probe = self.raw(mid)
+            if probe < key:
+                lo = mid + 1
+            elif probe > key:
+                hi = mid
+            else:
+                return mid
+        return None
+
+
+class _MappedCodeTable:
+    """Dictionary-encoded column backed by the artifact"""
+
+    def __init__(self, codes: memoryview, values: List[Optional[str]]):
+        self.codes = codes
+        self.values = values
+
+    def __getitem__(self, row: int) -> Optional[str]:
+        return self.values[self.codes[row]]
+
+
+class MappedVariantIndex:
+    """variant -> lemma mapping served from the artifact (dict-like `get`)"""
+
+    def __init__(self, variants: _MappedStringTable, lemmas: _MappedStringTable):
+        self._variants = variants
+        self._lemmas = lemmas
+
+    def __len__(self) -> int:
+        return len(self._variants)
+
+    def __contains__(self, variant: str) -> bool:
+        return self._variants.find(variant) is not None
+
+    def get(self, variant: str, default: Optional[str] = None) -> Optional[str]:
+        index = self._variants.find(variant)
+        return default if index is None else self._lemmas[index]
+
+
+class MappedFormIndex:
+    """surface form -> resolved Core Library row, served from the artifact"""
+
+    def __init__(self, forms: _MappedStringTable, rows: memoryview):
+        self._forms = forms
+        self._rows = rows
+
+    def __len__(self) -> int:
+        return len(self._forms)
+
+    def get(self, form: str, default: Optional[int] = None) -> Optional[int]:
+        index = self._forms.find(form)
+        return default if index is None else self._rows[index]
+
+
+class MappedCoreLibrary(_RowAccessors):
+    """
+    Core Library served directly from the mmap'd binary artifact.
+    Same read interface as CoreLibrary; row ids are positions in the sorted word table.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, section_count = _HEADER.unpack_from(buf, 0)
+        if magic != ARTIFACT_MAGIC:
+            raise ValueError(f"{path} is not a core library artifact")
+        if version != ARTIFACT_VERSION or section_count != len(ARTIFACT_SECTIONS):
+            raise ValueError(f"{path} has artifact version {version}, expected {ARTIFACT_VERSION}")
+
+        sections = {}
+        for i, name in enumerate(ARTIFACT_SECTIONS):
+            sections[name] = _SECTION.unpack_from(buf, _HEADER.size + i * _SECTION.size)
+
+        def column(name: str, typecode: str) -> memoryview:
+            offset, length = sections[name]
+            return memoryview(buf)[offset:offset + length].cast(typecode)
+
+        def strings(name: str) -> _MappedStringTable:
+            return _MappedStringTable(buf, sections[name][0])
+
+        self.path = path
+        self._buf = buf
+        self.words = strings("words")
+        self.mrs = column("mrs", "i")
+        self.rank = column("rank", "i")
+        self.pos = _MappedCodeTable(column("pos_codes", "H"), list(_iter_table(strings("pos_values"))))
+        self.level = _MappedCodeTable(column("level_codes", "H"), list(_iter_table(strings("level_values"))))
+        self.chn = strings("chn")
+        self.definition = strings("def")
+        self.phonetic = strings("ph")
+        self.variant_map = MappedVariantIndex(strings("variants"), strings("variant_lemmas"))
+        self.resolved_forms = MappedFormIndex(strings("forms"), column("form_rows", "i"))
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def __iter__(self) -> Iterator[str]:
+        return _iter_table(self.words)
+
+    def row(self, word: str) -> Optional[int]:
+        """Row id for a word, or None if not in the library"""
+        return self.words.find(word)
+
+
+# ========== Entry Resolution ==========
+
+def arbitrate_core_row(word_lower: str, library, lemma_word: Optional[str]) -> Optional[int]:
+    """
+    Pick the final Core Library row for a word given its lemma (if any).
+    Returns None if neither the word nor its lemma is in the library.
+    """
+    original_row = library.row(word_lower)
+    lemma_row = library.row(lemma_word) if lemma_word else None
+
+    # Decision: Choose Best Entry (Original vs Lemma)
+    if original_row is not None and lemma_row is not None:
+        # Both exist. Compare difficulty (MRS).
+        # Default None to high score (100) to prefer the one with a valid score
+        mrs_orig = library.mrs_of(original_row)
+        mrs_lemma = library.mrs_of(lemma_row)
+
+        score_orig = 100 if mrs_orig is None else mrs_orig
+        score_lemma = 100 if mrs_lemma is None else mrs_lemma
+
+        # Prefer the "easier" interpretation (Lower MRS)
+        # This handles "taking" (80) vs "take" (0) -> Use "take"
+        if score_lemma < score_orig:
+            return lemma_row
+        return original_row
+
+    return original_row if original_row is not None else lemma_row
+
+
+def resolve_surface_forms(library: CoreLibrary, variant_map: Dict[str, str]) -> Dict[str, int]:
+    """
+    Materialize the final entry row for every known surface form:
+    each Core Library word and each variant in the static lemma index.
+    Forms that resolve to nothing are left out.
+    """
+    resolved = {}
+    for word in library:
+        row = arbitrate_core_row(word, library, variant_map.get(word))
+        if row is not None:
+            resolved[word] = row
+    for variant, lemma in variant_map.items():
+        if variant in resolved:
+            continue
+        row = arbitrate_core_row(variant, library, lemma)
+        if row is not None:
+            resolved[variant] = row
+    return resolved
+
+
+# ========== Loading & Compiling ==========
+
+def read_core_library_json(path: str) -> CoreLibrary:
+    """Load cefr_words.json into a CoreLibrary"""
+    with open(path, "r", encoding="utf-8") as f:
+        return CoreLibrary.from_dict(json.load(f))
+
+
+def read_lemma_index(path: str, variant_map: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """
+    Parse lemma.en.txt (or lemma.generated.txt) into a variant -> lemma mapping.
+    Format: lemma/rank -> variant1, variant2, ...
+    The first lemma listed for a variant wins; pass `variant_map` to merge
+    into an existing mapping without overriding it.
+    """
+    variant_map = {} if variant_map is None else variant_map
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            # Skip comments or empty lines
+            if line.startswith(';') or not line.strip():
+                continue
+
+            parts = line.strip().split(" -> ")
+            if len(parts) != 2:
+                continue
+
+            # Handle "lemma/rank" format in lemma.en.txt
+            lemma_part = parts[0].strip()
+            lemma = lemma_part.split("/")[0] if "/" in lemma_part else lemma_part
+
+            for variant in parts[1].split(","):
+                variant = variant.strip()
+                if variant and variant not in variant_map:
+                    # Map variant back to its lemma
+                    variant_map[variant] = lemma
+    return variant_map
+
+
+def write_lemma_index(path: str, variant_map: Dict[str, str], header: Iterable[str] = ()):
+    """Write a variant -> lemma mapping in lemma.en.txt format, grouped by lemma"""
+    groups: Dict[str, List[str]] = {}
+    for variant, lemma in variant_map.items():
+        groups.setdefault(lemma, []).append(variant)
+
+    with open(path, "w", encoding="utf-8") as f:
+        for line in header:
+            f.write(f"; {line}\n")
+        for lemma in sorted(groups):
+            f.write(f"{lemma} -> {','.join(sorted(groups[lemma]))}\n")
+
+
+# Parts of speech tried, in order, when guessing a lemma with lemminflect
+LEMMINFLECT_POS = ("VERB", "NOUN", "ADJ")
+
+
+@functools.lru_cache(maxsize=None)
+def _lemminflect_get_lemma() -> Optional[Callable]:
+    """Import lemminflect once; None if it is not installed"""
+    try:
+        from lemminflect import getLemma
+    except ImportError:
+        return None
+    return getLemma
+
+
+def lemminflect_available() -> bool:
+    return _lemminflect_get_lemma() is not None
+
+
+def lemminflect_lemma(word_lower: str, library) -> Optional[str]:
+    """
+    Dynamic lemma guess: the first VERB/NOUN/ADJ lemma from lemminflect
+    that actually exists in the Core Library. None if lemminflect is missing.
+    """
+    get_lemma = _lemminflect_get_lemma()
+    if get_lemma is None:
+        return None
+    try:
+        for pos in LEMMINFLECT_POS:
+            lemmas = get_lemma(word_lower, upos=pos)
+            if lemmas:
+                lemma_candidate = lemmas[0]
+                # Verify this candidate actually exists in our dictionary
+                if lemma_candidate in library:
+                    return lemma_candidate
+    except Exception:
+        pass
+    return None
+
+
+def write_core_artifact(path: str, library: CoreLibrary, variant_map: Dict[str, str]):
+    """
+    Compile a CoreLibrary and variant index into the binary artifact.
+    Written to a temp file and renamed, so running workers keep their old mapping.
+    """
+    if sys.byteorder != "little":
+        raise RuntimeError("Core library artifacts are little-endian only")
+
+    order = sorted(library.index, key=_utf8)
+    rows = [library.index[word] for word in order]
+    new_row = {old: new for new, old in enumerate(rows)}
+    variants = sorted(variant_map, key=_utf8)
+    resolved = resolve_surface_forms(library, variant_map)
+    forms = sorted(resolved, key=_utf8)
+
+    payloads = {
+        "words": _pack_strings(order),
+        "mrs": array("i", (library.mrs[r] for r in rows)).tobytes(),
+        "rank": array("i", (library.rank[r] for r in rows)).tobytes(),
+        "pos_codes": array("H", (library.pos.codes[r] for r in rows)).tobytes(),
+        "pos_values": _pack_strings(library.pos.values),
+        "level_codes": array("H", (library.level.codes[r] for r in rows)).tobytes(),
+        "level_values": _pack_strings(library.level.values),
+        "chn": _pack_strings(library.chn[r] for r in rows),
+        "def": _pack_strings(library.definition[r] for r in rows),
+        "ph": _pack_strings(library.phonetic[r] for r in rows),
+        "variants": _pack_strings(variants),
+        "variant_lemmas": _pack_strings(variant_map[v] for v in variants),
+        "forms": _pack_strings(forms),
+        "form_rows": array("i", (new_row[resolved[f]] for f in forms)).tobytes(),
+    }
+
+    offset = _align(_HEADER.size + _SECTION.size * len(ARTIFACT_SECTIONS))
+    table = []
+    for name in ARTIFACT_SECTIONS:
+        table.append((offset, len(payloads[name])))
+        offset = _align(offset + len(payloads[name]))
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(ARTIFACT_MAGIC, ARTIFACT_VERSION, len(ARTIFACT_SECTIONS)))
+        for entry in table:
+            f.write(_SECTION.pack(*entry))
+        for name, (section_offset, _length) in zip(ARTIFACT_SECTIONS, table):
+            f.write(b"\x00" * (section_offset - f.tell()))
+            f.write(payloads[name])
+    os.replace(tmp_path, path)
+
+
+def _pack_strings(values: Iterable[Optional[str]]) -> bytes:
+    encoded = [_NULL if v is None else v.encode("utf-8") for v in values]
+    offsets = array("I", [0])
+    total = 0
+    for item in encoded:
+        total += len(item)
+        offsets.append(total)
+    return struct.pack("<I", len(encoded)) + offsets.tobytes() + b"".join(encoded)
+
+
+def _iter_table(table: _MappedStringTable) -> Iterator[Optional[str]]:
+    return (table[i] for i in range(len(table)))
+
+
+def _utf8(value: str) -> bytes:
+    return value.encode("utf-8")
+
+
+def _align(offset: int, boundary: int = 8) -> int:
+    return (offset + boundary - 1) // boundary * boundary
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    """Intern short strings that repeat across entries (translations, phonetics)"""
+    if isinstance(value, str) and len(value) <= 32:
+        return sys.intern(value)
+    return value
+
+
+def _to_int(value: Any) -> int:
+    if value is None:
+        return MISSING
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        return MISSING
+    return value if 0 <= value < 2 ** 31 else MISSING
@@ -72,3 +72,8 @@ def init_db():
             conn.commit()
 
     Base.metadata.create_all(bind=engine)
+
+    # create_all skips existing tables: add indexes introduced since they were created
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
@@ -0,0 +1,151 @@
+"""
+Persistent Tier 3 Definition Cache
+
+Results from the external dictionary API are stored in the
+`external_definitions` table of the app database, so every uvicorn worker
+reads through the same cache and a restart keeps it warm:
+- Definitions expire after EXTERNAL_DEFINITION_TTL_DAYS; "no entry"
+  answers are kept for the shorter EXTERNAL_DEFINITION_NEGATIVE_TTL_HOURS
+- Transient failures (network errors, 5xx) are never stored
+- Every PRUNE_INTERVAL writes, expired rows are deleted and the table is
+  trimmed to EXTERNAL_DEFINITION_CACHE_SIZE, oldest (fetched_at, word) first
+"""
+
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import and_, delete, or_, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import sessionmaker
+
+from infrastructure.database import engine as app_engine
+from infrastructure.models import ExternalDefinitionModel
+
+EXTERNAL_DEFINITION_TTL_DAYS = float(os.getenv("EXTERNAL_DEFINITION_TTL_DAYS", "30"))
+EXTERNAL_DEFINITION_NEGATIVE_TTL_HOURS = float(os.getenv("EXTERNAL_DEFINITION_NEGATIVE_TTL_HOURS", "24"))
+EXTERNAL_DEFINITION_CACHE_SIZE = int(os.getenv("EXTERNAL_DEFINITION_CACHE_SIZE", "100000"))
+
+PRUNE_INTERVAL = 500
+
+# SQLite caps bound parameters per statement; query in chunks below that
+_QUERY_CHUNK = 500
+
+
+class DefinitionCache:
+    """
+    Read-through cache for external definitions.
+    Keys are lowercased words; values are {"definition", "example"} dicts.
+    Methods are synchronous (call them through blocking_executor from async code).
+    """
+
+    def __init__(
+        self,
+        engine: Engine = app_engine,
+        ttl: timedelta = timedelta(days=EXTERNAL_DEFINITION_TTL_DAYS),
+        negative_ttl: timedelta = timedelta(hours=EXTERNAL_DEFINITION_NEGATIVE_TTL_HOURS),
+        max_size: int = EXTERNAL_DEFINITION_CACHE_SIZE,
+    ):
+        self.engine = engine
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_size = max_size
+        self._session_factory = sessionmaker(bind=engine)
+        self._writes = 0
+        self._lock = threading.Lock()
+
+    def create_table(self):
+        ExternalDefinitionModel.__table__.create(bind=self.engine, checkfirst=True)
+
+    def get_many(self, words: Iterable[str], now: Optional[datetime] = None) -> Dict[str, dict]:
+        """Unexpired entries for the given lowercased words"""
+        words = list(dict.fromkeys(words))
+        now = now or datetime.now()
+        found = {}
+        with self._session_factory() as session:
+            for i in range(0, len(words), _QUERY_CHUNK):
+                rows = session.execute(
+                    select(
+                        ExternalDefinitionModel.word,
+                        ExternalDefinitionModel.definition,
+                        ExternalDefinitionModel.example,
+                    ).where(
+                        ExternalDefinitionModel.word.in_(words[i:i + _QUERY_CHUNK]),
+                        ExternalDefinitionModel.expires_at > now,
+                    )
+                )
+                for word, definition, example in rows:
+                    found[word] = {"definition": definition or "", "example": example or ""}
+        return found
+
+    def put_many(self, results: Dict[str, Optional[dict]], now: Optional[datetime] = None):
+        """
+        Store fetched results; a value of None means the API has no entry
+        for that word (negative result).
+        """
+        if not results:
+            return
+        now = now or datetime.now()
+        rows = []
+        for word, result in results.items():
+            found = bool(result)
+            rows.append(ExternalDefinitionModel(
+                word=word,
+                definition=result["definition"] if found else "",
+                example=result["example"] if found else "",
+                found=found,
+                fetched_at=now,
+                expires_at=now + (self.ttl if found else self.negative_ttl),
+            ))
+
+        words = list(results)
+        with self._session_factory() as session:
+            try:
+                for i in range(0, len(words), _QUERY_CHUNK):
+                    session.execute(delete(ExternalDefinitionModel).where(
+                        ExternalDefinitionModel.word.in_(words[i:i + _QUERY_CHUNK])
+                    ))
+                session.add_all(rows)
+                session.commit()
+            except IntegrityError:
+                # Another worker stored the same word first; its copy is as good
+                session.rollback()
+
+        with self._lock:
+            self._writes += len(rows)
+            due = self._writes >= PRUNE_INTERVAL
+            if due:
+                self._writes = 0
+        if due:
+            self.prune(now)
+
+    def prune(self, now: Optional[datetime] = None):
+        """Delete expired entries and trim the table to max_size"""
+        now = now or datetime.now()
+        with self._session_factory() as session:
+            session.execute(delete(ExternalDefinitionModel).where(
+                ExternalDefinitionModel.expires_at <= now
+            ))
+            # Newest entry beyond the cap in (fetched_at, word) order; it and
+            # everything before it goes (a batch shares one fetched_at, so the
+            # word breaks ties and exactly the overflow is deleted)
+            cutoff = session.execute(
+                select(ExternalDefinitionModel.fetched_at, ExternalDefinitionModel.word)
+                .order_by(ExternalDefinitionModel.fetched_at.desc(), ExternalDefinitionModel.word.desc())
+                .offset(self.max_size)
+                .limit(1)
+            ).first()
+            if cutoff is not None:
+                fetched_at, word = cutoff
+                session.execute(delete(ExternalDefinitionModel).where(or_(
+                    ExternalDefinitionModel.fetched_at < fetched_at,
+                    and_(ExternalDefinitionModel.fetched_at == fetched_at, ExternalDefinitionModel.word <= word)
+                )))
+            session.commit()
+
+    def clear(self):
+        with self._session_factory() as session:
+            session.execute(delete(ExternalDefinitionModel))
+            session.commit()
@@ -2,17 +2,138 @@
 Dictionary Service Infrastructure
 
 Handles hybrid vocabulary lookup:
-1. Tier 1: In-Memory Top 30k Core Library (cefr_words.json)
+1. Tier 1: In-Memory Top 30k Core Library (cefr_words.json, or the
+   mmap'd core_library.bin artifact when it has been built)
 2. Tier 2: On-Disk Full 770k Dictionary (sqlite3)
 """
 
-import json
+import hashlib
 import os
-from typing import Any, Dict, Optional
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
-from sqlalchemy import text
+from infrastructure.core_library import (
+    CoreLibrary,
+    MappedCoreLibrary,
+    arbitrate_core_row,
+    lemminflect_available,
+    lemminflect_lemma,
+    read_core_library_json,
+    read_lemma_index,
+    resolve_surface_forms,
+)
+from infrastructure.dictionary_store import dictionary_store
+from infrastructure.highlight_cache import highlight_result_cache
+from infrastructure.highlight_index import DifficultyIndex
 
-from infrastructure.database import engine
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
+CORE_LIBRARY_PATH = os.path.join(DATA_DIR, "cefr_words.json")
+LEMMA_INDEX_PATH = os.path.join(DATA_DIR, "lemma.en.txt")
+# lemminflect results precomputed by build_lemma_table.py, merged after lemma.en.txt
+GENERATED_LEMMA_PATH = os.path.join(DATA_DIR, "lemma.generated.txt")
+# Compiled from the files above by build_core_library.py
+CORE_ARTIFACT_PATH = os.path.join(DATA_DIR, "core_library.bin")
+
+# Max number of resolved words (hits and misses) kept in the lookup cache
+LOOKUP_CACHE_SIZE = int(os.getenv("DICTIONARY_CACHE_SIZE", "50000"))
+
+# Cached value for words that no tier could resolve
+_NOT_FOUND = ("none", None)
+
+
+class LookupCache:
+    """
+    Thread-safe, size-bounded LRU cache for dictionary lookups.
+    Keys are lowercased words; values are (source, entry) tuples, where entry
+    is a Core Library row id ("core") or a Tier 2 row dict ("full", or "slim"
+    when fetched without the definition).
+    """
+
+    def __init__(self, max_size: int = LOOKUP_CACHE_SIZE):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[tuple]:
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: str, value: tuple):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+
+def load_variant_map() -> Dict[str, str]:
+    """Static variant index: lemma.en.txt first, then precomputed lemminflect forms"""
+    variant_map = {}
+    if os.path.exists(LEMMA_INDEX_PATH):
+        read_lemma_index(LEMMA_INDEX_PATH, variant_map)
+    else:
+        print("⚠ lemma.en.txt not found, skipping static lemmatization")
+    if os.path.exists(GENERATED_LEMMA_PATH):
+        read_lemma_index(GENERATED_LEMMA_PATH, variant_map)
+    return variant_map
+
+
+def dictionary_data_stamp() -> str:
+    """Size and mtime of the dictionary data files (a restart with new data gets a new stamp)"""
+    digest = hashlib.blake2b(digest_size=8)
+    paths = (CORE_ARTIFACT_PATH, CORE_LIBRARY_PATH, LEMMA_INDEX_PATH, GENERATED_LEMMA_PATH, dictionary_store.data_path())
+    for path in paths:
+        if path and os.path.exists(path):
+            stat = os.stat(path)
+            digest.update(f"{os.path.basename(path)}\x00{stat.st_size}\x00{stat.st_mtime_ns}\x00".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def default_lemminflect_fallback(generated_path: str = GENERATED_LEMMA_PATH) -> bool:
+    """
+    LEMMINFLECT_FALLBACK when it is not set: on when lemma.generated.txt is
+    missing and lemminflect is installed, so such installs keep resolving
+    inflected forms that lemma.en.txt does not list
+    """
+    if os.path.exists(generated_path):
+        return False
+    if lemminflect_available():
+        return True
+    print("⚠ lemma.generated.txt not found and lemminflect not installed: inflected forms missing from "
+          "lemma.en.txt will not resolve (pip install lemminflect, then run build_lemma_table.py)")
+    return False
+
+
+# Call lemminflect at request time for words missing from the static variant index
+_LEMMINFLECT_FALLBACK_SETTING = os.getenv("LEMMINFLECT_FALLBACK")
+LEMMINFLECT_FALLBACK = (
+    _LEMMINFLECT_FALLBACK_SETTING.lower() in ("1", "true", "yes")
+    if _LEMMINFLECT_FALLBACK_SETTING else default_lemminflect_fallback()
+)
 
 
 class DictionaryService:
@@ -21,61 +142,107 @@ class DictionaryService:
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(DictionaryService, cls).__new__(cls)
-            cls._instance.cefr_data = {}
+            cls._instance.cefr_data = CoreLibrary()
             cls._instance.variant_map = {} # variant -> lemma mapping
-            cls._instance.load_core_library()
-            cls._instance.load_lemma_index()
+            cls._instance.resolved_forms = {} # surface form -> final Core Library row
+            cls._instance.cache = LookupCache()
+            cls._instance._difficulty_index = None
+            cls._instance._index_lock = threading.Lock()
+            cls._instance._reloads = 0
+            cls._instance.generation = ""
+            cls._instance._load_tier1()
         return cls._instance
 
+    def _load_tier1(self):
+        """Prefer the precompiled artifact; fall back to parsing the source files"""
+        if not self.load_compiled_library():
+            self.load_core_library()
+            self.load_lemma_index()
+            self.resolved_forms = resolve_surface_forms(self.cefr_data, self.variant_map)
+            print(f"✓ Resolved {len(self.resolved_forms)} surface forms to Core Library entries")
+
+    def load_compiled_library(self, path: str = CORE_ARTIFACT_PATH) -> bool:
+        """
+        Map the precompiled Core Library + lemma index artifact (build_core_library.py).
+        Returns False if it is missing, stale or unreadable.
+        """
+        if not os.path.exists(path):
+            return False
+
+        artifact_mtime = os.path.getmtime(path)
+        for source in (CORE_LIBRARY_PATH, LEMMA_INDEX_PATH, GENERATED_LEMMA_PATH):
+            if os.path.exists(source) and os.path.getmtime(source) > artifact_mtime:
+                print(f"⚠ {os.path.basename(path)} is older than {os.path.basename(source)}, "
+                      "run build_core_library.py to refresh it")
+                return False
+
+        try:
+            library = MappedCoreLibrary(path)
+        except Exception as e:
+            print(f"⚠ Failed to map compiled Core Library: {e}")
+            return False
+
+        self.cefr_data = library
+        self.variant_map = library.variant_map
+        self.resolved_forms = library.resolved_forms
+        self.invalidate_cache()
+        print(f"✓ Mapped {len(library)} words, {len(library.variant_map)} variants and "
+              f"{len(library.resolved_forms)} resolved forms from {os.path.basename(path)}")
+        return True
+
     def load_core_library(self):
         """Load Tier 1 Core Vocabulary into memory"""
-        cefr_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "cefr_words.json")
-        if os.path.exists(cefr_path):
+        if os.path.exists(CORE_LIBRARY_PATH):
             try:
-                with open(cefr_path, 'r', encoding='utf-8') as f:
-                    self.cefr_data = json.load(f)
+                self.cefr_data = read_core_library_json(CORE_LIBRARY_PATH)
+                self.invalidate_cache()
                 print(f"✓ Loaded {len(self.cefr_data)} words from Core Library (Tier 1)")
             except Exception as e:
                 print(f"❌ Failed to load Core Library: {e}")
         else:
-            print(f"⚠ Warning: Core Library not found at {cefr_path}")
+            print(f"⚠ Warning: Core Library not found at {CORE_LIBRARY_PATH}")
 
     def load_lemma_index(self):
         """
-        Load lemma.en.txt to build variant -> lemma mapping.
+        Load lemma.en.txt (plus lemma.generated.txt if present) to build
+        variant -> lemma mapping.
         Format: lemma -> variant1, variant2, ...
         """
         try:
-            file_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "lemma.en.txt")
-            if not os.path.exists(file_path):
-                print("⚠ lemma.en.txt not found, skipping static lemmatization")
-                return
-
-            count = 0
-            with open(file_path, "r", encoding="utf-8") as f:
-                for line in f:
-                    # Skip comments or empty lines
-                    if line.startswith(';') or not line.strip():
-                        continue
-                        
-                    parts = line.strip().split(" -> ")
-                    if len(parts) != 2:
-                        continue
-                    
-                    # Handle "lemma/rank" format in lemma.en.txt
-                    lemma_part = parts[0].strip()
-                    lemma = lemma_part.split("/")[0] if "/" in lemma_part else lemma_part
-                    variants_str = parts[1]
-                    variants = [v.strip() for v in variants_str.split(",")]
-                    
-                    for variant in variants:
-                        if variant and variant not in self.variant_map:
-                             # Map variant back to its lemma
-                             self.variant_map[variant] = lemma
-                    count += 1
-            print(f"✓ Loaded {len(self.variant_map)} variants from lemma.en.txt")
+            self.variant_map = load_variant_map()
+            self.invalidate_cache()
+            print(f"✓ Loaded {len(self.variant_map)} variants from lemma index")
         except Exception as e:
-            print(f"⚠ Failed to load lemma.en.txt: {e}")
+            print(f"⚠ Failed to load lemma index: {e}")
+
+    def reload(self):
+        """Reload Tier 1 data and the lemma index, dropping cached lookups"""
+        self.cefr_data = CoreLibrary()
+        self.variant_map = {}
+        self.resolved_forms = {}
+        self._load_tier1()
+        self.invalidate_cache()
+
+    def invalidate_cache(self):
+        """
+        Drop all cached lookups and the page results built from them, and
+        move to a new `generation` so page fingerprints handed out before
+        are no longer reported as unchanged.
+        Call after the core library or the Tier 2 `dictionary` table is reloaded.
+        """
+        self.cache.clear()
+        highlight_result_cache.clear()
+        self._reloads += 1
+        self.generation = f"{dictionary_data_stamp()}.{self._reloads}"
+
+    def reload_tier2(self):
+        """Reopen Tier 2 connections (e.g. after the dictionary file was replaced)"""
+        dictionary_store.dispose()
+        self.invalidate_cache()
+
+    def cache_stats(self) -> Dict[str, int]:
+        """Lookup cache counters for /health"""
+        return self.cache.stats()
 
     def calculate_dynamic_mrs(self, rank: Optional[int]) -> Optional[int]:
         """
@@ -110,136 +277,179 @@ class DictionaryService:
         except Exception:
             return 100 # Safe default for生僻词
 
-    def lookup(self, word: str) -> Dict[str, Any]:
+    def lookup(self, word: str, with_definition: bool = True) -> Dict[str, Any]:
         """
         Lookup word info from hybrid sources.
         Returns dict with keys: found, word, definitions, translation, etc.
         """
-        word_lower = word.lower()
-        
-        # 1. Tier 1: Check Core Library (Memory)
-        original_entry = self.cefr_data.get(word_lower)
-        
-        # 2. Find Lemma (Base Form)
-        # Priority 1: ECDICT lemma.en.txt (Static Mapping)
-        lemma_word = self.variant_map.get(word_lower)
-        
-        # Priority 2: lemminflect (Dynamic Analysis) - ONLY if static failed
-        if not lemma_word:
-            try:
-                from lemminflect import getLemma
-                # Check Verb, Noun, Adjective for base forms
-                for pos in ["VERB", "NOUN", "ADJ"]:
-                    lemmas = getLemma(word_lower, upos=pos)
-                    if lemmas:
-                        lemma_candidate = lemmas[0]
-                        # Verify this candidate actually exists in our dictionary
-                        if lemma_candidate in self.cefr_data:
-                            lemma_word = lemma_candidate
-                            break
-            except ImportError:
-                pass 
-            except Exception:
-                pass
-        
-        # 3. Lookup Lemma Data
-        lemma_entry = None
-        if lemma_word and lemma_word in self.cefr_data:
-            lemma_entry = self.cefr_data[lemma_word]
-            
-        # 4. Decision: Choose Best Entry (Original vs Lemma)
-        final_entry = None
-        
-        if original_entry and lemma_entry:
-            # Both exist. Compare difficulty (MRS).
-            # Default None to high score (100) to prefer the one with a valid score
-            mrs_orig = original_entry.get("mrs")
-            mrs_lemma = lemma_entry.get("mrs")
-            
-            score_orig = 100 if mrs_orig is None else mrs_orig
-            score_lemma = 100 if mrs_lemma is None else mrs_lemma
-            
-            # Prefer the "easier" interpretation (Lower MRS)
-            # This handles "taking" (80) vs "take" (0) -> Use "take"
-            if score_lemma < score_orig:
-                final_entry = lemma_entry
-            else:
-                final_entry = original_entry
-                
-        elif original_entry:
-            final_entry = original_entry
-        elif lemma_entry:
-            final_entry = lemma_entry
-            
-        if final_entry:
-            return self._format_entry(word, final_entry)
+        return self.lookup_many([word], with_definition)[word]
 
-        # 2. Tier 2: Check Full Dictionary (Database)
-        db_result = self._lookup_tier2(word_lower)
-        if db_result:
-            return {
-                "word": word,
-                "found": True,
-                "source": "full",
-                "level": self._derive_cefr_from_mrs(self.calculate_dynamic_mrs(db_result.get("ranking"))), 
-                "mrs": self.calculate_dynamic_mrs(db_result.get("ranking")),
-                "pos": None,
-                "definition": db_result.get("definition"),
-                "translation": db_result.get("translation"),
-                "phonetic": db_result.get("phonetic"),
-                "rank": db_result.get("ranking")
-            }
+    def lookup_many(self, words: Iterable[str], with_definition: bool = True) -> Dict[str, Dict[str, Any]]:
+        """
+        Batch version of lookup().
+
+        Deduplicates the input, resolves Tier 1 and lemma layers in memory,
+        then fetches every remaining word from Tier 2 in one round trip.
+        With `with_definition=False` (highlighting), Tier 2 words come from the
+        slim projection and carry no definition text.
+        Returns a dict keyed by the requested word (original casing).
+        """
+        requested = list(dict.fromkeys(words))
+
+        resolved_by_lower = {}
+        tier2_candidates = []
+        for word_lower in dict.fromkeys(w.lower() for w in requested):
+            resolved = self.cache.get(word_lower)
+            if resolved is not None and with_definition and resolved[0] == "slim":
+                # Cached slim projection has no definition: fetch the full row
+                resolved = None
+            if resolved is None:
+                core_row = self._resolve_core_entry(word_lower)
+                if core_row is not None:
+                    resolved = ("core", core_row)
+                    self.cache.put(word_lower, resolved)
+                else:
+                    tier2_candidates.append(word_lower)
+                    continue
+            resolved_by_lower[word_lower] = resolved
+
+        tier2_source = "full" if with_definition else "slim"
+        tier2_entries = self._lookup_tier2_many(tier2_candidates, slim=not with_definition)
+        for word_lower in tier2_candidates:
+            if tier2_entries is None:
+                # Tier 2 unavailable: answer "not found" but don't remember it
+                resolved_by_lower[word_lower] = _NOT_FOUND
+                continue
+            db_result = tier2_entries.get(word_lower)
+            resolved = (tier2_source, db_result) if db_result else _NOT_FOUND
+            self.cache.put(word_lower, resolved)
+            resolved_by_lower[word_lower] = resolved
+
+        return {
+            word: self._format_resolved(word, resolved_by_lower[word.lower()])
+            for word in requested
+        }
+
+    @property
+    def difficulty_index(self) -> DifficultyIndex:
+        """Per-threshold bitsets over the current Core Library (rebuilt when it is replaced)"""
+        index = self._difficulty_index
+        if index is None or index.library is not self.cefr_data:
+            with self._index_lock:
+                index = self._difficulty_index
+                if index is None or index.library is not self.cefr_data:
+                    index = DifficultyIndex(self.cefr_data, self._core_level)
+                    self._difficulty_index = index
+        return index
+
+    def partition_by_difficulty(
+        self,
+        words: Iterable[str],
+        difficulty_level: str,
+        difficulty_mrs: Optional[int] = None
+    ) -> Tuple[List[str], List[str]]:
+        """
+        Split lowercased words by the difficulty rule without formatting entries.
+        Returns (Core Library words at or above the threshold, words Tier 1
+        cannot resolve). Core Library words below the threshold are dropped.
+        """
+        rows = {}
+        unresolved = []
+        for word_lower in words:
+            row = self._resolve_core_entry(word_lower)
+            if row is None:
+                unresolved.append(word_lower)
+            else:
+                rows[word_lower] = row
+        passing = self.difficulty_index.select(rows, difficulty_level, difficulty_mrs)
+        return passing, unresolved
 
+    def _format_resolved(self, word: str, resolved: Optional[tuple]) -> Dict[str, Any]:
+        """Format a (source, entry) resolution for the requested word"""
+        source, entry = resolved or _NOT_FOUND
+        if source == "core":
+            return self._format_entry(word, entry)
+        if source in ("full", "slim"):
+            return self._format_tier2_entry(word, entry)
         return {"word": word, "found": False}
 
-    def _lookup_tier2(self, word: str) -> Optional[Dict[str, Any]]:
-        """Query SQLite database for full dictionary entry"""
+    def _resolve_core_entry(self, word_lower: str) -> Optional[int]:
+        """
+        Resolve a lowercased word against Tier 1 and the lemma layer.
+        Returns the Core Library row to format, or None if Tier 1 has no match.
+        """
+        # Precomputed: every Core Library word and static variant -> final row
+        row = self.resolved_forms.get(word_lower)
+        if row is not None or not LEMMINFLECT_FALLBACK:
+            return row
+
+        # Priority 2: lemminflect (Dynamic Analysis) - ONLY if static failed.
+        # Most forms are precomputed into lemma.generated.txt by build_lemma_table.py;
+        # without that table the runtime call is on by default (see LEMMINFLECT_FALLBACK).
+        lemma_word = lemminflect_lemma(word_lower, self.cefr_data)
+        return arbitrate_core_row(word_lower, self.cefr_data, lemma_word)
+
+    def _lookup_tier2_many(self, words: List[str], slim: bool = False) -> Optional[Dict[str, Dict[str, Any]]]:
+        """
+        Query Tier 2 for many (already lowercased, deduplicated) words at once
+        through the read-only dictionary store.
+        Returns None if the query failed (e.g. table not imported yet).
+        """
+        results = {}
+        if not words:
+            return results
+
         try:
-            # Use direct connection for performance on read-only lookup
-            with engine.connect() as conn:
-                # Query the 'dictionary' table created by download script
-                result = conn.execute(
-                    text("SELECT word, ranking, translation, definition, phonetic, tag FROM dictionary WHERE word = :word"),
-                    {"word": word}
-                ).first()
-                
-                if result:
-                    return {
-                        "word": result[0],
-                        "ranking": result[1],
-                        "translation": result[2],
-                        "definition": result[3],
-                        "phonetic": result[4],
-                        "tag": result[5]
-                    }
+            for row in dictionary_store.fetch_many(words, slim=slim):
+                results[row[0]] = dict(row._mapping)
         except Exception as e:
             # Table might not exist yet if script failed or wasn't run
             print(f"⚠ Tier 2 Lookup Error: {e}")
-            
-        return None
-
-    def _format_entry(self, word: str, entry: Dict) -> Dict:
-        """Format CEFR entry into standard response"""
-        level = entry.get("level") or entry.get("cefr")
-        mrs = entry.get("mrs")
-        
-        # If level is Unknown or missing, try to derive it from MRS
-        if (not level or level == "Unknown") and mrs is not None:
-            level = self._derive_cefr_from_mrs(mrs)
-             
+            return None
+
+        return results
+
+    def _format_tier2_entry(self, word: str, db_result: Dict[str, Any]) -> Dict:
+        """Format Tier 2 (full dictionary) row into standard response"""
+        mrs = self.calculate_dynamic_mrs(db_result.get("ranking"))
+        return {
+            "word": word,
+            "found": True,
+            "source": "full",
+            "level": self._derive_cefr_from_mrs(mrs),
+            "mrs": mrs,
+            "pos": None,
+            "definition": db_result.get("definition"),
+            "translation": db_result.get("translation"),
+            "phonetic": db_result.get("phonetic"),
+            "rank": db_result.get("ranking")
+        }
+
+    def _format_entry(self, word: str, row: int) -> Dict:
+        """Format a Core Library row into standard response"""
+        library = self.cefr_data
         return {
             "word": word, # Return original requested word
             "found": True,
             "source": "core",
-            "level": level, 
-            "mrs": mrs,
-            "pos": entry.get("pos"),
-            "definition": entry.get("def"),
-            "translation": entry.get("chn"),
-            "phonetic": entry.get("ph"),
-            "rank": entry.get("rank")
+            "level": self._core_level(row),
+            "mrs": library.mrs_of(row),
+            "pos": library.pos[row],
+            "definition": library.definition[row],
+            "translation": library.chn[row],
+            "phonetic": library.phonetic[row],
+            "rank": library.rank_of(row)
         }
 
+    def _core_level(self, row: int) -> Optional[str]:
+        """CEFR level of a Core Library row, derived from MRS if Unknown or missing"""
+        level = self.cefr_data.level[row]
+        if not level or level == "Unknown":
+            mrs = self.cefr_data.mrs_of(row)
+            if mrs is not None:
+                level = self._derive_cefr_from_mrs(mrs)
+        return level
+
     def _derive_cefr_from_mrs(self, mrs: Optional[int]) -> Optional[str]:
         """Helper to derive CEFR level label from MRS score"""
         if mrs is None:
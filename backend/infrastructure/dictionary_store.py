@@ -0,0 +1,179 @@
+"""
+Read-only Tier 2 Dictionary Store
+
+The 770k-entry `dictionary` table is static reference data, so it gets its
+own engine and connection pool instead of sharing the app engine that
+serves vocabulary / known-word writes:
+- SQLite is opened read-only (`mode=ro`, optionally `immutable=1` when the
+  dictionary lives in its own file that nothing writes to)
+- No pre-ping on checkout; mmap_size / cache_size tuned for lookups
+- IN-list sizes are padded to power-of-two buckets so only a handful of
+  distinct SQL strings exist and sqlite3's per-connection prepared
+  statement cache is reused across calls
+
+Highlight-time lookups only need ranking, translation and phonetic. They
+read the narrow `dictionary_slim` table (built by build_dictionary_slim.py)
+instead of full rows with the long definition text.
+"""
+
+import os
+import threading
+from typing import List, Optional
+
+from sqlalchemy import bindparam, create_engine, event, inspect, text
+from sqlalchemy.engine import Engine
+
+from infrastructure.database import DATABASE_URL
+
+# Defaults to the main database file, where the download scripts create the table
+DICTIONARY_DATABASE_URL = os.getenv("DICTIONARY_DATABASE_URL", DATABASE_URL)
+# Only safe when the dictionary file is never written while the app runs
+DICTIONARY_DB_IMMUTABLE = os.getenv("DICTIONARY_DB_IMMUTABLE", "false").lower() in ("1", "true", "yes")
+DICTIONARY_POOL_SIZE = int(os.getenv("DICTIONARY_POOL_SIZE", "8"))
+DICTIONARY_MMAP_SIZE = int(os.getenv("DICTIONARY_MMAP_SIZE", str(256 * 1024 * 1024)))
+DICTIONARY_CACHE_KB = int(os.getenv("DICTIONARY_CACHE_KB", str(64 * 1024)))
+
+TIER2_COLUMNS = "word, ranking, translation, definition, phonetic, tag"
+SLIM_COLUMNS = "word, ranking, translation, phonetic"
+SLIM_TABLE = "dictionary_slim"
+
+# Above this many words, stage them in a temp table and join instead of
+# binding one parameter per word.
+TIER2_IN_CLAUSE_LIMIT = 512
+
+
+def readonly_sqlite_url(url: str, immutable: bool = False) -> str:
+    """Turn a file-based sqlite:/// URL into a read-only URI connection string"""
+    prefix = "sqlite:///"
+    if not url.startswith(prefix) or url == prefix or "uri=true" in url:
+        return url
+    params = "mode=ro&immutable=1" if immutable else "mode=ro"
+    return f"{prefix}file:{url[len(prefix):]}?{params}&uri=true"
+
+
+def _in_clause_bucket(count: int) -> int:
+    """Smallest power of two >= count"""
+    size = 1
+    while size < count:
+        size *= 2
+    return size
+
+
+class DictionaryStore:
+    """
+    Read-only access to the Tier 2 `dictionary` table.
+    The engine is created lazily so a missing database only fails the lookup.
+    """
+
+    def __init__(self, url: str = DICTIONARY_DATABASE_URL, engine: Optional[Engine] = None):
+        self.url = url
+        self._engine = engine
+        self._has_slim_table: Optional[bool] = None
+        # Lookups run on the blocking thread pool; create the engine only once
+        self._engine_lock = threading.Lock()
+
+    @property
+    def engine(self) -> Engine:
+        if self._engine is None:
+            with self._engine_lock:
+                if self._engine is None:
+                    self._engine = self._create_engine()
+        return self._engine
+
+    def _create_engine(self) -> Engine:
+        if not self.url.startswith("sqlite"):
+            return create_engine(self.url, pool_size=DICTIONARY_POOL_SIZE, pool_recycle=3600)
+
+        engine = create_engine(
+            readonly_sqlite_url(self.url, DICTIONARY_DB_IMMUTABLE),
+            pool_size=DICTIONARY_POOL_SIZE,
+            max_overflow=DICTIONARY_POOL_SIZE,
+            connect_args={
+                "check_same_thread": False,
+                "timeout": 30.0,
+                "cached_statements": 256,
+            },
+        )
+
+        @event.listens_for(engine, "connect")
+        def tune_connection(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            cursor.execute(f"PRAGMA mmap_size={DICTIONARY_MMAP_SIZE}")
+            cursor.execute(f"PRAGMA cache_size=-{DICTIONARY_CACHE_KB}")
+            cursor.execute("PRAGMA temp_store=MEMORY")
+            cursor.close()
+
+        return engine
+
+    def has_slim_table(self) -> bool:
+        """Whether build_dictionary_slim.py has been run (checked once per pool)"""
+        if self._has_slim_table is None:
+            self._has_slim_table = inspect(self.engine).has_table(SLIM_TABLE)
+        return self._has_slim_table
+
+    def fetch_many(self, words: List[str], slim: bool = False) -> list:
+        """
+        Fetch dictionary rows for the given words.
+        Full rows have TIER2_COLUMNS; `slim=True` returns only SLIM_COLUMNS,
+        read from the slim table when it exists.
+        Raises on database errors so callers can tell "missing" from "unavailable".
+        """
+        if not words:
+            return []
+
+        if slim:
+            table = SLIM_TABLE if self.has_slim_table() else "dictionary"
+            columns = SLIM_COLUMNS
+        else:
+            table, columns = "dictionary", TIER2_COLUMNS
+
+        with self.engine.connect() as conn:
+            if len(words) <= TIER2_IN_CLAUSE_LIMIT:
+                # Pad to a bucket size so the SQL text (and prepared statement) repeats
+                padded = words + [words[-1]] * (_in_clause_bucket(len(words)) - len(words))
+                return conn.execute(
+                    text(f"SELECT {columns} FROM {table} WHERE word IN :words")
+                    .bindparams(bindparam("words", expanding=True)),
+                    {"words": padded}
+                ).all()
+
+            conn.execute(text(
+                "CREATE TEMP TABLE IF NOT EXISTS tier2_lookup (word TEXT PRIMARY KEY)"
+            ))
+            conn.execute(text("DELETE FROM tier2_lookup"))
+            conn.execute(
+                text("INSERT INTO tier2_lookup (word) VALUES (:word)"),
+                [{"word": w} for w in words]
+            )
+            rows = conn.execute(text(
+                f"SELECT {columns} FROM {table} "
+                "JOIN tier2_lookup USING (word)"
+            )).all()
+            # Temp table lives on this pooled connection; clear it for the next user
+            conn.execute(text("DELETE FROM tier2_lookup"))
+            return rows
+
+    def data_path(self) -> Optional[str]:
+        """File of a dedicated SQLite dictionary database (None when it is the app database)"""
+        prefix = "sqlite:///"
+        if self.url == DATABASE_URL or not self.url.startswith(prefix) or self.url == prefix:
+            return None
+        return self.url[len(prefix):].split("?", 1)[0]
+
+    def dispose(self):
+        """Close pooled connections (e.g. after the dictionary file is replaced)"""
+        self._has_slim_table = None
+        if self._engine is not None:
+            self._engine.dispose()
+
+
+def short_translation(translation: Optional[str], max_chars: int = 80) -> Optional[str]:
+    """First sense of an ECDICT translation (lines are separated by literal or real newlines)"""
+    if not translation:
+        return translation
+    first = translation.replace("\\n", "\n").split("\n", 1)[0].strip()
+    return first[:max_chars]
+
+
+# Global instance
+dictionary_store = DictionaryStore()
@@ -0,0 +1,75 @@
+"""
+Bounded Thread Pool for Blocking Work
+
+The SQLAlchemy session and DictionaryService are synchronous. Async route
+handlers hand that work to this pool so SQLite queries never run on the
+event loop, and the pool size caps how many of them run at once per worker
+(the DB pools and SQLite locks don't benefit from more).
+"""
+
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+BLOCKING_POOL_SIZE = int(os.getenv("BLOCKING_POOL_SIZE", "16"))
+
+
+class BlockingExecutor:
+    """
+    Runs synchronous callables on a dedicated thread pool from async code.
+    The pool is created on first use and recreated after shutdown().
+    """
+
+    def __init__(self, max_workers: int = BLOCKING_POOL_SIZE):
+        self.max_workers = max_workers
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._active = 0
+        self._queued = 0
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="mixread-blocking"
+                )
+            return self._pool
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Await func(*args, **kwargs) executed on the pool"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self._queued += 1
+        return await loop.run_in_executor(
+            self._get_pool(),
+            functools.partial(self._call, func, *args, **kwargs)
+        )
+
+    def _call(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        with self._lock:
+            self._queued -= 1
+            self._active += 1
+        try:
+            return func(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._active -= 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"max_workers": self.max_workers, "active": self._active, "queued": self._queued}
+
+    def shutdown(self):
+        """Wait for running work and release the threads"""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+
+# Global instance
+blocking_executor = BlockingExecutor()
@@ -0,0 +1,166 @@
+"""
+Tier 3 External Definition Source
+
+Words missing from both local tiers fall back to a Free Dictionary API
+compatible HTTP service (api.dictionaryapi.dev by default):
+- One pooled httpx.AsyncClient per worker, opened at startup, so repeated
+  misses reuse keep-alive connections instead of a TCP+TLS handshake each
+- fetch_many() requests all misses concurrently, bounded by a semaphore,
+  within a total time budget; words still pending when it runs out come
+  back empty (and uncached) so the response is not held up
+- Results are read through the persistent DefinitionCache (see
+  definition_cache.py), so all workers share them across restarts
+- The base URL / httpx transport are injectable, so tests and benchmarks
+  point it at a local stub instead of the public API
+"""
+
+import asyncio
+import os
+from typing import Dict, Iterable, Optional
+
+import httpx
+
+from infrastructure.definition_cache import DefinitionCache
+from infrastructure.executor import blocking_executor
+
+EXTERNAL_DICTIONARY_URL = os.getenv(
+    "EXTERNAL_DICTIONARY_URL", "https://api.dictionaryapi.dev/api/v2/entries/en"
+)
+EXTERNAL_DICTIONARY_TIMEOUT = float(os.getenv("EXTERNAL_DICTIONARY_TIMEOUT", "5.0"))
+# Max in-flight requests to the external API per worker
+EXTERNAL_DICTIONARY_CONCURRENCY = int(os.getenv("EXTERNAL_DICTIONARY_CONCURRENCY", "8"))
+# Total seconds one fetch_many() call may spend on external lookups
+EXTERNAL_DICTIONARY_BUDGET = float(os.getenv("EXTERNAL_DICTIONARY_BUDGET", "3.0"))
+
+MAX_DEFINITION_CHARS = 150
+
+
+def empty_definition() -> dict:
+    return {"definition": "", "example": ""}
+
+
+def parse_entries(data) -> Optional[dict]:
+    """First definition and example of a Free Dictionary API response, or None"""
+    if not data:
+        return None
+
+    entry = data[0]
+    meanings = entry.get("meanings") or []
+    definitions = (meanings[0].get("definitions") or []) if meanings else []
+    if not definitions:
+        return empty_definition()
+
+    definition = definitions[0].get("definition", "")
+    if len(definition) > MAX_DEFINITION_CHARS:
+        definition = definition[:MAX_DEFINITION_CHARS] + "..."
+    return {"definition": definition, "example": definitions[0].get("example", "")}
+
+
+class ExternalDefinitionSource:
+    """
+    Fetches definitions from the external dictionary API, reading through
+    the persistent DefinitionCache shared by all workers.
+    The HTTP client and semaphore belong to the event loop that called
+    start(); they are created on first use if start() was skipped.
+    """
+
+    def __init__(
+        self,
+        base_url: str = EXTERNAL_DICTIONARY_URL,
+        timeout: float = EXTERNAL_DICTIONARY_TIMEOUT,
+        max_concurrency: int = EXTERNAL_DICTIONARY_CONCURRENCY,
+        budget: float = EXTERNAL_DICTIONARY_BUDGET,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        cache: Optional[DefinitionCache] = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.budget = budget
+        self.transport = transport
+        self.cache = cache if cache is not None else DefinitionCache()
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def start(self):
+        """Open the shared client (called from the app startup hook)"""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                transport=self.transport,
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency,
+                ),
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    async def aclose(self):
+        client, self._client = self._client, None
+        self._semaphore = None
+        if client is not None:
+            await client.aclose()
+
+    async def fetch(self, word: str) -> dict:
+        """Definition and example for one word (empty strings when unavailable)"""
+        results = await self.fetch_many([word], budget=self.timeout)
+        return results[word]
+
+    async def fetch_many(self, words: Iterable[str], budget: Optional[float] = None) -> Dict[str, dict]:
+        """
+        Fetch several words concurrently.
+        Returns {original word: result}; words not answered within the
+        budget map to an empty result.
+        """
+        words = list(dict.fromkeys(words))
+        lowered = list(dict.fromkeys(word.lower() for word in words))
+        known = await self._read_cache(lowered)
+
+        misses = [word_lower for word_lower in lowered if word_lower not in known]
+        if misses:
+            await self.start()
+            tasks = {word_lower: asyncio.ensure_future(self._fetch_remote(word_lower)) for word_lower in misses}
+            budget = self.budget if budget is None else budget
+            await asyncio.wait(tasks.values(), timeout=budget)
+
+            fetched = {}
+            for word_lower, task in tasks.items():
+                if not task.done():
+                    task.cancel()
+                elif task.exception() is not None:
+                    print(f"Error fetching definition for {word_lower}: {task.exception()}")
+                else:
+                    fetched[word_lower] = task.result()
+            await self._write_cache(fetched)
+            for word_lower, result in fetched.items():
+                known[word_lower] = result or empty_definition()
+
+        return {word: known.get(word.lower()) or empty_definition() for word in words}
+
+    async def _fetch_remote(self, word_lower: str) -> Optional[dict]:
+        """Parsed entry, None when the API has no entry; raises on transient errors"""
+        async with self._semaphore:
+            response = await self._client.get(f"{self.base_url}/{word_lower}")
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return parse_entries(response.json())
+
+    async def _read_cache(self, words) -> Dict[str, dict]:
+        try:
+            return await blocking_executor.run(self.cache.get_many, words)
+        except Exception as e:
+            print(f"Error reading definition cache: {e}")
+            return {}
+
+    async def _write_cache(self, results: Dict[str, Optional[dict]]):
+        if not results:
+            return
+        try:
+            await blocking_executor.run(self.cache.put_many, results)
+        except Exception as e:
+            print(f"Error writing definition cache: {e}")
+
+
+# Global instance
+external_definitions = ExternalDefinitionSource()
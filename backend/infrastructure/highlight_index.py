@@ -0,0 +1,112 @@
+"""
+Precomputed Difficulty Index for Highlighting
+
+A Core Library row's MRS and CEFR level never change while the library
+is loaded, so the "is this word hard enough to highlight" test is
+precomputed per row instead of being evaluated one word at a time:
+- Rows are kept sorted by MRS, and for every distinct MRS value (and every
+  CEFR level) a bitset over the dense row ids marks the rows at or above it;
+  a threshold maps to the first distinct value at or above it, so memory
+  follows the number of distinct values, not their range
+- A page's Core Library words become one bitset; a single AND with the
+  threshold bitset yields every passing row
+
+Bitsets are Python ints (arbitrary-width, bitwise ops run in C), so no
+array library is needed. Rows are scored the way HighlightApplicationService
+scores formatted entries: missing MRS counts as DEFAULT_MRS, missing level
+as C2.
+"""
+
+import bisect
+from array import array
+from typing import Callable, Dict, List, Optional
+
+from domain.models import Word
+
+# Score given to rows without an MRS (hardest)
+DEFAULT_MRS = 100
+DEFAULT_LEVEL = "C2"
+# Rank used when the requested CEFR level is not recognised (B1)
+DEFAULT_USER_RANK = 3
+# MRS scale of the Core Library; values outside it are reported at build time
+MRS_SCALE_MAX = 100
+
+
+def _bitset(rows, nbytes: int) -> int:
+    bits = bytearray(nbytes)
+    for row in rows:
+        bits[row >> 3] |= 1 << (row & 7)
+    return int.from_bytes(bits, "little")
+
+
+class DifficultyIndex:
+    """
+    Per-MRS-value and per-level row bitsets for one Core Library.
+    `library` is kept so callers can tell when the library was replaced.
+    """
+
+    def __init__(self, library, level_of: Callable[[int], Optional[str]]):
+        self.library = library
+        row_count = len(library)
+        self.nbytes = (row_count + 7) // 8
+
+        mrs = array("i", (
+            DEFAULT_MRS if value is None else value
+            for value in map(library.mrs_of, range(row_count))
+        ))
+        level_ranks = array("b", (
+            Word.CEFR_RANKS.get(level_of(row) or DEFAULT_LEVEL, 0)
+            for row in range(row_count)
+        ))
+
+        # Rows sorted by MRS; the suffix from a threshold's insertion point is
+        # exactly the rows at or above it
+        self.sorted_rows = array("i", sorted(range(row_count), key=mrs.__getitem__))
+        self.sorted_mrs = array("i", (mrs[row] for row in self.sorted_rows))
+        self.mrs_values = array("i", sorted(set(self.sorted_mrs)))
+        out_of_scale = [value for value in self.mrs_values if not 0 <= value <= MRS_SCALE_MAX]
+        if out_of_scale:
+            print(f"⚠ Core Library has MRS values outside 0-{MRS_SCALE_MAX}: {out_of_scale[:10]}"
+                  f"{' ...' if len(out_of_scale) > 10 else ''}")
+
+        # mrs_bits[i]: rows with mrs >= mrs_values[i]. Built from the top value
+        # down, adding each value's rows once.
+        self.mrs_bits: List[int] = []
+        bits = bytearray(self.nbytes)
+        end = row_count
+        for value in reversed(self.mrs_values):
+            start = bisect.bisect_left(self.sorted_mrs, value, 0, end)
+            for row in self.sorted_rows[start:end]:
+                bits[row >> 3] |= 1 << (row & 7)
+            end = start
+            self.mrs_bits.append(int.from_bytes(bits, "little"))
+        self.mrs_bits.reverse()
+
+        # level_bits[r]: rows whose level rank >= r, for r in 0..6
+        by_rank = sorted(range(row_count), key=level_ranks.__getitem__, reverse=True)
+        self.level_bits: List[int] = []
+        bits = bytearray(self.nbytes)
+        position = 0
+        for rank in range(max(Word.CEFR_RANKS.values()), -1, -1):
+            while position < row_count and level_ranks[by_rank[position]] >= rank:
+                row = by_rank[position]
+                bits[row >> 3] |= 1 << (row & 7)
+                position += 1
+            self.level_bits.append(int.from_bytes(bits, "little"))
+        self.level_bits.reverse()
+
+    def threshold_bits(self, difficulty_level: str, difficulty_mrs: Optional[int] = None) -> int:
+        """Bitset of rows that pass the user's MRS threshold (or CEFR level if no MRS)"""
+        if difficulty_mrs is not None:
+            position = bisect.bisect_left(self.mrs_values, difficulty_mrs)
+            return self.mrs_bits[position] if position < len(self.mrs_bits) else 0
+        user_rank = Word.CEFR_RANKS.get(difficulty_level, DEFAULT_USER_RANK)
+        return self.level_bits[user_rank]
+
+    def select(self, rows: Dict[str, int], difficulty_level: str, difficulty_mrs: Optional[int] = None) -> List[str]:
+        """Words (keys of word -> row) whose row passes the threshold"""
+        if not rows:
+            return []
+        page = _bitset(rows.values(), self.nbytes)
+        passing = (page & self.threshold_bits(difficulty_level, difficulty_mrs)).to_bytes(self.nbytes, "little")
+        return [word for word, row in rows.items() if passing[row >> 3] >> (row & 7) & 1]
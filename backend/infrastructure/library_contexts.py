@@ -0,0 +1,99 @@
+"""
+Library Context Rows
+
+Converts between captured contexts as clients send them and
+library_contexts rows (one row per sentence):
+- Current form: {"page_url", "page_title", "sentences": [...], "timestamp": ms}
+- Older forms: {"sentence": "..."} or a plain sentence string
+Keys other than these are kept in extra_json.
+
+Reading rows back groups consecutive sentences of one capture into the
+current form again.
+"""
+
+import hashlib
+import json
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+_CONTEXT_KEYS = {"page_url", "page_title", "sentences", "sentence", "timestamp"}
+
+
+def sentence_hash(sentence: str) -> str:
+    """Hash of a sentence with case and whitespace normalized (duplicate detection)"""
+    normalized = " ".join(sentence.split()).lower()
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _captured_at(timestamp, default: datetime) -> datetime:
+    try:
+        return datetime.fromtimestamp(float(timestamp) / 1000)
+    except (TypeError, ValueError, OverflowError, OSError):
+        return default
+
+
+def context_rows(entry_id: int, context, default_time: datetime) -> List[dict]:
+    """library_contexts rows for one captured context (empty if it holds nothing)"""
+    if isinstance(context, str):
+        context = {"sentences": [context]}
+    elif not isinstance(context, dict):
+        return []
+
+    sentences = context.get("sentences")
+    if isinstance(sentences, str):
+        sentences = [sentences]
+    elif not isinstance(sentences, list):
+        sentences = []
+    if isinstance(context.get("sentence"), str):
+        sentences = [context["sentence"]] + sentences
+    sentences = [s for s in sentences if isinstance(s, str) and s.strip()]
+
+    page_url = context.get("page_url")
+    extra = {key: value for key, value in context.items() if key not in _CONTEXT_KEYS}
+    base = {
+        "entry_id": entry_id,
+        "captured_at": _captured_at(context.get("timestamp"), default_time),
+        "page_url": page_url,
+        "page_title": context.get("page_title"),
+        "extra_json": json.dumps(extra, ensure_ascii=False) if extra else None,
+    }
+
+    if not sentences:
+        # Page-only capture: at most one per page
+        if not page_url:
+            return []
+        return [{**base, "sentence": "", "sentence_hash": sentence_hash(f"page:{page_url}")}]
+
+    return [{**base, "sentence": s, "sentence_hash": sentence_hash(s)} for s in sentences]
+
+
+def rows_to_contexts(rows: Iterable) -> list:
+    """Group rows (ordered by capture) back into context dicts"""
+    contexts = []
+    current_key: Optional[tuple] = None
+    for row in rows:
+        key = (row.captured_at, row.page_url, row.page_title, row.extra_json)
+        if key != current_key:
+            context = json.loads(row.extra_json) if row.extra_json else {}
+            context.update({
+                "page_url": row.page_url,
+                "page_title": row.page_title,
+                "sentences": [],
+                "timestamp": int(row.captured_at.timestamp() * 1000) if row.captured_at else None,
+            })
+            contexts.append(context)
+            current_key = key
+        if row.sentence:
+            contexts[-1]["sentences"].append(row.sentence)
+    return contexts
+
+
+def context_row_to_dict(row) -> dict:
+    """One sentence of a paginated context listing"""
+    return {
+        "id": row.id,
+        "sentence": row.sentence,
+        "page_url": row.page_url,
+        "page_title": row.page_title,
+        "captured_at": row.captured_at.isoformat() if row.captured_at else None,
+    }
@@ -30,30 +30,57 @@ class UserModel(Base):
     created_at = Column(DateTime, default=datetime.now, index=True)
     updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
 
-    # Store known_words as JSON
-    known_words_json = Column(Text, default="[]")
+    # Legacy known-word storage: a JSON list, moved into known_words on first
+    # access (see UserRepository); NULL once migrated and for new users
+    known_words_json = Column(Text, nullable=True)
 
     # Relationships
+    known_words = relationship("KnownWordModel", back_populates="user", cascade="all, delete-orphan")
     unknown_words = relationship("UnknownWordModel", back_populates="user", cascade="all, delete-orphan")
     vocabulary_entries = relationship("VocabularyEntryModel", back_populates="user", cascade="all, delete-orphan")
     library_entries = relationship("LibraryEntryModel", back_populates="user", cascade="all, delete-orphan")
     domain_management_policies = relationship("DomainManagementPolicy", back_populates="user", cascade="all, delete-orphan")
 
-    def get_known_words(self) -> set:
-        """Get known words as a set"""
-        try:
-            return set(json.loads(self.known_words_json) or [])
-        except:
-            return set()
-
-    def set_known_words(self, words: set):
-        """Set known words from a set"""
-        self.known_words_json = json.dumps(list(words))
+    def get_legacy_known_words(self) -> set:
+        """Get the not-yet-migrated JSON known words as a set"""
+        return parse_known_words_json(self.known_words_json)
 
     def __repr__(self):
         return f"<UserModel user_id={self.user_id}>"
 
 
+def parse_known_words_json(known_words_json: str) -> set:
+    """Lowercased words of a legacy known_words_json value"""
+    try:
+        words = json.loads(known_words_json or "[]")
+    except ValueError:
+        return set()
+    if not isinstance(words, list):
+        return set()
+    return {word.lower() for word in words if isinstance(word, str)}
+
+
+class KnownWordModel(Base):
+    """Known words table - words user marked as knowing"""
+    __tablename__ = "known_words"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(String(255), ForeignKey("users.user_id"), index=True)
+    word = Column(String(255), index=True)
+    marked_at = Column(DateTime, default=datetime.now)
+
+    # Add unique constraint on user_id + word
+    __table_args__ = (
+        Index("ix_user_word_known", "user_id", "word", unique=True),
+    )
+
+    # Relationship
+    user = relationship("UserModel", back_populates="known_words")
+
+    def __repr__(self):
+        return f"<KnownWordModel user_id={self.user_id} word={self.word}>"
+
+
 class UnknownWordModel(Base):
     """Unknown words table - words user marked as not knowing"""
     __tablename__ = "unknown_words"
@@ -100,6 +127,9 @@ class VocabularyEntryModel(Base):
     __table_args__ = (
         Index("ix_user_word_vocabulary", "user_id", "word", unique=True),
         Index("ix_user_next_review", "user_id", "next_review"),  # for finding due reviews
+        # for paginated listings (newest first, optionally by status)
+        Index("ix_user_added_vocabulary", "user_id", "added_at"),
+        Index("ix_user_status_added_vocabulary", "user_id", "status", "added_at"),
     )
 
     # Relationship
@@ -118,31 +148,90 @@ class LibraryEntryModel(Base):
     word = Column(String(255), index=True)
     status = Column(SQLEnum(VocabularyStatus), default=VocabularyStatus.LEARNING)
     added_at = Column(DateTime, default=datetime.now)
-    contexts_json = Column(Text, default="[]")  # Store contexts as JSON
+    # Legacy context storage: a JSON list, moved into library_contexts on
+    # first access (see UserRepository); NULL once migrated and for new entries
+    contexts_json = Column(Text, nullable=True)
 
     # Add unique constraint on user_id + word
     __table_args__ = (
         Index("ix_user_word_library", "user_id", "word", unique=True),
+        # for paginated listings (newest first, optionally by status)
+        Index("ix_user_added_library", "user_id", "added_at"),
+        Index("ix_user_status_added_library", "user_id", "status", "added_at"),
     )
 
-    # Relationship
+    # Relationships
     user = relationship("UserModel", back_populates="library_entries")
+    contexts = relationship("LibraryContextModel", back_populates="entry", cascade="all, delete-orphan")
 
-    def get_contexts(self) -> list:
-        """Get contexts as a list"""
+    def get_legacy_contexts(self) -> list:
+        """Get the not-yet-migrated JSON contexts as a list"""
         try:
-            return json.loads(self.contexts_json) or []
-        except:
+            contexts = json.loads(self.contexts_json or "[]")
+        except ValueError:
             return []
-
-    def set_contexts(self, contexts: list):
-        """Set contexts from a list"""
-        self.contexts_json = json.dumps(contexts)
+        return contexts if isinstance(contexts, list) else []
 
     def __repr__(self):
         return f"<LibraryEntryModel user_id={self.user_id} word={self.word} status={self.status}>"
 
 
+class LibraryContextModel(Base):
+    """
+    Library contexts table - one captured sentence of a library entry.
+    Rows are only appended; a sentence already captured for the entry
+    (same sentence_hash) is skipped.
+    """
+    __tablename__ = "library_contexts"
+
+    id = Column(Integer, primary_key=True, index=True)
+    entry_id = Column(Integer, ForeignKey("library_entries.id", ondelete="CASCADE"), nullable=False)
+    captured_at = Column(DateTime, default=datetime.now)
+    page_url = Column(Text, nullable=True)
+    page_title = Column(Text, nullable=True)
+    sentence = Column(Text, default="")
+    # Hash of the normalized sentence (of the page URL for sentence-less captures)
+    sentence_hash = Column(String(32), nullable=False)
+    # Any other keys of the captured context, as JSON
+    extra_json = Column(Text, nullable=True)
+
+    __table_args__ = (
+        Index("ix_library_context_entry_captured", "entry_id", "captured_at"),
+        Index("ix_library_context_entry_sentence", "entry_id", "sentence_hash", unique=True),
+    )
+
+    # Relationship
+    entry = relationship("LibraryEntryModel", back_populates="contexts")
+
+    def __repr__(self):
+        return f"<LibraryContextModel entry_id={self.entry_id} captured_at={self.captured_at}>"
+
+
+class UserChangeModel(Base):
+    """
+    User change log - one row per word added to or removed from one of a
+    user's lists, for incremental sync. The id is the change sequence:
+    it only grows (AUTOINCREMENT, never reused), so "changes since N" is
+    an index range scan.
+    """
+    __tablename__ = "user_changes"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(String(255), ForeignKey("users.user_id"), nullable=False)
+    collection = Column(String(32), nullable=False)  # known_words / unknown_words / vocabulary / library
+    word = Column(String(255), nullable=False)
+    op = Column(String(8), nullable=False)  # "add" / "remove"
+    changed_at = Column(DateTime, default=datetime.now)
+
+    __table_args__ = (
+        Index("ix_user_changes_user_seq", "user_id", "id"),
+        {"sqlite_autoincrement": True},
+    )
+
+    def __repr__(self):
+        return f"<UserChangeModel id={self.id} user_id={self.user_id} {self.op} {self.collection}:{self.word}>"
+
+
 class DomainManagementPolicy(Base):
     """
     域名管理策略表
@@ -185,3 +274,19 @@ class DomainManagementPolicy(Base):
 
     def __repr__(self):
         return f"<DomainManagementPolicy user={self.user_id} type={self.policy_type} domain={self.domain}>"
+
+
+class ExternalDefinitionModel(Base):
+    """Tier 3 cache - definitions fetched from the external dictionary API, shared by all workers"""
+    __tablename__ = "external_definitions"
+
+    word = Column(String(255), primary_key=True)
+    definition = Column(Text, default="")
+    example = Column(Text, default="")
+    # False when the API had no entry (negative result, shorter TTL)
+    found = Column(Boolean, default=True)
+    fetched_at = Column(DateTime, default=datetime.now, index=True)
+    expires_at = Column(DateTime, index=True)
+
+    def __repr__(self):
+        return f"<ExternalDefinitionModel word={self.word} found={self.found}>"
@@ -4,20 +4,32 @@ Repository Pattern Implementation
 Provides data access layer using SQLAlchemy ORM
 """
 
+from sqlalchemy import and_, func, insert, or_
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from typing import List, Optional
+from typing import Dict, List, Optional
+from collections import OrderedDict
 from datetime import datetime
+import hashlib
 import logging
+import os
+import threading
+import time
 
-from domain.models import User, VocabularyEntry, LibraryEntry
+from domain.models import HighlightProfile, User, VocabularyEntry, VocabularyStatus, LibraryEntry
+from infrastructure.library_contexts import context_row_to_dict, context_rows, rows_to_contexts
 from infrastructure.models import (
     UserModel,
+    KnownWordModel,
     UnknownWordModel,
     VocabularyEntryModel,
     LibraryEntryModel,
+    LibraryContextModel,
+    UserChangeModel,
     DomainManagementPolicy,
     DomainPolicyType,
+    parse_known_words_json,
 )
 
 logger = logging.getLogger(__name__)
@@ -52,6 +64,171 @@ DEFAULT_BLACKLIST = [
 ]
 
 
+def insert_ignore(db: Session, model, rows: List[dict]):
+    """
+    Multi-row INSERT that skips rows hitting a unique index
+    (ON CONFLICT DO NOTHING on SQLite / PostgreSQL); returns the number of
+    rows inserted
+    """
+    if not rows:
+        return 0
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        statement = sqlite.insert(model).on_conflict_do_nothing()
+    elif dialect == "postgresql":
+        statement = postgresql.insert(model).on_conflict_do_nothing()
+    else:
+        statement = insert(model).prefix_with("IGNORE")
+    # Core execution on the session's connection: reports rowcount (rows actually inserted)
+    return db.connection().execute(statement, rows).rowcount
+
+
+# Change log operations (UserChangeModel.op)
+CHANGE_ADD = "add"
+CHANGE_REMOVE = "remove"
+
+# Change log collection name of each word-list table
+CHANGE_COLLECTIONS = {
+    KnownWordModel: "known_words",
+    UnknownWordModel: "unknown_words",
+    VocabularyEntryModel: "vocabulary",
+    LibraryEntryModel: "library",
+}
+
+
+def record_changes(db: Session, user_id: str, changes: List[tuple]):
+    """
+    Append (collection, word, op) entries to the user's change log, in the
+    caller's transaction. Every write to a user's word lists records one
+    entry per word it added or removed.
+    """
+    if not changes:
+        return
+    now = datetime.now()
+    db.execute(insert(UserChangeModel), [
+        {"user_id": user_id, "collection": collection, "word": word, "op": op, "changed_at": now}
+        for collection, word, op in changes
+    ])
+
+
+# Max bound parameters per IN (...) list (SQLite's historical limit is 999)
+IN_CLAUSE_CHUNK = 500
+
+
+def _chunks(items: list, size: int = IN_CLAUSE_CHUNK):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _word_changes(word: str, added: int, removed: Dict[str, int], collection: str) -> List[tuple]:
+    """Change log entries of a single-word command, from its row counts"""
+    changes = [(collection, word, CHANGE_ADD)] if added else []
+    changes += [(name, word, CHANGE_REMOVE) for name, count in removed.items() if count]
+    return changes
+
+
+def _encode_cursor(value, row_id: int) -> str:
+    """Keyset pagination cursor: the sort value (empty for NULL) and id of the last row of a page"""
+    if value is None:
+        value = ""
+    elif isinstance(value, datetime):
+        value = value.isoformat()
+    return f"{value}|{row_id}"
+
+
+def _decode_cursor(cursor: str, parse=str):
+    value, _, row_id = cursor.rpartition("|")
+    try:
+        return (parse(value) if value else None), int(row_id)
+    except ValueError:
+        raise ValueError(f"Invalid cursor: {cursor}")
+
+
+def _keyset_order(column, id_column, descending: bool) -> tuple:
+    """(column, id) order for keyset pages; NULLs come last descending and first ascending"""
+    if descending:
+        return column.desc().nulls_last(), id_column.desc()
+    return column.asc().nulls_first(), id_column.asc()
+
+
+def _after_cursor(query, column, id_column, cursor: str, parse, descending: bool):
+    """Rows after the cursor in _keyset_order"""
+    value, row_id = _decode_cursor(cursor, parse)
+    if value is None:
+        if descending:
+            return query.filter(column.is_(None), id_column < row_id)
+        return query.filter(or_(column.isnot(None), and_(column.is_(None), id_column > row_id)))
+    if descending:
+        return query.filter(or_(column < value, and_(column == value, id_column < row_id), column.is_(None)))
+    return query.filter(or_(column > value, and_(column == value, id_column > row_id)))
+
+
+# Max number of users whose highlight profile is kept in memory
+HIGHLIGHT_PROFILE_CACHE_SIZE = int(os.getenv("HIGHLIGHT_PROFILE_CACHE_SIZE", "10000"))
+# Seconds a cached profile is kept; only bounds staleness after writes that
+# bypass the change log (writes by other workers are caught by the change seq)
+HIGHLIGHT_PROFILE_TTL = float(os.getenv("HIGHLIGHT_PROFILE_TTL", "30"))
+
+
+def profile_version(known_words, unknown_words) -> str:
+    """Content hash of the two word sets (identical across workers and restarts)"""
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update("\n".join(sorted(known_words)).encode("utf-8"))
+    digest.update(b"\x00")
+    digest.update("\n".join(sorted(unknown_words)).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class HighlightProfileCache:
+    """
+    Thread-safe, size-bounded LRU of HighlightProfile by user_id.
+
+    Each entry keeps the user's change seq (latest user_changes id) it was
+    loaded at; get() only returns it while the caller's current seq is the
+    same, so writes made by other workers are seen on their next request.
+    Entries also expire after `ttl` seconds and are dropped on every local write.
+    """
+
+    def __init__(self, max_size: int = HIGHLIGHT_PROFILE_CACHE_SIZE, ttl: float = HIGHLIGHT_PROFILE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: str, seq: int) -> Optional[HighlightProfile]:
+        with self._lock:
+            entry = self._data.get(user_id)
+            if entry is None:
+                return None
+            profile, loaded_seq, loaded_at = entry
+            if loaded_seq != seq or time.monotonic() - loaded_at > self.ttl:
+                del self._data[user_id]
+                return None
+            self._data.move_to_end(user_id)
+            return profile
+
+    def put(self, profile: HighlightProfile, seq: int):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._data[profile.user_id] = (profile, seq, time.monotonic())
+            self._data.move_to_end(profile.user_id)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def invalidate(self, user_id: str):
+        with self._lock:
+            self._data.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+# Global instance
+highlight_profile_cache = HighlightProfileCache()
+
+
 class UserRepository:
     """
     User repository - handles all user data persistence
@@ -77,22 +254,64 @@ class UserRepository:
 
         # Create new user if doesn't exist
         if not user_model:
-            user_model = UserModel(user_id=user_id)
-            self.db.add(user_model)
-            self.db.commit()
-            self.db.refresh(user_model)
-
-            # Import default blacklist for new user
-            self._import_default_blacklist(user_id)
-            logger.info(f"✅ Created new user {user_id} with default blacklist")
+            self._create_user(user_id)
+            user_model = self.db.query(UserModel).filter(
+                UserModel.user_id == user_id
+            ).first()
 
         # Convert to domain model
         return self._model_to_domain(user_model)
 
+    def get_highlight_profile(self, user_id: str) -> HighlightProfile:
+        """
+        Load only what highlighting needs (known / unknown sets), served
+        from highlight_profile_cache while the user's change seq is unchanged
+        (one indexed lookup instead of reloading both word sets)
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            HighlightProfile (creates the user if it doesn't exist)
+        """
+        # Read before the word sets: a write landing in between only costs a reload
+        seq = self.get_change_seq(user_id)
+        profile = highlight_profile_cache.get(user_id, seq)
+        if profile is not None:
+            return profile
+
+        if not self._prepare_known_words(user_id):
+            self._create_user(user_id)
+
+        known_words = frozenset(
+            word for (word,) in self.db.query(KnownWordModel.word).filter(
+                KnownWordModel.user_id == user_id
+            )
+        )
+
+        unknown_words = frozenset(
+            word.lower() for (word,) in self.db.query(UnknownWordModel.word).filter(
+                UnknownWordModel.user_id == user_id
+            )
+        )
+
+        profile = HighlightProfile(
+            user_id,
+            known_words,
+            unknown_words,
+            profile_version(known_words, unknown_words)
+        )
+        highlight_profile_cache.put(profile, seq)
+        return profile
+
     def save_user(self, user: User):
         """
         Save user domain model to database
 
+        Only the entries the aggregate recorded as changed (User.dirty_words)
+        are written: each dirty word's row is inserted, updated or deleted
+        to match the aggregate, and untouched rows are never read.
+
         Args:
             user: User domain model
         """
@@ -103,83 +322,57 @@ class UserRepository:
         if not user_model:
             user_model = UserModel(user_id=user.user_id)
             self.db.add(user_model)
-
-        # Update known words
-        user_model.set_known_words(user.known_words)
-
-        # Update unknown words
-        current_unknown = self.db.query(UnknownWordModel).filter(
-            UnknownWordModel.user_id == user.user_id
-        ).all()
-        current_unknown_set = {w.word.lower() for w in current_unknown}
-        desired_unknown_set = {w.lower() for w in user.unknown_words}
-
-        # Remove words no longer in unknown_words
-        for word_model in current_unknown:
-            if word_model.word.lower() not in desired_unknown_set:
-                self.db.delete(word_model)
-
-        # Add new unknown words
-        for word in desired_unknown_set:
-            if word not in current_unknown_set:
-                unknown_word = UnknownWordModel(user_id=user.user_id, word=word)
-                self.db.add(unknown_word)
-
-        # Update vocabulary entries
-        current_vocab = self.db.query(VocabularyEntryModel).filter(
-            VocabularyEntryModel.user_id == user.user_id
-        ).all()
-        current_vocab_set = {v.word.lower() for v in current_vocab}
-        desired_vocab_set = set(user.vocabulary.keys())
-
-        # Remove words no longer in vocabulary
-        for vocab_model in current_vocab:
-            if vocab_model.word.lower() not in desired_vocab_set:
-                self.db.delete(vocab_model)
-
-        # Update or add vocabulary entries
-        for word, entry in user.vocabulary.items():
-            vocab_model = next(
-                (v for v in current_vocab if v.word.lower() == word.lower()),
-                None
-            )
-            if vocab_model:
+            self.db.flush()
+        elif user_model.known_words_json is not None:
+            self._migrate_known_words(user.user_id)
+
+        # Known / unknown words: plain membership rows
+        changes = []
+        changes += self._sync_word_rows(KnownWordModel, user.user_id, user.dirty_words("known_words"), user.known_words)
+        changes += self._sync_word_rows(UnknownWordModel, user.user_id, user.dirty_words("unknown_words"), user.unknown_words)
+
+        # Vocabulary entries
+        dirty = user.dirty_words("vocabulary")
+        current_vocab = self._rows_by_word(VocabularyEntryModel, user.user_id, dirty)
+        for word in dirty:
+            entry = user.vocabulary.get(word)
+            vocab_model = current_vocab.get(word)
+            if entry is None:
+                if vocab_model:
+                    self.db.delete(vocab_model)
+                    changes.append(("vocabulary", word, CHANGE_REMOVE))
+            elif vocab_model:
                 # Update existing
                 vocab_model.status = entry.status
                 vocab_model.attempt_count = entry.attempt_count
                 vocab_model.last_reviewed = entry.last_reviewed
             else:
                 # Create new
-                vocab_model = VocabularyEntryModel(
+                self.db.add(VocabularyEntryModel(
                     user_id=user.user_id,
                     word=word,
                     status=entry.status,
                     added_at=entry.added_at
-                )
-                self.db.add(vocab_model)
-
-        # Update library entries
-        current_library = self.db.query(LibraryEntryModel).filter(
-            LibraryEntryModel.user_id == user.user_id
-        ).all()
-        current_library_set = {l.word.lower() for l in current_library}
-        desired_library_set = set(user.library.keys())
-
-        # Remove words no longer in library
-        for library_model in current_library:
-            if library_model.word.lower() not in desired_library_set:
-                self.db.delete(library_model)
-
-        # Update or add library entries
-        for word, entry in user.library.items():
-            library_model = next(
-                (l for l in current_library if l.word.lower() == word.lower()),
-                None
-            )
-            if library_model:
+                ))
+                changes.append(("vocabulary", word, CHANGE_ADD))
+
+        # Library entries (contexts are append-only: only new ones are inserted)
+        dirty = user.dirty_words("library")
+        current_library = self._rows_by_word(LibraryEntryModel, user.user_id, dirty)
+        self._migrate_contexts([m for m in current_library.values() if m.contexts_json is not None])
+        removed_library = []
+        appended = []
+        for word in dirty:
+            entry = user.library.get(word)
+            library_model = current_library.get(word)
+            if entry is None:
+                if library_model:
+                    removed_library.append(word)
+                    changes.append(("library", word, CHANGE_REMOVE))
+            elif library_model:
                 # Update existing
                 library_model.status = entry.status
-                library_model.set_contexts(entry.contexts)
+                appended.append((library_model, entry, entry.new_contexts))
             else:
                 # Create new
                 library_model = LibraryEntryModel(
@@ -188,10 +381,58 @@ class UserRepository:
                     status=entry.status,
                     added_at=entry.added_at
                 )
-                library_model.set_contexts(entry.contexts)
                 self.db.add(library_model)
+                appended.append((library_model, entry, entry.contexts))
+                changes.append(("library", word, CHANGE_ADD))
+        self._delete_library_rows(user.user_id, removed_library)
+        self.db.flush()
+        now = datetime.now()
+        self._append_contexts([
+            row
+            for library_model, entry, contexts in appended
+            for context in contexts
+            for row in context_rows(library_model.id, context, now)
+        ])
+        record_changes(self.db, user.user_id, changes)
 
         self.db.commit()
+        for _library_model, entry, _contexts in appended:
+            entry.new_contexts = []
+        user.clear_changes()
+        highlight_profile_cache.invalidate(user.user_id)
+
+    def _sync_word_rows(self, model, user_id: str, dirty: set, desired: set) -> List[tuple]:
+        """
+        Make the (user_id, word) rows of `model` match `desired` for the dirty words
+
+        Returns:
+            Change log entries for the rows actually inserted / deleted
+        """
+        if not dirty:
+            return []
+        dirty = sorted(dirty)
+        existing = set(self._existing_words(model, user_id, dirty))
+        removed = [word for word in dirty if word not in desired and word in existing]
+        added = [word for word in dirty if word in desired and word not in existing]
+
+        self._delete_word_rows(model, user_id, removed)
+        now = datetime.now()
+        insert_ignore(self.db, model, [{"user_id": user_id, "word": word, "marked_at": now} for word in added])
+
+        collection = CHANGE_COLLECTIONS[model]
+        return [(collection, word, CHANGE_ADD) for word in added] + \
+            [(collection, word, CHANGE_REMOVE) for word in removed]
+
+    def _rows_by_word(self, model, user_id: str, words: set) -> dict:
+        """Existing rows of `model` for the given lowercased words, keyed by word"""
+        rows = {}
+        for chunk in _chunks(list(words)):
+            for row in self.db.query(model).filter(
+                model.user_id == user_id,
+                model.word.in_(chunk)
+            ):
+                rows[row.word.lower()] = row
+        return rows
 
     def add_unknown_word(self, user_id: str, word: str):
         """
@@ -205,7 +446,10 @@ class UserRepository:
         try:
             unknown_word = UnknownWordModel(user_id=user_id, word=word)
             self.db.add(unknown_word)
+            self.db.flush()
+            record_changes(self.db, user_id, [("unknown_words", word, CHANGE_ADD)])
             self.db.commit()
+            highlight_profile_cache.invalidate(user_id)
         except IntegrityError:
             # Word already exists in unknown_words
             self.db.rollback()
@@ -218,11 +462,10 @@ class UserRepository:
             user_id: User ID
             word: Word to remove
         """
-        self.db.query(UnknownWordModel).filter(
-            UnknownWordModel.user_id == user_id,
-            UnknownWordModel.word == word.lower()
-        ).delete()
+        if self._delete_word_row(UnknownWordModel, user_id, word.lower()):
+            record_changes(self.db, user_id, [("unknown_words", word.lower(), CHANGE_REMOVE)])
         self.db.commit()
+        highlight_profile_cache.invalidate(user_id)
 
     def get_unknown_words(self, user_id: str) -> set:
         """
@@ -241,39 +484,519 @@ class UserRepository:
 
     def add_known_word(self, user_id: str, word: str):
         """
-        Add a word to known_words (stored in JSON)
+        Add a word to known_words (a single-row insert)
 
         Args:
             user_id: User ID
             word: Word to add
         """
-        user_model = self.db.query(UserModel).filter(
-            UserModel.user_id == user_id
-        ).first()
-
-        if user_model:
-            known_words = user_model.get_known_words()
-            known_words.add(word.lower())
-            user_model.set_known_words(known_words)
+        if self._prepare_known_words(user_id):
+            if insert_ignore(self.db, KnownWordModel, [
+                {"user_id": user_id, "word": word.lower(), "marked_at": datetime.now()}
+            ]):
+                record_changes(self.db, user_id, [("known_words", word.lower(), CHANGE_ADD)])
             self.db.commit()
+            highlight_profile_cache.invalidate(user_id)
 
     def remove_known_word(self, user_id: str, word: str):
         """
-        Remove a word from known_words
+        Remove a word from known_words (a single-row delete)
 
         Args:
             user_id: User ID
             word: Word to remove
         """
-        user_model = self.db.query(UserModel).filter(
-            UserModel.user_id == user_id
+        if self._prepare_known_words(user_id):
+            if self._delete_word_row(KnownWordModel, user_id, word.lower()):
+                record_changes(self.db, user_id, [("known_words", word.lower(), CHANGE_REMOVE)])
+            self.db.commit()
+            highlight_profile_cache.invalidate(user_id)
+
+    # ========== Single-word commands ==========
+    # Each one touches only the rows of one word, in one transaction, and
+    # applies the same cross-list rules as the matching User method.
+    # Rows actually added / removed are recorded in the change log.
+
+    def mark_known_word(self, user_id: str, word: str):
+        """Known, and no longer unknown (User.add_known_word)"""
+        word = word.lower()
+        self._ensure_user(user_id)
+        added = insert_ignore(self.db, KnownWordModel, [
+            {"user_id": user_id, "word": word, "marked_at": datetime.now()}
+        ])
+        removed = self._delete_word_row(UnknownWordModel, user_id, word)
+        record_changes(self.db, user_id, _word_changes(word, added, {"unknown_words": removed}, "known_words"))
+        self.db.commit()
+        highlight_profile_cache.invalidate(user_id)
+
+    def mark_unknown_word(self, user_id: str, word: str):
+        """Unknown, and no longer known or in vocabulary (User.add_unknown_word)"""
+        word = word.lower()
+        self._ensure_user(user_id)
+        added = insert_ignore(self.db, UnknownWordModel, [
+            {"user_id": user_id, "word": word, "marked_at": datetime.now()}
+        ])
+        removed = {
+            "known_words": self._delete_word_row(KnownWordModel, user_id, word),
+            "vocabulary": self._delete_word_row(VocabularyEntryModel, user_id, word),
+        }
+        record_changes(self.db, user_id, _word_changes(word, added, removed, "unknown_words"))
+        self.db.commit()
+        highlight_profile_cache.invalidate(user_id)
+
+    def add_vocabulary_word(self, user_id: str, word: str):
+        """In vocabulary (kept as is if already there), no longer unknown (User.add_to_vocabulary)"""
+        word = word.lower()
+        self._ensure_user(user_id)
+        added = insert_ignore(self.db, VocabularyEntryModel, [
+            {"user_id": user_id, "word": word, "status": VocabularyStatus.LEARNING, "added_at": datetime.now()}
+        ])
+        removed = self._delete_word_row(UnknownWordModel, user_id, word)
+        record_changes(self.db, user_id, _word_changes(word, added, {"unknown_words": removed}, "vocabulary"))
+        self.db.commit()
+        highlight_profile_cache.invalidate(user_id)
+
+    def remove_vocabulary_word(self, user_id: str, word: str):
+        """User.remove_from_vocabulary"""
+        word = word.lower()
+        self._ensure_user(user_id)
+        if self._delete_word_row(VocabularyEntryModel, user_id, word):
+            record_changes(self.db, user_id, [("vocabulary", word, CHANGE_REMOVE)])
+        self.db.commit()
+
+    def remove_library_word(self, user_id: str, word: str):
+        """User.remove_from_library"""
+        word = word.lower()
+        self._ensure_user(user_id)
+        if self._delete_library_rows(user_id, [word]):
+            record_changes(self.db, user_id, [("library", word, CHANGE_REMOVE)])
+        self.db.commit()
+
+    def add_library_words(self, user_id: str, word_contexts: Dict[str, list]) -> int:
+        """
+        Add words to the library and append their contexts (User.add_to_library).
+        Only new entries and new sentences are inserted; a sentence already
+        captured for the entry is skipped.
+
+        Args:
+            user_id: User ID
+            word_contexts: word -> contexts captured for it
+
+        Returns:
+            Number of entries created
+        """
+        word_contexts = {word.lower(): contexts for word, contexts in word_contexts.items()}
+        self._ensure_user(user_id)
+
+        words = list(word_contexts)
+        existing = self._rows_by_word(LibraryEntryModel, user_id, set(words))
+        self._migrate_contexts([m for m in existing.values() if m.contexts_json is not None])
+        insert_ignore(self.db, LibraryEntryModel, [
+            {"user_id": user_id, "word": word, "status": VocabularyStatus.LEARNING, "added_at": datetime.now()}
+            for word in words if word not in existing
+        ])
+        entry_ids = {
+            word: entry_id for word, entry_id in self.db.query(LibraryEntryModel.word, LibraryEntryModel.id).filter(
+                LibraryEntryModel.user_id == user_id,
+                LibraryEntryModel.word.in_(words)
+            )
+        } if words else {}
+
+        now = datetime.now()
+        self._append_contexts([
+            row
+            for word, contexts in word_contexts.items()
+            for context in contexts or []
+            for row in context_rows(entry_ids[word], context, now)
+        ])
+        record_changes(self.db, user_id, [("library", word, CHANGE_ADD) for word in words if word not in existing])
+        self.db.commit()
+        return len(words) - len(existing)
+
+    def get_library_contexts(self, user_id: str, word: str, limit: int = 20, cursor: Optional[str] = None) -> dict:
+        """
+        One page of a library entry's captured sentences, newest first
+
+        Args:
+            user_id: User ID
+            word: Library word
+            limit: Page size
+            cursor: next_cursor of the previous page
+
+        Returns:
+            {"contexts": [...], "next_cursor": str or None}, or None if the word isn't in the library
+        """
+        entry = self.db.query(LibraryEntryModel).filter(
+            LibraryEntryModel.user_id == user_id,
+            LibraryEntryModel.word == word.lower()
         ).first()
+        if entry is None:
+            return None
+        if entry.contexts_json is not None:
+            self._migrate_contexts([entry])
+            self.db.commit()
+
+        query = self.db.query(LibraryContextModel).filter(LibraryContextModel.entry_id == entry.id)
+        if cursor:
+            query = _after_cursor(
+                query, LibraryContextModel.captured_at, LibraryContextModel.id,
+                cursor, datetime.fromisoformat, descending=True
+            )
+        rows = query.order_by(
+            *_keyset_order(LibraryContextModel.captured_at, LibraryContextModel.id, descending=True)
+        ).limit(limit + 1).all()
+
+        page = rows[:limit]
+        return {
+            "contexts": [context_row_to_dict(row) for row in page],
+            "next_cursor": _encode_cursor(page[-1].captured_at, page[-1].id) if len(rows) > limit else None
+        }
+
+    # ========== Change log (incremental sync) ==========
+
+    def get_change_seq(self, user_id: str) -> int:
+        """Latest change sequence of the user (0 if nothing was ever changed)"""
+        return self.db.query(func.max(UserChangeModel.id)).filter(
+            UserChangeModel.user_id == user_id
+        ).scalar() or 0
+
+    def get_changes(self, user_id: str, since: int, limit: int = 1000) -> dict:
+        """
+        Adds and removes after change sequence `since`, collapsed per word
+        (the last change of a word wins)
+
+        Args:
+            user_id: User ID
+            since: seq of the client's copy (0: from the beginning of the log)
+            limit: Max change log entries read; has_more tells to ask again
+
+        Returns:
+            {"seq": int, "has_more": bool, "reset": bool,
+             "changes": {collection: {"added": [...], "removed": [...]}}}
+            reset is set when `since` is ahead of the log (e.g. a copy of
+            another database); the client must then reload the full lists.
+        """
+        rows = self.db.query(
+            UserChangeModel.id, UserChangeModel.collection, UserChangeModel.word, UserChangeModel.op
+        ).filter(
+            UserChangeModel.user_id == user_id,
+            UserChangeModel.id > since
+        ).order_by(UserChangeModel.id).limit(limit + 1).all()
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        latest = {}
+        for _seq, collection, word, op in rows:
+            latest.pop((collection, word), None)
+            latest[(collection, word)] = op
+
+        changes = {collection: {"added": [], "removed": []} for collection in CHANGE_COLLECTIONS.values()}
+        for (collection, word), op in latest.items():
+            changes[collection]["added" if op == CHANGE_ADD else "removed"].append(word)
+
+        if rows:
+            seq = rows[-1][0]
+            reset = False
+        else:
+            seq = self.get_change_seq(user_id)
+            reset = since > seq
+        return {"seq": seq, "has_more": has_more, "reset": reset, "changes": changes}
+
+    # ========== Listing (paginated, indexed queries) ==========
+
+    # Sort fields the listings accept, each backed by a (user_id, field) index
+    # ("id": insertion order, the order of the unpaginated listings)
+    LIST_SORT_FIELDS = ("added_at", "word", "id")
+    _CURSOR_PARSERS = {"added_at": datetime.fromisoformat, "id": int}
+
+    def list_library(
+        self,
+        user_id: str,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        sort: str = "added_at",
+        descending: bool = True,
+        status: Optional[VocabularyStatus] = None,
+        added_after: Optional[datetime] = None,
+        added_before: Optional[datetime] = None,
+        include_contexts: bool = False
+    ) -> dict:
+        """
+        One page of the user's library without loading the User aggregate
+
+        Args:
+            limit: Page size (None: every matching entry)
+            cursor: next_cursor of the previous page (same sort)
+            include_contexts: Return each entry's contexts; otherwise only their count
 
-        if user_model:
-            known_words = user_model.get_known_words()
-            known_words.discard(word.lower())
-            user_model.set_known_words(known_words)
+        Returns:
+            {"items": [...], "next_cursor": str or None}
+        """
+        query = self._entry_query(LibraryEntryModel, user_id, status, added_after, added_before)
+        page, next_cursor = self._page(query, LibraryEntryModel, limit, cursor, sort, descending)
+
+        legacy = [entry for entry in page if entry.contexts_json is not None]
+        if legacy:
+            self._migrate_contexts(legacy)
+
+        contexts_by_entry = {}
+        context_counts = {}
+        entry_ids = [entry.id for entry in page]
+        for chunk in _chunks(entry_ids):
+            if include_contexts:
+                for row in self.db.query(LibraryContextModel).filter(
+                    LibraryContextModel.entry_id.in_(chunk)
+                ).order_by(LibraryContextModel.entry_id, LibraryContextModel.captured_at, LibraryContextModel.id):
+                    contexts_by_entry.setdefault(row.entry_id, []).append(row)
+            else:
+                context_counts.update(self.db.query(
+                    LibraryContextModel.entry_id, func.count(LibraryContextModel.id)
+                ).filter(LibraryContextModel.entry_id.in_(chunk)).group_by(LibraryContextModel.entry_id))
+
+        items = []
+        for entry in page:
+            item = {
+                "word": entry.word,
+                "added_at": entry.added_at.isoformat() if entry.added_at else None,
+                "status": entry.status.value,
+            }
+            if include_contexts:
+                item["contexts"] = rows_to_contexts(contexts_by_entry.get(entry.id, []))
+            else:
+                item["context_count"] = context_counts.get(entry.id, 0)
+            items.append(item)
+
+        if legacy:
             self.db.commit()
+        return {"items": items, "next_cursor": next_cursor}
+
+    def list_vocabulary(
+        self,
+        user_id: str,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        sort: str = "added_at",
+        descending: bool = True,
+        status: Optional[VocabularyStatus] = None,
+        added_after: Optional[datetime] = None,
+        added_before: Optional[datetime] = None
+    ) -> dict:
+        """
+        One page of the user's vocabulary without loading the User aggregate
+        (arguments as for list_library)
+        """
+        query = self._entry_query(VocabularyEntryModel, user_id, status, added_after, added_before)
+        page, next_cursor = self._page(query, VocabularyEntryModel, limit, cursor, sort, descending)
+        items = [
+            {
+                "word": entry.word,
+                "added_at": entry.added_at.isoformat() if entry.added_at else None,
+                "status": entry.status.value,
+                "attempt_count": entry.attempt_count,
+                "last_reviewed": entry.last_reviewed.isoformat() if entry.last_reviewed else None,
+                "next_review": entry.next_review.isoformat() if entry.next_review else None,
+            }
+            for entry in page
+        ]
+        return {"items": items, "next_cursor": next_cursor}
+
+    def count_library(self, user_id: str, status: Optional[VocabularyStatus] = None,
+                      added_after: Optional[datetime] = None, added_before: Optional[datetime] = None) -> dict:
+        """Number of library entries matching the filters, in total and per status"""
+        return self._count_entries(LibraryEntryModel, user_id, status, added_after, added_before)
+
+    def count_vocabulary(self, user_id: str, status: Optional[VocabularyStatus] = None,
+                         added_after: Optional[datetime] = None, added_before: Optional[datetime] = None) -> dict:
+        """Number of vocabulary entries matching the filters, in total and per status"""
+        return self._count_entries(VocabularyEntryModel, user_id, status, added_after, added_before)
+
+    def _entry_query(self, model, user_id: str, status, added_after, added_before, *columns):
+        query = self.db.query(*columns) if columns else self.db.query(model)
+        query = query.filter(model.user_id == user_id)
+        if status is not None:
+            query = query.filter(model.status == status)
+        if added_after is not None:
+            query = query.filter(model.added_at >= added_after)
+        if added_before is not None:
+            query = query.filter(model.added_at < added_before)
+        return query
+
+    def _page(self, query, model, limit: Optional[int], cursor: Optional[str], sort: str, descending: bool):
+        """Apply keyset pagination on (sort, id); returns (rows, next_cursor)"""
+        if sort not in self.LIST_SORT_FIELDS:
+            raise ValueError(f"Unsupported sort field: {sort}")
+        column = getattr(model, sort)
+        if cursor:
+            parse = self._CURSOR_PARSERS.get(sort, str)
+            query = _after_cursor(query, column, model.id, cursor, parse, descending)
+        query = query.order_by(*_keyset_order(column, model.id, descending))
+
+        if limit is None:
+            return query.all(), None
+        rows = query.limit(limit + 1).all()
+        page = rows[:limit]
+        next_cursor = _encode_cursor(getattr(page[-1], sort), page[-1].id) if len(rows) > limit else None
+        return page, next_cursor
+
+    def _count_entries(self, model, user_id: str, status, added_after, added_before) -> dict:
+        by_status = {
+            entry_status.value: count
+            for entry_status, count in self._entry_query(
+                model, user_id, status, added_after, added_before, model.status, func.count(model.id)
+            ).group_by(model.status)
+        }
+        return {"count": sum(by_status.values()), "by_status": by_status}
+
+    def migrate_legacy_contexts(self, batch_size: int = 500) -> int:
+        """
+        Move every remaining library_entries.contexts_json blob into the
+        library_contexts table, one transaction per batch of entries.
+        Safe to run while the server is serving requests.
+
+        Returns:
+            Number of entries migrated
+        """
+        migrated = 0
+        while True:
+            entries = self.db.query(LibraryEntryModel).filter(
+                LibraryEntryModel.contexts_json.isnot(None)
+            ).limit(batch_size).all()
+            if not entries:
+                return migrated
+            self._migrate_contexts(entries)
+            self.db.commit()
+            migrated += len(entries)
+
+    def _append_contexts(self, rows: List[dict]):
+        """Append context rows, skipping sentences already captured for their entry"""
+        insert_ignore(self.db, LibraryContextModel, rows)
+
+    def _migrate_contexts(self, entries: List[LibraryEntryModel]):
+        """
+        Move legacy contexts_json blobs of the given entries into
+        library_contexts, in the caller's transaction (claimed like known words)
+        """
+        rows = []
+        for entry in entries:
+            claimed = self.db.query(LibraryEntryModel).filter(
+                LibraryEntryModel.id == entry.id,
+                LibraryEntryModel.contexts_json.isnot(None)
+            ).update({LibraryEntryModel.contexts_json: None}, synchronize_session=False)
+            if claimed:
+                default_time = entry.added_at or datetime.now()
+                for context in entry.get_legacy_contexts():
+                    rows.extend(context_rows(entry.id, context, default_time))
+            entry.contexts_json = None
+        self._append_contexts(rows)
+
+    def _delete_library_rows(self, user_id: str, words: List[str]) -> int:
+        """Delete library entries and their contexts; returns the number of entries deleted"""
+        for chunk in _chunks(words):
+            entry_ids = self.db.query(LibraryEntryModel.id).filter(
+                LibraryEntryModel.user_id == user_id,
+                LibraryEntryModel.word.in_(chunk)
+            ).scalar_subquery()
+            self.db.query(LibraryContextModel).filter(
+                LibraryContextModel.entry_id.in_(entry_ids)
+            ).delete(synchronize_session=False)
+        return self._delete_word_rows(LibraryEntryModel, user_id, words)
+
+    # ========== Bulk commands ==========
+    # Set-based versions of the commands above: a batch costs a handful of
+    # statements (chunked IN lists / multi-row inserts) in one transaction.
+    # Each returns {word: {"status": "added" | "removed" | "unchanged",
+    # "removed_from": [list names]}} for the normalized (lowercased,
+    # de-duplicated) words.
+
+    def mark_known_words(self, user_id: str, words: List[str]) -> Dict[str, dict]:
+        """Bulk mark_known_word"""
+        return self._mark_words(user_id, words, KnownWordModel, {"unknown_words": UnknownWordModel})
+
+    def mark_unknown_words(self, user_id: str, words: List[str]) -> Dict[str, dict]:
+        """Bulk mark_unknown_word"""
+        return self._mark_words(user_id, words, UnknownWordModel, {
+            "known_words": KnownWordModel,
+            "vocabulary": VocabularyEntryModel,
+        })
+
+    def remove_known_words(self, user_id: str, words: List[str]) -> Dict[str, dict]:
+        """Bulk remove_known_word"""
+        return self._unmark_words(user_id, words, KnownWordModel)
+
+    def remove_unknown_words(self, user_id: str, words: List[str]) -> Dict[str, dict]:
+        """Bulk remove_unknown_word"""
+        return self._unmark_words(user_id, words, UnknownWordModel)
+
+    def _mark_words(self, user_id: str, words: List[str], model, clears: Dict[str, object]) -> Dict[str, dict]:
+        words = list(dict.fromkeys(word.lower() for word in words))
+        self._ensure_user(user_id)
+
+        existing = self._existing_words(model, user_id, words)
+        outcomes = {
+            word: {"status": "unchanged" if word in existing else "added", "removed_from": []}
+            for word in words
+        }
+        changes = [(CHANGE_COLLECTIONS[model], word, CHANGE_ADD) for word in words if word not in existing]
+        for name, other in clears.items():
+            present = self._existing_words(other, user_id, words)
+            for word in present:
+                outcomes[word]["removed_from"].append(name)
+                changes.append((name, word, CHANGE_REMOVE))
+            self._delete_word_rows(other, user_id, present)
+
+        now = datetime.now()
+        insert_ignore(self.db, model, [
+            {"user_id": user_id, "word": word, "marked_at": now}
+            for word in words if word not in existing
+        ])
+        record_changes(self.db, user_id, changes)
+        self.db.commit()
+        highlight_profile_cache.invalidate(user_id)
+        return outcomes
+
+    def _unmark_words(self, user_id: str, words: List[str], model) -> Dict[str, dict]:
+        words = list(dict.fromkeys(word.lower() for word in words))
+        self._ensure_user(user_id)
+
+        existing = self._existing_words(model, user_id, words)
+        self._delete_word_rows(model, user_id, existing)
+        record_changes(self.db, user_id, [(CHANGE_COLLECTIONS[model], word, CHANGE_REMOVE) for word in existing])
+        self.db.commit()
+        highlight_profile_cache.invalidate(user_id)
+        return {
+            word: {"status": "removed" if word in existing else "unchanged", "removed_from": []}
+            for word in words
+        }
+
+    def _existing_words(self, model, user_id: str, words: List[str]) -> List[str]:
+        """Those of `words` that have a row in `model`"""
+        found = []
+        for chunk in _chunks(words):
+            found.extend(word for (word,) in self.db.query(model.word).filter(
+                model.user_id == user_id,
+                model.word.in_(chunk)
+            ))
+        return found
+
+    def _delete_word_rows(self, model, user_id: str, words: List[str]) -> int:
+        deleted = 0
+        for chunk in _chunks(words):
+            deleted += self.db.query(model).filter(
+                model.user_id == user_id,
+                model.word.in_(chunk)
+            ).delete(synchronize_session=False)
+        return deleted
+
+    def _ensure_user(self, user_id: str):
+        """Create the user on first use (like get_user) and migrate legacy known words"""
+        if not self._prepare_known_words(user_id):
+            self._create_user(user_id)
+
+    def _delete_word_row(self, model, user_id: str, word: str) -> int:
+        return self.db.query(model).filter(
+            model.user_id == user_id,
+            model.word == word
+        ).delete(synchronize_session=False)
 
     def get_known_words(self, user_id: str) -> set:
         """
@@ -285,18 +1008,104 @@ class UserRepository:
         Returns:
             Set of known words
         """
-        user_model = self.db.query(UserModel).filter(
+        if not self._prepare_known_words(user_id):
+            return set()
+
+        return {
+            word for (word,) in self.db.query(KnownWordModel.word).filter(
+                KnownWordModel.user_id == user_id
+            )
+        }
+
+    def migrate_legacy_known_words(self, batch_size: int = 500) -> int:
+        """
+        Move every remaining known_words_json blob into the known_words
+        table, one transaction per batch of users. Safe to run while the
+        server is serving requests (users are also migrated on first access).
+
+        Returns:
+            Number of users migrated
+        """
+        migrated = 0
+        while True:
+            user_ids = [
+                user_id for (user_id,) in self.db.query(UserModel.user_id).filter(
+                    UserModel.known_words_json.isnot(None)
+                ).limit(batch_size)
+            ]
+            if not user_ids:
+                return migrated
+
+            for user_id in user_ids:
+                self._migrate_known_words(user_id)
+            self.db.commit()
+            for user_id in user_ids:
+                highlight_profile_cache.invalidate(user_id)
+            migrated += len(user_ids)
+
+    def _prepare_known_words(self, user_id: str) -> bool:
+        """
+        Make sure the user's known words live in the known_words table
+
+        Returns:
+            False if the user doesn't exist
+        """
+        row = self.db.query(UserModel.known_words_json).filter(
             UserModel.user_id == user_id
         ).first()
+        if row is None:
+            return False
+        if row.known_words_json is not None:
+            self._migrate_known_words(user_id)
+            self.db.commit()
+        return True
 
-        return user_model.get_known_words() if user_model else set()
+    def _migrate_known_words(self, user_id: str):
+        """
+        Move a legacy known_words_json blob into the known_words table,
+        in the caller's transaction. The blob is cleared first: only the
+        transaction that clears it copies the words, so a concurrent
+        migration cannot re-insert a word removed in the meantime.
+        """
+        known_words_json = self.db.query(UserModel.known_words_json).filter(
+            UserModel.user_id == user_id
+        ).scalar()
+        claimed = self.db.query(UserModel).filter(
+            UserModel.user_id == user_id,
+            UserModel.known_words_json.isnot(None)
+        ).update({UserModel.known_words_json: None}, synchronize_session=False)
+        if not claimed:
+            return
+
+        now = datetime.now()
+        insert_ignore(self.db, KnownWordModel, [
+            {"user_id": user_id, "word": word, "marked_at": now}
+            for word in parse_known_words_json(known_words_json)
+        ])
+
+    def _create_user(self, user_id: str):
+        """
+        Insert a new user row and its default blacklist in one transaction
+        (nothing happens if a concurrent request created the user first)
+        """
+        if insert_ignore(self.db, UserModel, [{"user_id": user_id, "created_at": datetime.now()}]):
+            self._import_default_blacklist(user_id)
+            logger.info(f"✅ Created new user {user_id} with default blacklist")
+        self.db.commit()
 
     def _model_to_domain(self, user_model: UserModel) -> User:
         """Convert ORM model to domain model"""
         user = User(user_id=user_model.user_id, created_at=user_model.created_at)
 
         # Load known words
-        user.known_words = user_model.get_known_words()
+        if user_model.known_words_json is not None:
+            self._migrate_known_words(user_model.user_id)
+            self.db.commit()
+        user.known_words = {
+            word for (word,) in self.db.query(KnownWordModel.word).filter(
+                KnownWordModel.user_id == user_model.user_id
+            )
+        }
 
         # Load unknown words
         unknown_word_models = self.db.query(UnknownWordModel).filter(
@@ -321,53 +1130,49 @@ class UserRepository:
             LibraryEntryModel.user_id == user_model.user_id
         ).all()
 
+        legacy = [m for m in library_models if m.contexts_json is not None]
+        if legacy:
+            self._migrate_contexts(legacy)
+            self.db.commit()
+
+        # All contexts of the user in one query, grouped per entry
+        context_rows_by_entry = {}
+        for row in self.db.query(LibraryContextModel).join(LibraryEntryModel).filter(
+            LibraryEntryModel.user_id == user_model.user_id
+        ).order_by(LibraryContextModel.entry_id, LibraryContextModel.captured_at, LibraryContextModel.id):
+            context_rows_by_entry.setdefault(row.entry_id, []).append(row)
+
         for library_model in library_models:
             entry = LibraryEntry(library_model.word, added_at=library_model.added_at)
             entry.status = library_model.status
-            entry.contexts = library_model.get_contexts()
+            entry.contexts = rows_to_contexts(context_rows_by_entry.get(library_model.id, []))
             user.library[library_model.word.lower()] = entry
 
+        user.clear_changes()
         return user
 
     def _import_default_blacklist(self, user_id: str):
         """
-        Import default blacklist items for new user
+        Import default blacklist items for new user, as one multi-row insert
+        in the caller's transaction (domains the user already has are skipped)
 
         Args:
             user_id: User ID
         """
-        try:
-            imported_count = 0
-            for item in DEFAULT_BLACKLIST:
-                try:
-                    # Check if domain already exists for this user
-                    existing = self.db.query(DomainManagementPolicy).filter(
-                        DomainManagementPolicy.user_id == user_id,
-                        DomainManagementPolicy.domain == item["domain"],
-                        DomainManagementPolicy.policy_type == DomainPolicyType.BLACKLIST
-                    ).first()
-
-                    if existing:
-                        continue  # Already exists, skip
-
-                    # Create new blacklist policy
-                    policy = DomainManagementPolicy(
-                        user_id=user_id,
-                        domain=item["domain"],
-                        policy_type=DomainPolicyType.BLACKLIST,
-                        description=item.get("description"),
-                        is_active=True
-                    )
-                    self.db.add(policy)
-                    imported_count += 1
-                except Exception as e:
-                    logger.error(f"❌ Failed to import blacklist item {item['domain']}: {e}")
-
-            self.db.commit()
-            logger.info(f"✅ Imported {imported_count} default blacklist items for user {user_id}")
-        except Exception as e:
-            logger.error(f"❌ Failed to import default blacklist: {e}")
-            self.db.rollback()
+        now = datetime.now()
+        imported_count = insert_ignore(self.db, DomainManagementPolicy, [
+            {
+                "user_id": user_id,
+                "domain": item["domain"],
+                "policy_type": DomainPolicyType.BLACKLIST,
+                "description": item.get("description"),
+                "is_active": True,
+                "added_at": now,
+                "updated_at": now,
+            }
+            for item in DEFAULT_BLACKLIST
+        ])
+        logger.info(f"✅ Imported {imported_count} default blacklist items for user {user_id}")
 
 
 class DomainManagementPolicyRepository:
@@ -716,6 +1521,8 @@ class VocabularyRepository:
             added_at=datetime.now()
         )
         self.db.add(model)
+        self.db.flush()
+        record_changes(self.db, user_id, [("vocabulary", model.word, CHANGE_ADD)])
         self.db.commit()
         self.db.refresh(model)
         return model
@@ -725,4 +1532,5 @@ class VocabularyRepository:
         entry = self.get_by_id(entry_id)
         if entry:
             self.db.delete(entry)
+            record_changes(self.db, entry.user_id, [("vocabulary", entry.word, CHANGE_REMOVE)])
             self.db.commit()
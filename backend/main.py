@@ -8,20 +8,25 @@ Layered architecture:
 - Presentation: API routes
 """
 
+import json
 import sys
 from typing import Optional
 
-import httpx
 from api.review import router as review_router
 from api.routes import router as user_router
 from application.services import HighlightApplicationService, UserApplicationService
-from fastapi import Depends, FastAPI, HTTPException
+from fastapi import Depends, FastAPI, HTTPException, Request
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, StreamingResponse
 
 # Import DDD layers
+from infrastructure.compression import BodyDecodingError, decode_body
 from infrastructure.database import get_db, init_db
+from infrastructure.executor import blocking_executor
+from infrastructure.highlight_cache import highlight_result_cache
 from infrastructure.repositories import UserRepository
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
 from sqlalchemy.orm import Session
 
 # Initialize FastAPI app
@@ -62,10 +67,10 @@ async def add_private_network_headers(request, call_next):
 
 # ... (imports)
 from infrastructure.dictionary import dictionary_service
+from infrastructure.external_dictionary import external_definitions
 
-# Global data caches
 # cefr_data and chinese_dict are now managed by dictionary_service
-definition_cache = {}
+# Tier 3 definitions (and their cache) are managed by external_definitions
 
 # ... (models)
 # Pydantic models for API
@@ -74,6 +79,15 @@ class WordBatch(BaseModel):
     words: list[str]
     difficulty_level: str = "B1"
     difficulty_mrs: Optional[int] = None # Optional granular difficulty (0-100)
+    fingerprint: Optional[str] = None # Fingerprint of the result the client already holds
+    compact: bool = False # Each unique word's details once, plus the sorted requested forms
+
+
+class TextBatch(BaseModel):
+    user_id: str
+    blocks: list[str] # Raw text, e.g. one block per text node
+    difficulty_level: str = "B1"
+    difficulty_mrs: Optional[int] = None
 
 
 class WordInfo(BaseModel):
@@ -86,49 +100,6 @@ class WordInfo(BaseModel):
 
 # Data loading functions removed (handled by DictionaryService)
 
-async def get_word_definition_external(word: str) -> dict:
-    """
-    Fetch word definition from Free Dictionary API (Fallback for words not in local dictionary)
-    """
-    word_lower = word.lower()
-
-    if word_lower in definition_cache:
-        return definition_cache[word_lower]
-
-    try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            response = await client.get(
-                f"https://api.dictionaryapi.dev/api/v2/entries/en/{word_lower}"
-            )
-            if response.status_code == 200:
-                data = response.json()
-                if data and len(data) > 0:
-                    entry = data[0]
-                    definition = ""
-                    if "meanings" in entry and len(entry["meanings"]) > 0:
-                        meanings = entry["meanings"][0]
-                        if "definitions" in meanings and len(meanings["definitions"]) > 0:
-                            definition = meanings["definitions"][0].get("definition", "")
-                            if len(definition) > 150:
-                                definition = definition[:150] + "..."
-
-                    example = ""
-                    if "meanings" in entry and len(entry["meanings"]) > 0:
-                        meanings = entry["meanings"][0]
-                        if "definitions" in meanings and len(meanings["definitions"]) > 0:
-                            example = meanings["definitions"][0].get("example", "")
-
-                    result = {"definition": definition, "example": example}
-                    definition_cache[word_lower] = result
-                    return result
-    except Exception as e:
-        print(f"Error fetching definition for {word}: {e}")
-
-    result = {"definition": "", "example": ""}
-    definition_cache[word_lower] = result
-    return result
-
-
 # Startup event
 @app.on_event("startup")
 async def startup_event():
@@ -136,9 +107,17 @@ async def startup_event():
     print("\n🚀 MixRead Backend Starting...")
     # dictionary_service is auto-initialized on import
     init_db()
+    await external_definitions.start()
     print("✓ Database initialized\n")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release the blocking-work thread pool and the external API client"""
+    blocking_executor.shutdown()
+    await external_definitions.aclose()
+
+
 # Health check
 @app.get("/health")
 async def health():
@@ -148,8 +127,11 @@ async def health():
         "version": "0.3.0",
         "dictionary": {
             "tier1_core_words": len(dictionary_service.cefr_data),
-            "tier2_full_db": "Active (SQLite)"
-        }
+            "tier2_full_db": "Active (SQLite)",
+            "lookup_cache": dictionary_service.cache_stats()
+        },
+        "highlight_cache": highlight_result_cache.stats(),
+        "blocking_pool": blocking_executor.stats()
     }
 
 # ... (options_handler)
@@ -158,8 +140,8 @@ async def health():
 @app.get("/word/{word}")
 async def get_word(word: str):
     """Get word information using Hybrid Dictionary Service"""
-    # 1. Lookup in Hybrid Dictionary
-    info = dictionary_service.lookup(word)
+    # 1. Lookup in Hybrid Dictionary (off the event loop)
+    info = await blocking_executor.run(dictionary_service.lookup, word)
     
     if info["found"]:
         return {
@@ -174,7 +156,7 @@ async def get_word(word: str):
         }
 
     # 2. Fallback to external API if really not found (Tier 3)
-    definition_data = await get_word_definition_external(word)
+    definition_data = await external_definitions.fetch(word)
     return {
         "word": word,
         "found": False,
@@ -190,18 +172,129 @@ async def highlight_words(request: WordBatch, db: Session = Depends(get_db)):
     """
     Get highlighted words based on user's difficulty level and word lists
     """
+    def highlight():
+        try:
+            service = HighlightApplicationService(
+                UserRepository(db),
+                dictionary_service
+            )
+            result = service.get_highlighted_words(
+                request.user_id,
+                request.words,
+                request.difficulty_level,
+                request.difficulty_mrs,
+                request.fingerprint,
+                request.compact
+            )
+            # The result is plain JSON data: render it here instead of letting
+            # FastAPI walk every word detail with jsonable_encoder on the event loop
+            return JSONResponse(result)
+        finally:
+            # Hand the connection back now rather than after the response is
+            # sent, so pool threads never wait on connections held by finished requests
+            db.close()
+
     try:
-        service = HighlightApplicationService(
-            UserRepository(db),
-            dictionary_service
-        )
-        result = service.get_highlighted_words(
-            request.user_id,
-            request.words,
-            request.difficulty_level,
-            request.difficulty_mrs
-        )
-        return result
+        # Session and dictionary work is synchronous: keep it off the event loop
+        return await blocking_executor.run(highlight)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def ndjson_line(message: dict) -> str:
+    """One NDJSON line; non-ASCII text (translations) is kept as UTF-8, not escaped"""
+    return json.dumps(message, ensure_ascii=False) + "\n"
+
+
+@app.post("/highlight-words/stream")
+async def highlight_words_stream(request: WordBatch, db: Session = Depends(get_db)):
+    """
+    Streaming variant of /highlight-words for very long documents.
+    Responds with NDJSON: a start line, one line per chunk of words as soon
+    as it is decided, then an end line (see stream_highlighted_words).
+    """
+    service = HighlightApplicationService(
+        UserRepository(db),
+        dictionary_service
+    )
+    messages = service.stream_highlighted_words(
+        request.user_id,
+        request.words,
+        request.difficulty_level,
+        request.difficulty_mrs
+    )
+
+    def start():
+        try:
+            return next(messages)
+        finally:
+            # The profile is loaded by now; the chunks only need the dictionary
+            db.close()
+
+    def next_line():
+        message = next(messages, None)
+        return None if message is None else ndjson_line(message)
+
+    try:
+        header = await blocking_executor.run(start)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    if not header["success"]:
+        return JSONResponse(header)
+
+    async def lines():
+        yield ndjson_line(header)
+        try:
+            # One pool task per chunk, so a long document never holds a
+            # worker for its whole length
+            while (line := await blocking_executor.run(next_line)) is not None:
+                yield line
+        except Exception as e:
+            yield ndjson_line({"type": "error", "success": False, "error": str(e)})
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@app.post("/highlight-text")
+async def highlight_text(request: Request, db: Session = Depends(get_db)):
+    """
+    Highlight raw text blocks: the server tokenizes them and returns, per
+    block, the [start, end] offsets of the words to highlight.
+    The JSON body (see TextBatch) may be sent with Content-Encoding: gzip or deflate.
+    """
+    body = await request.body()
+
+    def highlight():
+        try:
+            try:
+                batch = TextBatch.model_validate_json(
+                    decode_body(body, request.headers.get("content-encoding"))
+                )
+            except BodyDecodingError as e:
+                return JSONResponse({"detail": str(e)}, status_code=400)
+            except ValidationError as e:
+                return JSONResponse(
+                    {"detail": jsonable_encoder(e.errors(include_url=False, include_input=False))},
+                    status_code=422
+                )
+
+            service = HighlightApplicationService(
+                UserRepository(db),
+                dictionary_service
+            )
+            result = service.highlight_text(
+                batch.user_id,
+                batch.blocks,
+                batch.difficulty_level,
+                batch.difficulty_mrs
+            )
+            return JSONResponse(result)
+        finally:
+            db.close()
+
+    try:
+        # Decompression, tokenizing and dictionary work all stay off the event loop
+        return await blocking_executor.run(highlight)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -212,9 +305,14 @@ async def batch_word_info(request: WordBatch):
     Get detailed information for multiple words including definitions
     """
     results = []
+    word_infos = await blocking_executor.run(dictionary_service.lookup_many, request.words)
+
+    # Fallback for definitions: fetch all misses concurrently within the time budget
+    misses = [word for word in request.words if not word_infos[word]["found"]]
+    external = await external_definitions.fetch_many(misses) if misses else {}
 
     for word in request.words:
-        info = dictionary_service.lookup(word)
+        info = word_infos[word]
         if info["found"]:
              results.append({
                 "word": word,
@@ -224,8 +322,7 @@ async def batch_word_info(request: WordBatch):
                 "translation": info.get("translation")
             })
         else:
-            # Fallback for definitions
-            definition_data = await get_word_definition_external(word)
+            definition_data = external[word]
             results.append({
                 "word": word,
                 "cefr_level": None,
@@ -234,7 +331,7 @@ async def batch_word_info(request: WordBatch):
                 "example": definition_data.get("example")
             })
 
-    return {"words": results}
+    return JSONResponse({"words": results})
 
 # ... (routes)
 
@@ -256,6 +353,8 @@ async def root():
             "health": "/health",
             "word_info": "/word/{word}",
             "highlight": "POST /highlight-words",
+            "highlight_stream": "POST /highlight-words/stream",
+            "highlight_text": "POST /highlight-text",
             "users": "GET /users/{user_id}",
             "known_words": "GET /users/{user_id}/known-words",
             "unknown_words": "GET /users/{user_id}/unknown-words",
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Migrate known words from users.known_words_json into the known_words table
+
+Users are migrated lazily on first access as well; this sweeps the rest in
+batches and can run while the server is up.
+
+Usage:
+    python migrate_known_words.py [batch_size]
+"""
+import sys
+
+from infrastructure.database import SessionLocal, init_db
+from infrastructure.repositories import UserRepository
+
+
+def main():
+    batch_size = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    init_db()  # creates the known_words table if needed
+
+    db = SessionLocal()
+    try:
+        migrated = UserRepository(db).migrate_legacy_known_words(batch_size)
+        print(f"✅ Migrated known words of {migrated} users")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
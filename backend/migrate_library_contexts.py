@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Migrate library contexts from library_entries.contexts_json into the
+library_contexts table
+
+Entries are migrated lazily on first access as well; this sweeps the rest
+in batches and can run while the server is up.
+
+Usage:
+    python migrate_library_contexts.py [batch_size]
+"""
+import sys
+
+from infrastructure.database import SessionLocal, init_db
+from infrastructure.repositories import UserRepository
+
+
+def main():
+    batch_size = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    init_db()  # creates the library_contexts table if needed
+
+    db = SessionLocal()
+    try:
+        migrated = UserRepository(db).migrate_legacy_contexts(batch_size)
+        print(f"✅ Migrated contexts of {migrated} library entries")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
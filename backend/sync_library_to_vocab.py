@@ -10,6 +10,7 @@ sys.path.insert(0, '/Users/yinshucheng/code/creo/MixRead/backend')
 
 from infrastructure.database import SessionLocal
 from infrastructure.models import LibraryEntryModel, VocabularyEntryModel
+from infrastructure.repositories import CHANGE_ADD, record_changes
 from domain.models import VocabularyStatus
 from datetime import datetime
 
@@ -24,6 +25,7 @@ try:
     
     synced_count = 0
     skipped_count = 0
+    synced_words = []
     
     for lib_entry in library_entries:
         # Check if word already exists in vocabulary
@@ -52,10 +54,13 @@ try:
         )
         
         db.add(vocab_entry)
+        synced_words.append(lib_entry.word)
         synced_count += 1
         print(f"  ✅ Added '{lib_entry.word}' to vocabulary")
     
-    # Commit all changes
+    # Commit all changes (recorded in the change log for incremental sync)
+    db.flush()
+    record_changes(db, USER_ID, [("vocabulary", word, CHANGE_ADD) for word in synced_words])
     db.commit()
     
     print(f"\n🎉 Sync complete!")
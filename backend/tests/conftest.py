@@ -0,0 +1,63 @@
+"""
+Shared Test Fixtures
+测试共用的内存数据库（带 SQL 语句计数）、会话与 UserRepository
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from infrastructure.database import Base
+from infrastructure.repositories import UserRepository, highlight_profile_cache
+
+
+@pytest.fixture
+def engine():
+    """In-memory app database with a statement counter"""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    engine.statements = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def count(conn, cursor, statement, parameters, context, executemany):
+        engine.statements.append(statement)
+
+    highlight_profile_cache.clear()
+    yield engine
+    highlight_profile_cache.clear()
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def repo(db):
+    return UserRepository(db)
+
+
+@pytest.fixture
+def client(repo):
+    """TestClient for the app, with requests using the repo's session"""
+    from fastapi.testclient import TestClient
+
+    from infrastructure.database import get_db
+    from main import app
+
+    app.dependency_overrides[get_db] = lambda: repo.db
+    yield TestClient(app)
+    app.dependency_overrides.pop(get_db, None)
@@ -0,0 +1,86 @@
+"""
+BlockingExecutor Tests
+测试阻塞任务线程池（不阻塞事件循环、并发上限）
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from infrastructure.executor import BlockingExecutor
+
+
+@pytest.fixture
+def executor():
+    pool = BlockingExecutor(max_workers=2)
+    yield pool
+    pool.shutdown()
+
+
+class TestBlockingExecutor:
+    """测试 BlockingExecutor"""
+
+    def test_returns_result_and_raises(self, executor):
+        """返回函数结果，并把异常抛回调用方"""
+        async def scenario():
+            assert await executor.run(lambda a, b=0: a + b, 1, b=2) == 3
+            with pytest.raises(ValueError):
+                await executor.run(int, "not a number")
+
+        asyncio.run(scenario())
+
+    def test_runs_off_the_event_loop(self, executor):
+        """阻塞调用期间事件循环仍可处理其他任务"""
+        async def scenario():
+            loop_thread = threading.get_ident()
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0.01)
+
+            task = asyncio.create_task(ticker())
+            worker_thread = await executor.run(lambda: time.sleep(0.2) or threading.get_ident())
+            task.cancel()
+            return loop_thread, worker_thread, ticks
+
+        loop_thread, worker_thread, ticks = asyncio.run(scenario())
+        assert worker_thread != loop_thread
+        assert ticks >= 5
+
+    def test_concurrency_is_bounded(self, executor):
+        """同时运行的任务数不超过 max_workers"""
+        running = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def work():
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.05)
+            with lock:
+                running -= 1
+
+        async def scenario():
+            await asyncio.gather(*(executor.run(work) for _ in range(6)))
+
+        asyncio.run(scenario())
+        assert peak == 2
+        assert executor.stats() == {"max_workers": 2, "active": 0, "queued": 0}
+
+    def test_restarts_after_shutdown(self, executor):
+        """shutdown 后再次使用会重新创建线程池"""
+        asyncio.run(executor.run(lambda: None))
+        executor.shutdown()
+        assert asyncio.run(executor.run(lambda: 42)) == 42
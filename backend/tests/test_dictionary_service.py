@@ -0,0 +1,469 @@
+"""
+DictionaryService Tests
+测试混合词典查询（Tier 1 内存 + Tier 2 SQLite）
+"""
+
+import random
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.pool import StaticPool
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import infrastructure.dictionary as dictionary_module
+import infrastructure.dictionary_store as dictionary_store_module
+from infrastructure.core_library import (
+    CoreLibrary,
+    MappedCoreLibrary,
+    read_lemma_index,
+    resolve_surface_forms,
+    write_core_artifact,
+    write_lemma_index,
+)
+from infrastructure.dictionary import LookupCache, dictionary_service
+from infrastructure.dictionary_store import DictionaryStore, readonly_sqlite_url, short_translation
+from infrastructure.highlight_index import DifficultyIndex
+from build_dictionary_slim import build_slim_table
+from application.services import HighlightApplicationService
+from domain.services import HighlightService
+
+CORE_LIBRARY = {
+    "take": {"pos": "verb", "chn": "拿", "def": "to get", "ph": "teik", "mrs": 0, "rank": 60, "level": "A1"},
+    "taking": {"pos": "noun", "chn": "收入", "def": "receipts", "ph": "", "mrs": 80, "rank": 9000},
+    "climate": {"pos": "noun", "chn": "气候", "def": "weather", "ph": "", "mrs": 45, "rank": 3500, "level": "B1"},
+}
+
+TIER2_ROWS = [
+    ("serendipity", 30000, "n. 意外发现\\nn. 机缘巧合", "luck", "ˌserənˈdipəti", "gre"),
+    ("quixotic", 40000, "不切实际的", "idealistic", "kwɪkˈsɒtɪk", "gre"),
+]
+
+
+@pytest.fixture
+def tier2_engine(monkeypatch):
+    """In-memory Tier 2 database with a statement counter"""
+    test_engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    with test_engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE dictionary (word TEXT PRIMARY KEY, ranking INTEGER, "
+            "translation TEXT, definition TEXT, phonetic TEXT, tag TEXT)"
+        ))
+        conn.execute(
+            text("INSERT INTO dictionary VALUES (:w, :r, :t, :d, :p, :g)"),
+            [dict(zip("wrtdpg", row)) for row in TIER2_ROWS]
+        )
+
+    test_engine.dictionary_queries = []
+
+    @event.listens_for(test_engine, "before_cursor_execute")
+    def count_queries(conn, cursor, statement, parameters, context, executemany):
+        if "FROM dictionary" in statement:
+            test_engine.dictionary_queries.append(statement)
+
+    monkeypatch.setattr(dictionary_module, "dictionary_store", DictionaryStore(engine=test_engine))
+    library = CoreLibrary.from_dict(CORE_LIBRARY)
+    variant_map = {"taking": "take", "takes": "take"}
+    monkeypatch.setattr(dictionary_service, "cefr_data", library)
+    monkeypatch.setattr(dictionary_service, "variant_map", variant_map)
+    monkeypatch.setattr(dictionary_service, "resolved_forms", resolve_surface_forms(library, variant_map))
+    monkeypatch.setattr(dictionary_service, "cache", LookupCache(max_size=100))
+    return test_engine
+
+
+class TestLookupMany:
+    """测试批量查询 lookup_many"""
+
+    def test_matches_single_lookup(self, tier2_engine):
+        """批量结果应与逐个 lookup 结果一致"""
+        words = ["Take", "taking", "climate", "serendipity", "nonexistentword12345"]
+        batch = dictionary_service.lookup_many(words)
+
+        for word in words:
+            assert batch[word] == dictionary_service.lookup(word)
+
+    def test_lemma_with_lower_mrs_wins(self, tier2_engine):
+        """原词与词根都存在时，选择 MRS 更低的词条"""
+        info = dictionary_service.lookup_many(["taking"])["taking"]
+
+        assert info["found"] is True
+        assert info["translation"] == "拿"
+        assert info["mrs"] == 0
+
+    def test_single_tier2_query_per_batch(self, tier2_engine):
+        """所有 Tier 2 候选词只发一次查询"""
+        words = ["serendipity", "quixotic", "junk1", "junk2", "climate", "serendipity"]
+        result = dictionary_service.lookup_many(words)
+
+        assert len(tier2_engine.dictionary_queries) == 1
+        assert result["quixotic"]["source"] == "full"
+        assert result["junk1"] == {"word": "junk1", "found": False}
+
+    def test_deduplicates_and_keeps_original_casing(self, tier2_engine):
+        """重复词只返回一次，并保留请求时的大小写"""
+        result = dictionary_service.lookup_many(["Climate", "climate", "Climate"])
+
+        assert list(result) == ["Climate", "climate"]
+        assert result["Climate"]["word"] == "Climate"
+
+    def test_large_batch_uses_temp_table(self, tier2_engine, monkeypatch):
+        """超过 IN 子句上限时使用临时表 JOIN"""
+        monkeypatch.setattr(dictionary_store_module, "TIER2_IN_CLAUSE_LIMIT", 2)
+        words = ["serendipity", "quixotic", "junk1", "junk2"]
+        result = dictionary_service.lookup_many(words)
+
+        assert result["serendipity"]["found"] is True
+        assert result["quixotic"]["found"] is True
+        assert result["junk2"]["found"] is False
+        assert any("tier2_lookup" in q for q in tier2_engine.dictionary_queries)
+
+    def test_empty_input(self, tier2_engine):
+        """空列表不触发查询"""
+        assert dictionary_service.lookup_many([]) == {}
+        assert tier2_engine.dictionary_queries == []
+
+
+class TestLookupCache:
+    """测试查询缓存（命中与未命中都缓存）"""
+
+    def test_lru_eviction(self):
+        """超过容量时淘汰最久未使用的词"""
+        cache = LookupCache(max_size=2)
+        cache.put("a", ("core", {}))
+        cache.put("b", ("core", {}))
+        cache.get("a")
+        cache.put("c", ("core", {}))
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.stats()["size"] == 2
+
+    def test_misses_are_cached(self, tier2_engine):
+        """查不到的词也只查询一次数据库"""
+        for _ in range(3):
+            assert dictionary_service.lookup("https://example.com")["found"] is False
+
+        assert len(tier2_engine.dictionary_queries) == 1
+        stats = dictionary_service.cache_stats()
+        assert stats["hits"] == 2
+        assert stats["misses"] == 1
+
+    def test_cache_is_case_insensitive(self, tier2_engine):
+        """缓存按小写词存储，但返回请求时的原词"""
+        dictionary_service.lookup("Serendipity")
+        info = dictionary_service.lookup("SERENDIPITY")
+
+        assert info["word"] == "SERENDIPITY"
+        assert len(tier2_engine.dictionary_queries) == 1
+
+    def test_batch_lookup_populates_cache(self, tier2_engine):
+        """批量查询的结果会被后续查询复用"""
+        dictionary_service.lookup_many(["quixotic", "junk"])
+        dictionary_service.lookup_many(["quixotic", "junk", "climate"])
+
+        assert len(tier2_engine.dictionary_queries) == 1
+
+    def test_invalidate_cache(self, tier2_engine):
+        """重新加载词典后缓存失效"""
+        dictionary_service.lookup("quixotic")
+        dictionary_service.invalidate_cache()
+        dictionary_service.lookup("quixotic")
+
+        assert len(tier2_engine.dictionary_queries) == 2
+
+    def test_tier2_errors_are_not_cached(self, tier2_engine):
+        """Tier 2 不可用时不缓存未命中结果"""
+        with tier2_engine.begin() as conn:
+            conn.execute(text("ALTER TABLE dictionary RENAME TO dictionary_old"))
+
+        assert dictionary_service.lookup("quixotic")["found"] is False
+        assert dictionary_service.cache_stats()["size"] == 0
+
+
+class TestCoreLibrary:
+    """测试列式存储的 Tier 1 核心词库"""
+
+    def test_entry_round_trip(self):
+        """列式存储可以还原原始词条"""
+        library = CoreLibrary.from_dict(CORE_LIBRARY)
+
+        assert len(library) == 3
+        assert "climate" in library
+        entry = library.entry(library.row("climate"))
+        assert entry["chn"] == "气候"
+        assert entry["mrs"] == 45
+        assert entry["level"] == "B1"
+
+    def test_missing_values(self):
+        """缺失的整数字段还原为 None"""
+        library = CoreLibrary.from_dict({"word": {"pos": "n", "cefr": "A2"}})
+        row = library.row("word")
+
+        assert library.mrs_of(row) is None
+        assert library.rank_of(row) is None
+        assert library.level[row] == "A2"
+        assert library.row("missing") is None
+
+
+class TestCompiledArtifact:
+    """测试预编译的 mmap 词库文件"""
+
+    @pytest.fixture
+    def artifact(self, tmp_path):
+        path = str(tmp_path / "core_library.bin")
+        variant_map = {"taking": "take", "takes": "take", "climates": "climate", "went": "go"}
+        write_core_artifact(path, CoreLibrary.from_dict(CORE_LIBRARY), variant_map)
+        return MappedCoreLibrary(path)
+
+    def test_round_trip(self, artifact):
+        """编译后的词库与原始词条一致"""
+        library = CoreLibrary.from_dict(CORE_LIBRARY)
+
+        assert len(artifact) == len(library)
+        assert sorted(artifact) == sorted(library)
+        for word in CORE_LIBRARY:
+            assert artifact.entry(artifact.row(word)) == library.entry(library.row(word))
+        assert artifact.row("missing") is None
+
+    def test_variant_index(self, artifact):
+        """变体索引支持二分查找"""
+        assert len(artifact.variant_map) == 4
+        assert artifact.variant_map.get("went") == "go"
+        assert artifact.variant_map.get("goes") is None
+        assert "takes" in artifact.variant_map
+
+    def test_lookup_uses_artifact(self, tier2_engine, artifact, monkeypatch):
+        """DictionaryService 使用 mmap 词库时查询结果不变"""
+        expected = dictionary_service.lookup_many(["taking", "Climate", "serendipity"])
+
+        monkeypatch.setattr(dictionary_service, "cefr_data", artifact)
+        monkeypatch.setattr(dictionary_service, "variant_map", artifact.variant_map)
+        monkeypatch.setattr(dictionary_service, "resolved_forms", artifact.resolved_forms)
+        dictionary_service.invalidate_cache()
+
+        assert dictionary_service.lookup_many(["taking", "Climate", "serendipity"]) == expected
+
+    def test_resolved_forms(self, artifact):
+        """变体直接解析到 MRS 更低的最终词条"""
+        forms = artifact.resolved_forms
+
+        assert artifact.row("take") == forms.get("taking")
+        assert artifact.row("take") == forms.get("takes")
+        assert artifact.row("climate") == forms.get("climates")
+        assert forms.get("went") is None  # lemma "go" is not in the Core Library
+        assert len(forms) == 5
+
+    def test_rejects_foreign_file(self, tmp_path):
+        """非词库文件应拒绝加载"""
+        path = tmp_path / "bogus.bin"
+        path.write_bytes(b"not an artifact at all")
+
+        with pytest.raises(ValueError):
+            MappedCoreLibrary(str(path))
+
+
+class TestLemmaTable:
+    """测试预计算词形表与 lemminflect 回退开关"""
+
+    def test_generated_table_round_trip(self, tmp_path):
+        """生成的词形表可被 read_lemma_index 读取，且不覆盖已有映射"""
+        path = str(tmp_path / "lemma.generated.txt")
+        write_lemma_index(path, {"climates": "climate", "took": "take", "taking": "tak"}, header=["test"])
+
+        merged = read_lemma_index(path, {"taking": "take"})
+        assert merged == {"climates": "climate", "took": "take", "taking": "take"}
+
+    def test_dynamic_lemma_disabled(self, tier2_engine, monkeypatch):
+        """关闭回退时不在请求时调用 lemminflect"""
+        calls = []
+        monkeypatch.setattr(dictionary_module, "lemminflect_lemma", lambda w, lib: calls.append(w))
+        monkeypatch.setattr(dictionary_module, "LEMMINFLECT_FALLBACK", False)
+
+        assert dictionary_service.lookup("climates")["found"] is False
+        assert calls == []
+
+    def test_fallback_default_follows_generated_table(self, tmp_path, monkeypatch, capsys):
+        """未设置时：有生成词形表则关闭；无表且装有 lemminflect 则开启；都没有则警告"""
+        generated = tmp_path / "lemma.generated.txt"
+        monkeypatch.setattr(dictionary_module, "lemminflect_available", lambda: True)
+        assert dictionary_module.default_lemminflect_fallback(str(generated)) is True
+
+        generated.write_text("take -> took\n")
+        assert dictionary_module.default_lemminflect_fallback(str(generated)) is False
+
+        generated.unlink()
+        monkeypatch.setattr(dictionary_module, "lemminflect_available", lambda: False)
+        assert dictionary_module.default_lemminflect_fallback(str(generated)) is False
+        assert "lemminflect" in capsys.readouterr().out
+
+    def test_dynamic_lemma_fallback_setting(self, tier2_engine, monkeypatch):
+        """开启回退后，静态表未覆盖的词使用 lemminflect"""
+        monkeypatch.setattr(dictionary_module, "lemminflect_lemma", lambda w, lib: "climate")
+        monkeypatch.setattr(dictionary_module, "LEMMINFLECT_FALLBACK", True)
+
+        info = dictionary_service.lookup("climates")
+        assert info["found"] is True
+        assert info["translation"] == "气候"
+
+
+class TestDictionaryStore:
+    """测试只读的 Tier 2 词典存储"""
+
+    def test_readonly_sqlite_url(self):
+        """文件数据库以只读 URI 打开"""
+        assert readonly_sqlite_url("sqlite:////data/mixread.db") == \
+            "sqlite:///file:/data/mixread.db?mode=ro&uri=true"
+        assert readonly_sqlite_url("sqlite:////data/dict.db", immutable=True) == \
+            "sqlite:///file:/data/dict.db?mode=ro&immutable=1&uri=true"
+        assert readonly_sqlite_url("sqlite://") == "sqlite://"
+        assert readonly_sqlite_url("postgresql://db/mixread") == "postgresql://db/mixread"
+
+    def test_in_clause_is_padded_to_buckets(self, tier2_engine):
+        """不同长度的批量查询复用同一条 SQL"""
+        store = dictionary_module.dictionary_store
+        store.fetch_many(["serendipity", "quixotic", "junk"])
+        store.fetch_many(["serendipity", "junk1", "junk2", "junk3"])
+
+        assert len(set(tier2_engine.dictionary_queries)) == 1
+
+    def test_rejects_writes(self, tmp_path):
+        """只读连接不能修改词典"""
+        db_path = tmp_path / "dict.db"
+        writer = create_engine(f"sqlite:///{db_path}")
+        with writer.begin() as conn:
+            conn.execute(text("CREATE TABLE dictionary (word TEXT PRIMARY KEY, ranking INTEGER, "
+                              "translation TEXT, definition TEXT, phonetic TEXT, tag TEXT)"))
+            conn.execute(text("INSERT INTO dictionary VALUES ('quixotic', 1, 't', 'd', 'p', 'g')"))
+        writer.dispose()
+
+        store = DictionaryStore(url=f"sqlite:///{db_path}")
+        assert [row[0] for row in store.fetch_many(["quixotic"])] == ["quixotic"]
+        with pytest.raises(Exception):
+            with store.engine.begin() as conn:
+                conn.execute(text("DELETE FROM dictionary"))
+        store.dispose()
+
+
+class TestSlimProjection:
+    """测试高亮时使用的精简 Tier 2 投影"""
+
+    def test_short_translation(self):
+        """只保留第一个义项"""
+        assert short_translation("n. 意外发现\\nn. 机缘巧合") == "n. 意外发现"
+        assert short_translation("adj. 不切实际的") == "adj. 不切实际的"
+        assert short_translation("a" * 200, max_chars=10) == "a" * 10
+        assert short_translation(None) is None
+
+    def test_build_slim_table(self, tier2_engine):
+        """从 dictionary 生成精简表"""
+        assert build_slim_table(tier2_engine) == len(TIER2_ROWS)
+        with tier2_engine.connect() as conn:
+            row = conn.execute(text(
+                "SELECT * FROM dictionary_slim WHERE word = 'serendipity'"
+            )).mappings().one()
+
+        assert dict(row) == {
+            "word": "serendipity", "ranking": 30000,
+            "translation": "n. 意外发现", "phonetic": "ˌserənˈdipəti",
+        }
+
+    def test_slim_lookup_omits_definition(self, tier2_engine):
+        """with_definition=False 时不读取释义"""
+        info = dictionary_service.lookup_many(["quixotic"], with_definition=False)["quixotic"]
+
+        assert info["found"] is True
+        assert info["rank"] == 40000
+        assert info["definition"] is None
+        assert "definition" not in tier2_engine.dictionary_queries[0]
+
+    def test_reads_slim_table_when_present(self, tier2_engine):
+        """精简表存在时从精简表读取"""
+        build_slim_table(tier2_engine)
+        tier2_engine.dictionary_queries.clear()
+        info = dictionary_service.lookup_many(["serendipity"], with_definition=False)["serendipity"]
+
+        assert info["translation"] == "n. 意外发现"
+        assert "FROM dictionary_slim" in tier2_engine.dictionary_queries[0]
+
+    def test_cached_slim_entry_upgrades_to_full(self, tier2_engine):
+        """缓存的精简结果在需要释义时重新查询完整行"""
+        dictionary_service.lookup_many(["quixotic"], with_definition=False)
+        full = dictionary_service.lookup("quixotic")
+        assert full["definition"] == "idealistic"
+        assert len(tier2_engine.dictionary_queries) == 2
+
+        # Full row also satisfies later slim lookups
+        slim = dictionary_service.lookup_many(["quixotic"], with_definition=False)["quixotic"]
+        assert slim["definition"] == "idealistic"
+        assert len(tier2_engine.dictionary_queries) == 2
+
+
+class TestDifficultyIndex:
+    """测试预计算难度位图与逐词规则一致"""
+
+    @pytest.fixture
+    def random_library(self, tier2_engine, monkeypatch):
+        rng = random.Random(5)
+        levels = ["A1", "A2", "B1", "B2", "C1", "C2", "Unknown", None]
+        data = {}
+        for i in range(300):
+            data[f"w{i}"] = {
+                "pos": "n", "chn": "", "def": "", "ph": "", "rank": i + 1,
+                "mrs": rng.choice([None, rng.randint(0, 105)]),
+                "level": rng.choice(levels),
+            }
+        library = CoreLibrary.from_dict(data)
+        monkeypatch.setattr(dictionary_service, "cefr_data", library)
+        monkeypatch.setattr(dictionary_service, "resolved_forms", resolve_surface_forms(library, {}))
+        return list(data)
+
+    def test_matches_per_word_rules(self, random_library):
+        """位图筛选结果与 HighlightService 逐词判断相同"""
+        words = random_library + ["serendipity", "nonexistentword"]
+        infos = dictionary_service.lookup_many(words, with_definition=False)
+        settings = [("B1", mrs) for mrs in (-1, 0, 1, 37, 60, 100, 105, 106, 200)]
+        settings += [(level, None) for level in ("A1", "A2", "B1", "B2", "C1", "C2", "bogus")]
+
+        for difficulty_level, difficulty_mrs in settings:
+            passing, unresolved = dictionary_service.partition_by_difficulty(words, difficulty_level, difficulty_mrs)
+            assert unresolved == ["serendipity", "nonexistentword"]
+
+            expected = []
+            for word in random_library:
+                word_obj = HighlightApplicationService._scored_word(word, infos[word])
+                if difficulty_mrs is not None:
+                    hit = HighlightService.should_highlight_mrs(word_obj, difficulty_mrs, set(), set())
+                else:
+                    hit = HighlightService.should_highlight(word_obj, difficulty_level, set(), set())
+                if hit:
+                    expected.append(word)
+            assert passing == expected, (difficulty_level, difficulty_mrs)
+
+    def test_out_of_scale_mrs_does_not_blow_up(self, capsys):
+        """异常的超大 MRS 只多一个位图，并在构建时报告"""
+        library = CoreLibrary.from_dict({
+            "easy": {"mrs": 10, "level": "A1"},
+            "hard": {"mrs": 90, "level": "C1"},
+            "bogus": {"mrs": 2 ** 31 - 1, "level": "C2"},
+        })
+        index = DifficultyIndex(library, lambda row: library.level[row])
+
+        assert len(index.mrs_bits) == 3
+        assert "outside 0-100" in capsys.readouterr().out
+        assert index.select(library.index, "B1", 50) == ["hard", "bogus"]
+        assert index.select(library.index, "B1", 91) == ["bogus"]
+
+    def test_rebuilt_when_library_replaced(self, random_library, monkeypatch):
+        """替换 Core Library 后索引重建"""
+        index = dictionary_service.difficulty_index
+        assert dictionary_service.difficulty_index is index
+
+        monkeypatch.setattr(dictionary_service, "cefr_data", CoreLibrary.from_dict(CORE_LIBRARY))
+        assert dictionary_service.difficulty_index is not index
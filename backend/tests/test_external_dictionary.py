@@ -0,0 +1,209 @@
+"""
+ExternalDefinitionSource Tests
+测试 Tier 3 外部释义查询（共享客户端、并发上限、时间预算、持久缓存）
+"""
+
+import asyncio
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import httpx
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import StaticPool
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from infrastructure import definition_cache as definition_cache_module
+from infrastructure.definition_cache import DefinitionCache
+from infrastructure.external_dictionary import ExternalDefinitionSource, parse_entries
+
+
+def api_entry(definition, example=""):
+    return [{"word": "x", "meanings": [{"definitions": [{"definition": definition, "example": example}]}]}]
+
+
+class StubDictionary:
+    """Stands in for dictionaryapi.dev; records requests and peak concurrency"""
+
+    def __init__(self, delays=None):
+        self.delays = delays or {}
+        self.requests = []
+        self.running = 0
+        self.peak = 0
+
+    async def __call__(self, request):
+        word = request.url.path.rsplit("/", 1)[-1]
+        self.requests.append(word)
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(self.delays.get(word, 0.01))
+        finally:
+            self.running -= 1
+        if word == "missing":
+            return httpx.Response(404, json={"title": "No Definitions Found"})
+        if word == "flaky":
+            return httpx.Response(503)
+        return httpx.Response(200, json=api_entry(f"meaning of {word}", f"use {word}"))
+
+
+@pytest.fixture
+def cache():
+    """DefinitionCache on an in-memory database"""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    definition_cache = DefinitionCache(engine=engine)
+    definition_cache.create_table()
+    return definition_cache
+
+
+def make_source(stub, cache, **kwargs):
+    return ExternalDefinitionSource(
+        base_url="http://stub/api/v2/entries/en",
+        transport=httpx.MockTransport(stub),
+        cache=cache,
+        **kwargs
+    )
+
+
+class TestParseEntries:
+    """测试 API 响应解析"""
+
+    def test_first_definition_and_truncation(self):
+        assert parse_entries(api_entry("short", "ex")) == {"definition": "short", "example": "ex"}
+        long_text = "a" * 200
+        assert parse_entries(api_entry(long_text))["definition"] == "a" * 150 + "..."
+
+    def test_empty_responses(self):
+        assert parse_entries([]) is None
+        assert parse_entries([{"meanings": []}]) == {"definition": "", "example": ""}
+
+
+class TestExternalDefinitionSource:
+    """测试 ExternalDefinitionSource"""
+
+    def test_fetch_and_cache(self, cache):
+        stub = StubDictionary()
+        source = make_source(stub, cache)
+
+        async def scenario():
+            await source.start()
+            first = await source.fetch("Serendipity")
+            second = await source.fetch("serendipity")
+            missing = await source.fetch("missing")
+            await source.aclose()
+            return first, second, missing
+
+        first, second, missing = asyncio.run(scenario())
+        assert first == {"definition": "meaning of serendipity", "example": "use serendipity"}
+        assert second == first
+        assert missing == {"definition": "", "example": ""}
+        assert stub.requests == ["serendipity", "missing"]
+
+    def test_fetch_many_is_concurrent_and_bounded(self, cache):
+        stub = StubDictionary()
+        source = make_source(stub, cache, max_concurrency=3)
+        words = [f"word{i}" for i in range(10)] + ["Word0"]
+
+        async def scenario():
+            result = await source.fetch_many(words)
+            await source.aclose()
+            return result
+
+        result = asyncio.run(scenario())
+        assert set(result) == set(words)
+        assert result["Word0"] == result["word0"]
+        assert len(stub.requests) == 10
+        assert stub.peak == 3
+
+    def test_budget_returns_partial_results(self, cache):
+        stub = StubDictionary(delays={"slow": 1.0})
+        source = make_source(stub, cache, budget=0.2)
+
+        async def scenario():
+            result = await source.fetch_many(["fast", "slow"])
+            await source.aclose()
+            return result
+
+        result = asyncio.run(scenario())
+        assert result["fast"]["definition"] == "meaning of fast"
+        assert result["slow"] == {"definition": "", "example": ""}
+        # Timed-out words are not cached, so a later request retries them
+        assert cache.get_many(["fast", "slow"]) == {"fast": result["fast"]}
+
+    def test_warm_restart_reads_persistent_cache(self, cache):
+        """新实例（重启/其他 worker）直接命中持久缓存"""
+        stub = StubDictionary()
+
+        async def scenario():
+            first = make_source(stub, cache)
+            await first.fetch_many(["alpha", "missing", "flaky"])
+            await first.aclose()
+
+            second = make_source(stub, cache)
+            result = await second.fetch_many(["Alpha", "missing", "flaky"])
+            await second.aclose()
+            return result
+
+        result = asyncio.run(scenario())
+        assert result["Alpha"]["definition"] == "meaning of alpha"
+        assert result["missing"] == {"definition": "", "example": ""}
+        # Only the transient 503 is retried
+        assert stub.requests == ["alpha", "missing", "flaky", "flaky"]
+
+
+class TestDefinitionCache:
+    """测试 DefinitionCache 的过期与容量上限"""
+
+    def test_positive_and_negative_ttl(self, cache):
+        now = datetime(2026, 1, 1)
+        cache.put_many({"known": {"definition": "d", "example": "e"}, "nothing": None}, now=now)
+
+        assert set(cache.get_many(["known", "nothing"], now=now)) == {"known", "nothing"}
+        later = now + cache.negative_ttl + timedelta(seconds=1)
+        assert set(cache.get_many(["known", "nothing"], now=later)) == {"known"}
+        expired = now + cache.ttl + timedelta(seconds=1)
+        assert cache.get_many(["known"], now=expired) == {}
+
+    def test_prune_enforces_size_cap(self, cache):
+        cache.max_size = 3
+        start = datetime(2026, 1, 1)
+        for i in range(5):
+            cache.put_many({f"w{i}": {"definition": str(i), "example": ""}}, now=start + timedelta(minutes=i))
+
+        cache.prune(now=start + timedelta(minutes=5))
+        words = [f"w{i}" for i in range(5)]
+        assert sorted(cache.get_many(words, now=start)) == ["w2", "w3", "w4"]
+
+    def test_prune_trims_exactly_the_overflow_of_one_batch(self, cache):
+        cache.max_size = 3
+        now = datetime(2026, 1, 1)
+        words = [f"w{i}" for i in range(5)]
+        cache.put_many({word: {"definition": word, "example": ""} for word in words}, now=now)
+
+        cache.prune(now=now)
+        assert len(cache.get_many(words, now=now)) == 3
+
+    def test_rewriting_a_batch_larger_than_a_chunk(self, cache, monkeypatch):
+        monkeypatch.setattr(definition_cache_module, "_QUERY_CHUNK", 2)
+        now = datetime(2026, 1, 1)
+        words = [f"w{i}" for i in range(5)]
+        cache.put_many({word: {"definition": "old", "example": ""} for word in words}, now=now)
+        deletes = []
+
+        @event.listens_for(cache.engine, "before_cursor_execute")
+        def count(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("DELETE"):
+                deletes.append(statement)
+
+        cache.put_many({word: {"definition": "new", "example": ""} for word in words}, now=now)
+
+        # 5 words, at most 2 bound per statement
+        assert len(deletes) == 3
+        assert {result["definition"] for result in cache.get_many(words, now=now).values()} == {"new"}
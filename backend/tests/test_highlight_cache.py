@@ -0,0 +1,197 @@
+"""
+Highlight Result Cache Tests
+测试页面级高亮结果缓存（指纹、命中、unchanged 回复）
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from application.services import HighlightApplicationService, UserApplicationService
+from infrastructure.dictionary import LookupCache, dictionary_service
+from infrastructure.highlight_cache import HighlightResultCache, highlight_result_cache, page_fingerprint
+
+ENTRIES = {
+    "the": {"level": "A1", "mrs": 0},
+    "climate": {"level": "B1", "mrs": 45},
+    "serendipity": {"level": "C2", "mrs": 95},
+    "quixotic": {"level": "C2", "mrs": 98},
+}
+
+
+class FakeDictionary:
+    """Records every lookup_many call"""
+
+    def __init__(self):
+        self.calls = []
+
+    @property
+    def generation(self):
+        # Fingerprints follow the real service's reloads
+        return dictionary_service.generation
+
+    def lookup_many(self, words, with_definition=True):
+        self.calls.append(list(words))
+        result = {}
+        for word in words:
+            entry = ENTRIES.get(word.lower())
+            if entry:
+                result[word] = {"found": True, "word": word.lower(), "translation": "译", "phonetic": "", **entry}
+            else:
+                result[word] = {"found": False, "word": word}
+        return result
+
+    def partition_by_difficulty(self, words, difficulty_level, difficulty_mrs=None):
+        # No Core Library: every word is scored after its lookup
+        return [], list(words)
+
+
+@pytest.fixture
+def dictionary():
+    return FakeDictionary()
+
+
+@pytest.fixture
+def service(repo, dictionary):
+    return HighlightApplicationService(repo, dictionary, HighlightResultCache(max_size=10))
+
+
+class TestPageFingerprint:
+    """测试指纹计算"""
+
+    def test_order_independent_and_input_sensitive(self):
+        base = page_fingerprint(["a", "b"], "B1", None, "v1", "g1")
+        assert page_fingerprint(["b", "a"], "B1", None, "v1", "g1") == base
+        assert page_fingerprint(["a", "b"], "B2", None, "v1", "g1") != base
+        assert page_fingerprint(["a", "b"], "B1", 40, "v1", "g1") != base
+        assert page_fingerprint(["a", "b"], "B1", None, "v2", "g1") != base
+        assert page_fingerprint(["a", "b"], "B1", None, "v1", "g2") != base
+        assert page_fingerprint(["a", "b"], "B1", None, "v1", "g1", compact=True) != base
+        assert page_fingerprint(["a", "b", "c"], "B1", None, "v1", "g1") != base
+
+
+class TestHighlightResultCache:
+    """测试 HighlightApplicationService 的结果缓存"""
+
+    def test_reload_is_served_from_cache(self, service, dictionary):
+        first = service.get_highlighted_words("alice", ["the", "serendipity", "climate", "serendipity"], "B2")
+        assert first["highlighted_words"] == ["serendipity", "serendipity"]
+        assert first["highlighted_count"] == 2
+
+        # Same token set in a different order: no dictionary work, request order kept
+        second = service.get_highlighted_words("alice", ["climate", "serendipity", "the"], "B2")
+        assert second["fingerprint"] == first["fingerprint"]
+        assert second["highlighted_words"] == ["serendipity"]
+        assert second["word_details"][0]["reason"] == "difficulty_based"
+        assert len(dictionary.calls) == 1
+        assert dictionary.calls[0] == ["the", "serendipity", "climate"]
+
+    def test_current_fingerprint_gets_unchanged_reply(self, service):
+        first = service.get_highlighted_words("alice", ["serendipity"], "B2")
+        reply = service.get_highlighted_words("alice", ["serendipity"], "B2", fingerprint=first["fingerprint"])
+        assert reply == {"success": True, "unchanged": True, "fingerprint": first["fingerprint"]}
+
+        stale = service.get_highlighted_words("alice", ["serendipity"], "C2", fingerprint=first["fingerprint"])
+        assert "unchanged" not in stale
+        assert stale["fingerprint"] != first["fingerprint"]
+
+    def test_marking_a_word_changes_the_answer(self, service, repo):
+        first = service.get_highlighted_words("alice", ["serendipity", "climate"], "B2")
+        UserApplicationService(repo).mark_word_as_known("alice", "serendipity")
+
+        reply = service.get_highlighted_words("alice", ["serendipity", "climate"], "B2", fingerprint=first["fingerprint"])
+        assert reply["fingerprint"] != first["fingerprint"]
+        assert reply["highlighted_words"] == []
+
+        UserApplicationService(repo).mark_word_as_unknown("alice", "climate")
+        reply = service.get_highlighted_words("alice", ["serendipity", "climate"], "B2")
+        assert reply["highlighted_words"] == ["climate"]
+        assert reply["word_details"][0]["reason"] == "user_marked_unknown"
+
+    def test_switching_compact_is_not_unchanged(self, service):
+        first = service.get_highlighted_words("alice", ["serendipity"], "B2")
+        reply = service.get_highlighted_words("alice", ["serendipity"], "B2", fingerprint=first["fingerprint"], compact=True)
+        assert "unchanged" not in reply
+        assert reply["compact"]
+
+    def test_dictionary_reload_changes_the_fingerprint(self, service, monkeypatch):
+        monkeypatch.setattr(dictionary_service, "cache", LookupCache(max_size=10))
+        first = service.get_highlighted_words("alice", ["serendipity"], "B2")
+
+        dictionary_service.invalidate_cache()
+        reply = service.get_highlighted_words("alice", ["serendipity"], "B2", fingerprint=first["fingerprint"])
+        assert "unchanged" not in reply
+        assert reply["fingerprint"] != first["fingerprint"]
+
+    def test_dictionary_reload_drops_page_results(self, monkeypatch):
+        monkeypatch.setattr(dictionary_service, "cache", LookupCache(max_size=10))
+        highlight_result_cache.put("page", {"serendipity": {"word": "serendipity"}})
+
+        dictionary_service.invalidate_cache()
+        assert highlight_result_cache.get("page") is None
+
+
+class TestTokenCollapse:
+    """测试按小写去重与 compact 响应"""
+
+    PAGE = ["Serendipity", "the", "serendipity", "The", "Quixotic", "serendipity", "climate"]
+
+    def test_lookup_once_per_lowercased_word(self, service, dictionary):
+        result = service.get_highlighted_words("alice", self.PAGE, "B2")
+        assert dictionary.calls == [["serendipity", "the", "quixotic", "climate"]]
+        assert result["highlighted_words"] == ["Serendipity", "serendipity", "Quixotic", "serendipity"]
+        assert [d["word"] for d in result["word_details"]] == result["highlighted_words"]
+        assert result["highlighted_count"] == 4
+        assert result["total_words"] == len(self.PAGE)
+
+    def test_compact_mode(self, service):
+        full = service.get_highlighted_words("alice", self.PAGE, "B2")
+        compact = service.get_highlighted_words("alice", self.PAGE, "B2", compact=True)
+
+        assert compact["compact"] is True
+        # A different response shape: a full-mode fingerprint must not match it
+        assert compact["fingerprint"] != full["fingerprint"]
+        assert compact["highlighted_words"] == ["Quixotic", "Serendipity", "serendipity"]
+        assert [d["word"] for d in compact["word_details"]] == ["quixotic", "serendipity"]
+        assert compact["highlighted_count"] == full["highlighted_count"]
+        assert compact["unique_words"] == 4
+
+
+class TestStreamHighlightedWords:
+    """测试分块流式高亮"""
+
+    PAGE = ["Serendipity", "the", "climate", "serendipity", "quixotic", "the", "Serendipity"]
+
+    def test_chunks_match_full_result(self, service, dictionary):
+        messages = list(service.stream_highlighted_words("alice", self.PAGE, "B2", chunk_size=3))
+        start, *chunks, end = messages
+
+        assert start["type"] == "start" and start["total_words"] == 7
+        assert [(c["start"], c["end"]) for c in chunks] == [(0, 3), (3, 6), (6, 7)]
+        assert [c["highlighted_words"] for c in chunks] == [["Serendipity"], ["serendipity", "quixotic"], ["Serendipity"]]
+        # Each word is looked up and detailed once, in the chunk it first appears in
+        assert dictionary.calls == [["serendipity", "the", "climate"], ["quixotic"]]
+        assert [[d["word"] for d in c["word_details"]] for c in chunks] == [["serendipity"], ["quixotic"], []]
+
+        full = service.get_highlighted_words("alice", self.PAGE, "B2")
+        assert end["highlighted_count"] == full["highlighted_count"] == 4
+        assert end["unique_words"] == 4
+
+    def test_invalid_level_yields_only_error(self, service):
+        assert list(service.stream_highlighted_words("alice", self.PAGE, "Z9")) == [
+            {"success": False, "error": "Invalid difficulty level: Z9"}
+        ]
+
+    def test_endpoint_lines_are_not_ascii_escaped(self, client):
+        response = client.post("/highlight-words/stream", json={
+            "user_id": "alice", "words": [], "difficulty_level": "中级", "difficulty_mrs": 50
+        })
+        header, end = response.text.splitlines()
+
+        assert '"difficulty_level": "中级"' in header
+        assert json.loads(end)["type"] == "end"
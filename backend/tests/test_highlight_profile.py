@@ -0,0 +1,110 @@
+"""
+Highlight Profile Tests
+测试高亮用的轻量用户画像（两次窄查询、按用户缓存、写入后失效）
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from application.services import UserApplicationService
+from domain.models import HighlightProfile
+from infrastructure.models import UnknownWordModel
+from infrastructure.repositories import (
+    CHANGE_ADD,
+    HighlightProfileCache,
+    UserRepository,
+    highlight_profile_cache,
+    profile_version,
+    record_changes,
+)
+
+
+class TestHighlightProfile:
+    """测试 UserRepository.get_highlight_profile"""
+
+    def test_loads_known_and_unknown_sets(self, db):
+        service = UserApplicationService(UserRepository(db))
+        service.mark_word_as_known("alice", "Apple")
+        service.mark_word_as_unknown("alice", "banana")
+        service.add_to_library("alice", ["cherry"], [{"sentence": "A cherry."}])
+
+        profile = UserRepository(db).get_highlight_profile("alice")
+        assert profile.known_words == {"apple"}
+        assert profile.unknown_words == {"banana"}
+        assert profile.version == profile_version({"apple"}, {"banana"})
+
+    def test_new_user_is_created(self, db):
+        profile = UserRepository(db).get_highlight_profile("newcomer")
+        assert profile.known_words == frozenset()
+        assert UserRepository(db).get_user("newcomer").user_id == "newcomer"
+
+    def test_repeated_loads_only_check_the_change_seq(self, db):
+        repo = UserRepository(db)
+        repo.get_highlight_profile("alice")
+        engine = db.get_bind()
+        engine.statements.clear()
+
+        for _ in range(3):
+            repo.get_highlight_profile("alice")
+        assert len(engine.statements) == 3
+        assert all("user_changes" in s and "known_words" not in s for s in engine.statements)
+
+    def test_marking_words_invalidates_profile(self, db):
+        repo = UserRepository(db)
+        service = UserApplicationService(repo)
+        before = repo.get_highlight_profile("alice")
+
+        service.mark_word_as_unknown("alice", "grape")
+        after_unknown = repo.get_highlight_profile("alice")
+        assert after_unknown.unknown_words == {"grape"}
+        assert after_unknown.version != before.version
+
+        service.mark_word_as_known("alice", "grape")
+        after_known = repo.get_highlight_profile("alice")
+        assert after_known.known_words == {"grape"}
+        assert after_known.unknown_words == frozenset()
+
+        repo.remove_known_word("alice", "grape")
+        assert repo.get_highlight_profile("alice").known_words == frozenset()
+
+    def test_writes_by_other_workers_are_seen(self, db):
+        repo = UserRepository(db)
+        repo.get_highlight_profile("alice")
+        # Simulate another worker: its write is logged, but this worker's cache is not invalidated
+        db.add(UnknownWordModel(user_id="alice", word="kiwi"))
+        record_changes(db, "alice", [("unknown_words", "kiwi", CHANGE_ADD)])
+        db.commit()
+
+        assert repo.get_highlight_profile("alice").unknown_words == {"kiwi"}
+
+    def test_unlogged_writes_expire_with_ttl(self, db, monkeypatch):
+        repo = UserRepository(db)
+        repo.get_highlight_profile("alice")
+        # Simulate a script writing straight to the database, without the change log
+        db.add(UnknownWordModel(user_id="alice", word="kiwi"))
+        db.commit()
+        assert repo.get_highlight_profile("alice").unknown_words == frozenset()
+
+        monkeypatch.setattr(highlight_profile_cache, "ttl", 0)
+        assert repo.get_highlight_profile("alice").unknown_words == {"kiwi"}
+
+
+class TestHighlightProfileCache:
+    """测试 HighlightProfileCache 容量上限与变更序号校验"""
+
+    def test_lru_eviction(self):
+        cache = HighlightProfileCache(max_size=2, ttl=60)
+        profiles = [HighlightProfile(user_id, frozenset(), frozenset(), "v") for user_id in ("a", "b", "c")]
+        for profile in profiles:
+            cache.put(profile, 0)
+        assert cache.get("a", 0) is None
+        assert cache.get("c", 0) is profiles[2]
+
+    def test_entry_of_an_older_seq_is_dropped(self):
+        cache = HighlightProfileCache(max_size=2, ttl=60)
+        cache.put(HighlightProfile("a", frozenset(), frozenset(), "v"), 5)
+        assert cache.get("a", 6) is None
+        assert cache.get("a", 5) is None
@@ -0,0 +1,164 @@
+"""
+Highlight Text Tests
+测试服务端分词、压缩请求体解码与按块返回的高亮偏移
+"""
+
+import gzip
+import sys
+import zlib
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from application.services import HighlightApplicationService, UserApplicationService
+from domain.tokenizer import tokenize, tokenize_with_offsets
+from infrastructure.compression import BodyDecodingError, decode_body
+from infrastructure.highlight_cache import HighlightResultCache
+
+ENTRIES = {
+    "the": {"level": "A1", "mrs": 0},
+    "climate": {"level": "B1", "mrs": 45},
+    "serendipity": {"level": "C2", "mrs": 95},
+    "quixotic": {"level": "C2", "mrs": 98},
+}
+
+
+class FakeDictionary:
+    """Records every lookup_many call"""
+
+    def __init__(self):
+        self.calls = []
+        self.generation = "g1"
+
+    def lookup_many(self, words, with_definition=True):
+        self.calls.append(list(words))
+        result = {}
+        for word in words:
+            entry = ENTRIES.get(word)
+            if entry:
+                result[word] = {"found": True, "word": word, "translation": "译", "phonetic": "", **entry}
+            else:
+                result[word] = {"found": False, "word": word}
+        return result
+
+    def partition_by_difficulty(self, words, difficulty_level, difficulty_mrs=None):
+        return [], list(words)
+
+
+@pytest.fixture
+def dictionary():
+    return FakeDictionary()
+
+
+@pytest.fixture
+def service(repo, dictionary):
+    return HighlightApplicationService(repo, dictionary, HighlightResultCache(max_size=10))
+
+
+class TestTokenizer:
+    """测试与扩展一致的分词规则"""
+
+    def test_matches_extension_pattern(self):
+        # Only the ASCII apostrophe joins words, as in the extension
+        assert tokenize("It's a well-known fact, isn’t it? 42 times.") == [
+            "It's", "a", "well-known", "fact", "isn", "t", "it", "times"
+        ]
+        # ASCII word boundaries, like JavaScript's \b
+        assert tokenize("café naïve") == ["caf", "na", "ve"]
+
+    def test_offsets_are_utf16(self):
+        text = "😀 quixotic 😀😀 climate"
+        tokens = tokenize_with_offsets(text)
+        # JavaScript: text.indexOf("quixotic") == 3, text.indexOf("climate") == 17
+        assert tokens == [(3, 11, "quixotic"), (17, 24, "climate")]
+        utf16 = text.encode("utf-16-le")
+        for start, end, word in tokens:
+            assert utf16[start * 2:end * 2].decode("utf-16-le") == word
+
+    def test_bmp_text_keeps_python_offsets(self):
+        text = "Über das — serendipity"
+        start, end, word = tokenize_with_offsets(text)[-1]
+        assert text[start:end] == word == "serendipity"
+
+
+class TestDecodeBody:
+    """测试请求体解压与大小限制"""
+
+    def test_identity_gzip_and_deflate(self):
+        body = b'{"user_id": "alice"}'
+        assert decode_body(body) == body
+        assert decode_body(gzip.compress(body), "gzip") == body
+        assert decode_body(zlib.compress(body), "deflate") == body
+
+    def test_rejects_bad_bodies(self):
+        with pytest.raises(BodyDecodingError):
+            decode_body(b"not gzip", "gzip")
+        with pytest.raises(BodyDecodingError):
+            decode_body(gzip.compress(b"x" * 1000)[:20], "gzip")
+        with pytest.raises(BodyDecodingError):
+            decode_body(b"{}", "br")
+
+    def test_decompressed_size_is_capped(self):
+        bomb = gzip.compress(b"a" * 100_000)
+        with pytest.raises(BodyDecodingError):
+            decode_body(bomb, "gzip", max_size=10_000)
+        assert len(decode_body(bomb, "gzip", max_size=100_000)) == 100_000
+
+
+class TestHighlightText:
+    """测试 HighlightApplicationService.highlight_text"""
+
+    BLOCKS = [
+        "Serendipity is the quixotic climate of Serendipity.",
+        "",
+        "Nothing hard here.",
+        "😀 quixotic",
+    ]
+
+    def test_offsets_per_block(self, service, dictionary):
+        result = service.highlight_text("alice", self.BLOCKS, "B2")
+
+        assert result["blocks"] == [[[0, 11], [19, 27], [39, 50]], [], [], [[3, 11]]]
+        assert [d["word"] for d in result["word_details"]] == ["quixotic", "serendipity"]
+        assert result["highlighted_count"] == 4
+        assert result["total_words"] == 11
+        # One lookup for the page's distinct lowercased words
+        assert dictionary.calls == [[
+            "serendipity", "is", "the", "quixotic", "climate", "of", "nothing", "hard", "here"
+        ]]
+
+    def test_shares_page_cache_with_word_lists(self, service, dictionary):
+        words = [word for block in self.BLOCKS for word in tokenize(block)]
+        by_words = service.get_highlighted_words("alice", words, "B2")
+        by_text = service.highlight_text("alice", self.BLOCKS, "B2")
+
+        assert by_text["fingerprint"] == by_words["fingerprint"]
+        assert len(dictionary.calls) == 1
+
+    def test_user_marks_apply(self, service, repo):
+        UserApplicationService(repo).mark_word_as_known("alice", "serendipity")
+        UserApplicationService(repo).mark_word_as_unknown("alice", "climate")
+
+        result = service.highlight_text("alice", self.BLOCKS[:1], "B2")
+        assert result["blocks"] == [[[19, 27], [28, 35]]]
+        assert [d["reason"] for d in result["word_details"]] == ["user_marked_unknown", "difficulty_based"]
+
+    def test_invalid_level(self, service):
+        result = service.highlight_text("alice", self.BLOCKS, "Z9")
+        assert result["success"] is False
+
+
+class TestHighlightTextEndpoint:
+    """测试 /highlight-text 对错误请求体的响应"""
+
+    def test_body_that_is_not_json(self, client):
+        response = client.post("/highlight-text", content=b"\xff not json {")
+        assert response.status_code == 422
+        assert response.json()["detail"]
+
+    def test_body_missing_fields(self, client):
+        response = client.post("/highlight-text", json={"user_id": "alice"})
+        assert response.status_code == 422
@@ -0,0 +1,110 @@
+"""
+Known Words Table Tests
+测试 known_words 表（单行写入、JSON 旧数据在线迁移）
+"""
+
+import json
+import sys
+from pathlib import Path
+
+from sqlalchemy.orm import sessionmaker
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from application.services import UserApplicationService
+from infrastructure.models import KnownWordModel, UserModel
+from infrastructure.repositories import UserRepository
+
+
+def legacy_user(db, user_id, words):
+    """A user row as written before the known_words table existed"""
+    db.add(UserModel(user_id=user_id, known_words_json=json.dumps(words)))
+    db.commit()
+
+
+def table_words(db, user_id):
+    return {w for (w,) in db.query(KnownWordModel.word).filter(KnownWordModel.user_id == user_id)}
+
+
+class TestKnownWordWrites:
+    """测试单行增删"""
+
+    def test_mark_and_unmark(self, db):
+        repo = UserRepository(db)
+        service = UserApplicationService(repo)
+        service.mark_word_as_known("alice", "Apple")
+        service.mark_word_as_known("alice", "apple")
+        service.mark_word_as_known("alice", "pear")
+        assert repo.get_known_words("alice") == {"apple", "pear"}
+
+        repo.remove_known_word("alice", "APPLE")
+        assert repo.get_known_words("alice") == {"pear"}
+        assert db.query(UserModel.known_words_json).filter(UserModel.user_id == "alice").scalar() is None
+
+    def test_write_cost_does_not_depend_on_list_size(self, db, engine):
+        repo = UserRepository(db)
+        repo.get_user("alice")
+        for i in range(2000):
+            repo.add_known_word("alice", f"word{i}")
+
+        engine.statements.clear()
+        repo.add_known_word("alice", "zebra")
+        repo.remove_known_word("alice", "word7")
+        writes = [s for s in engine.statements if s.lstrip().upper().startswith(("INSERT", "DELETE", "UPDATE"))]
+        # One single-row insert and one single-row delete, each with its
+        # change log entry; the users row is untouched
+        assert len(writes) == 4
+        assert len([s for s in writes if "user_changes" in s]) == 2
+        assert "users" not in " ".join(writes)
+        assert len(repo.get_known_words("alice")) == 2000
+
+    def test_two_sessions_do_not_overwrite_each_other(self, engine):
+        first = UserRepository(sessionmaker(bind=engine)())
+        second = UserRepository(sessionmaker(bind=engine)())
+        first.get_user("alice")
+
+        first.add_known_word("alice", "apple")
+        second.add_known_word("alice", "pear")
+        assert first.get_known_words("alice") == {"apple", "pear"}
+
+
+class TestLegacyMigration:
+    """测试 known_words_json 迁移"""
+
+    def test_migrated_on_first_access(self, db):
+        legacy_user(db, "alice", ["Apple", "pear"])
+
+        profile = UserRepository(db).get_highlight_profile("alice")
+        assert profile.known_words == {"apple", "pear"}
+        assert table_words(db, "alice") == {"apple", "pear"}
+        assert db.query(UserModel.known_words_json).filter(UserModel.user_id == "alice").scalar() is None
+
+    def test_write_paths_migrate_first(self, db):
+        legacy_user(db, "alice", ["apple", "pear"])
+        repo = UserRepository(db)
+
+        repo.remove_known_word("alice", "apple")
+        repo.add_known_word("alice", "plum")
+        assert repo.get_known_words("alice") == {"pear", "plum"}
+        assert repo.get_user("alice").known_words == {"pear", "plum"}
+
+    def test_save_user_migrates_and_diffs(self, db):
+        legacy_user(db, "alice", ["apple", "pear"])
+        repo = UserRepository(db)
+
+        user = repo.get_user("alice")
+        user.remove_known_word("apple")
+        user.add_known_word("plum")
+        repo.save_user(user)
+        assert table_words(db, "alice") == {"pear", "plum"}
+
+    def test_sweep(self, db):
+        for i in range(5):
+            legacy_user(db, f"user{i}", [f"word{i}", "common"])
+        legacy_user(db, "broken", "not a list")
+
+        assert UserRepository(db).migrate_legacy_known_words(batch_size=2) == 6
+        assert table_words(db, "user3") == {"word3", "common"}
+        assert table_words(db, "broken") == set()
+        assert UserRepository(db).migrate_legacy_known_words() == 0
@@ -0,0 +1,151 @@
+"""
+Library Contexts Table Tests
+测试 library_contexts 表：追加写入、去重、旧数据迁移与分页
+"""
+
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from application.services import UserApplicationService
+from infrastructure.models import LibraryContextModel, LibraryEntryModel, UserModel
+
+
+def capture(url, *sentences, timestamp=1700000000000):
+    return {"page_url": url, "page_title": "Page", "sentences": list(sentences), "timestamp": timestamp}
+
+
+def context_count(repo):
+    return repo.db.query(LibraryContextModel).count()
+
+
+class TestAppendOnlyWrites:
+    """上下文只追加新句子，不重写已有数据"""
+
+    def test_add_library_words_groups_contexts_back(self, repo):
+        repo.add_library_words("alice", {"Apple": [capture("https://a", "An apple a day.", "Apples are red.")]})
+
+        contexts = repo.get_user("alice").library["apple"].contexts
+        assert len(contexts) == 1
+        assert contexts[0]["page_url"] == "https://a"
+        assert contexts[0]["sentences"] == ["An apple a day.", "Apples are red."]
+        assert contexts[0]["timestamp"] == 1700000000000
+
+    def test_appending_does_not_touch_existing_rows(self, repo, engine):
+        repo.add_library_words("alice", {"apple": [capture("https://a", f"Sentence number {i}.") for i in range(50)]})
+
+        engine.statements.clear()
+        repo.add_library_words("alice", {"apple": [capture("https://b", "One more apple sentence.")]})
+
+        writes = [s for s in engine.statements if not s.lstrip().upper().startswith("SELECT")]
+        assert not any(s.lstrip().upper().startswith(("UPDATE", "DELETE")) for s in writes)
+        assert context_count(repo) == 51
+
+    def test_duplicate_sentences_are_skipped(self, repo):
+        repo.add_library_words("alice", {"apple": [capture("https://a", "An apple a day.")]})
+        repo.add_library_words("alice", {"apple": [capture("https://b", "an  apple a DAY.", "Fresh one.")]})
+
+        assert context_count(repo) == 2
+
+    def test_save_user_inserts_only_new_contexts(self, repo):
+        user = repo.get_user("alice")
+        user.add_to_library(["apple"], [capture("https://a", "First apple.")])
+        repo.save_user(user)
+
+        user = repo.get_user("alice")
+        user.add_to_library(["apple"], [{"sentence": "Second apple."}])
+        repo.save_user(user)
+
+        assert context_count(repo) == 2
+        assert user.library["apple"].new_contexts == []
+        sentences = [c["sentences"] for c in repo.get_user("alice").library["apple"].contexts]
+        assert sorted(sentences) == [["First apple."], ["Second apple."]]
+
+    def test_service_distributes_contexts(self, repo):
+        service = UserApplicationService(repo)
+        service.add_to_library("alice", ["one", "two"], [{"sentence": "Sentence one."}, {"sentence": "Sentence two."}])
+
+        library = repo.get_user("alice").library
+        assert library["one"].contexts[0]["sentences"] == ["Sentence one."]
+        assert library["two"].contexts[0]["sentences"] == ["Sentence two."]
+
+    def test_remove_deletes_contexts(self, repo):
+        repo.add_library_words("alice", {"apple": [capture("https://a", "An apple a day.")], "pear": ["A pear."]})
+
+        repo.remove_library_word("alice", "apple")
+
+        assert context_count(repo) == 1
+        assert set(repo.get_user("alice").library) == {"pear"}
+
+
+class TestLegacyMigration:
+    """contexts_json 旧数据的迁移"""
+
+    def seed_legacy(self, repo):
+        db = repo.db
+        db.add(UserModel(user_id="alice"))
+        db.add(LibraryEntryModel(
+            user_id="alice",
+            word="apple",
+            added_at=datetime(2024, 1, 1),
+            contexts_json=json.dumps([capture("https://a", "Old apple sentence."), {"sentence": "Older one."}])
+        ))
+        db.commit()
+
+    def test_migrated_on_load(self, repo):
+        self.seed_legacy(repo)
+
+        contexts = repo.get_user("alice").library["apple"].contexts
+
+        assert [c["sentences"] for c in contexts] == [["Old apple sentence."], ["Older one."]]
+        assert repo.db.query(LibraryEntryModel.contexts_json).scalar() is None
+        assert context_count(repo) == 2
+
+    def test_migrated_before_append(self, repo):
+        self.seed_legacy(repo)
+
+        repo.add_library_words("alice", {"apple": [capture("https://b", "Old apple sentence.", "New one.")]})
+
+        assert context_count(repo) == 3
+
+    def test_sweep(self, repo):
+        self.seed_legacy(repo)
+
+        assert repo.migrate_legacy_contexts(batch_size=1) == 1
+        assert repo.migrate_legacy_contexts() == 0
+        assert context_count(repo) == 2
+
+
+class TestPagination:
+    """按游标分页读取上下文"""
+
+    def test_pages_newest_first(self, repo):
+        repo.add_library_words("alice", {
+            "apple": [capture("https://a", f"Apple sentence {i}.", timestamp=1700000000000 + i * 1000) for i in range(7)]
+        })
+
+        seen = []
+        cursor = None
+        while True:
+            page = repo.get_library_contexts("alice", "apple", limit=3, cursor=cursor)
+            seen.extend(c["sentence"] for c in page["contexts"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+
+        assert seen == [f"Apple sentence {i}." for i in reversed(range(7))]
+
+    def test_unknown_word(self, repo):
+        assert repo.get_library_contexts("alice", "missing") is None
+
+    def test_invalid_cursor(self, repo):
+        repo.add_library_words("alice", {"apple": ["An apple."]})
+
+        with pytest.raises(ValueError):
+            repo.get_library_contexts("alice", "apple", cursor="garbage")
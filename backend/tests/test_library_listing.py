@@ -0,0 +1,166 @@
+"""
+Library / Vocabulary Listing Tests
+测试分页、排序、过滤的生词本与词汇列表查询及计数
+"""
+
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from application.services import UserApplicationService
+from domain.models import VocabularyStatus
+from infrastructure.models import KnownWordModel, LibraryEntryModel, UserModel, VocabularyEntryModel
+
+START = datetime(2024, 1, 1)
+
+
+@pytest.fixture
+def seeded(repo):
+    """25 library and vocabulary entries, one a day; every 5th mastered"""
+    db = repo.db
+    db.add(UserModel(user_id="alice"))
+    db.flush()
+    for model in (LibraryEntryModel, VocabularyEntryModel):
+        db.bulk_insert_mappings(model, [
+            {
+                "user_id": "alice",
+                "word": f"word{i:02d}",
+                "added_at": START + timedelta(days=i),
+                "status": VocabularyStatus.MASTERED if i % 5 == 0 else VocabularyStatus.LEARNING,
+            }
+            for i in range(25)
+        ])
+    db.bulk_insert_mappings(KnownWordModel, [{"user_id": "alice", "word": f"known{i}"} for i in range(100)])
+    db.commit()
+    repo.add_library_words("alice", {"word03": ["First sentence here.", "Second sentence here."]})
+    return repo
+
+
+def all_pages(list_page, limit=10, **kwargs):
+    words, cursor = [], None
+    while True:
+        page = list_page("alice", limit=limit, cursor=cursor, **kwargs)
+        words.extend(item["word"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return words
+
+
+class TestLibraryListing:
+    """生词本分页查询"""
+
+    def test_pages_newest_first(self, seeded):
+        assert all_pages(seeded.list_library) == [f"word{i:02d}" for i in reversed(range(25))]
+
+    def test_sort_by_word_ascending(self, seeded):
+        words = all_pages(seeded.list_library, sort="word", descending=False)
+        assert words == [f"word{i:02d}" for i in range(25)]
+
+    def test_filters(self, seeded):
+        mastered = all_pages(seeded.list_library, status=VocabularyStatus.MASTERED)
+        assert mastered == ["word20", "word15", "word10", "word05", "word00"]
+
+        window = all_pages(
+            seeded.list_library,
+            added_after=START + timedelta(days=3),
+            added_before=START + timedelta(days=6)
+        )
+        assert window == ["word05", "word04", "word03"]
+
+    def test_entries_without_added_at_span_pages(self, seeded):
+        # Legacy rows written before added_at had a default
+        seeded.db.bulk_insert_mappings(LibraryEntryModel, [
+            {"user_id": "alice", "word": f"legacy{i}", "status": VocabularyStatus.LEARNING} for i in range(6)
+        ])
+        seeded.db.query(LibraryEntryModel).filter(LibraryEntryModel.word.like("legacy%")).update(
+            {LibraryEntryModel.added_at: None}, synchronize_session=False
+        )
+        seeded.db.commit()
+        dated = [f"word{i:02d}" for i in range(25)]
+        legacy = [f"legacy{i}" for i in range(6)]
+
+        # 31 entries in pages of 4: the six undated ones cross a page boundary either way
+        assert all_pages(seeded.list_library, limit=4) == dated[::-1] + legacy[::-1]
+        assert all_pages(seeded.list_library, limit=4, descending=False) == legacy + dated
+
+    def test_contexts_only_on_request(self, seeded):
+        page = seeded.list_library("alice", limit=30)
+        item = next(i for i in page["items"] if i["word"] == "word03")
+        assert "contexts" not in item
+        assert item["context_count"] == 2
+
+        page = seeded.list_library("alice", limit=30, include_contexts=True)
+        item = next(i for i in page["items"] if i["word"] == "word03")
+        assert item["contexts"][0]["sentences"] == ["First sentence here.", "Second sentence here."]
+
+    def test_does_not_load_aggregate(self, seeded, engine):
+        engine.statements.clear()
+        seeded.list_library("alice", limit=10)
+
+        assert not any("known_words" in s for s in engine.statements)
+        assert len(engine.statements) == 2
+
+    def test_invalid_sort_and_cursor(self, seeded):
+        with pytest.raises(ValueError):
+            seeded.list_library("alice", limit=10, sort="status")
+        with pytest.raises(ValueError):
+            seeded.list_library("alice", limit=10, cursor="not-a-date|1")
+
+
+class TestVocabularyListing:
+    """词汇表分页查询"""
+
+    def test_pages_and_fields(self, seeded):
+        words = all_pages(seeded.list_vocabulary, descending=False)
+        assert words == [f"word{i:02d}" for i in range(25)]
+
+        item = seeded.list_vocabulary("alice", limit=1)["items"][0]
+        assert item["word"] == "word24"
+        assert item["status"] == "learning"
+        assert item["added_at"] == (START + timedelta(days=24)).isoformat()
+
+
+class TestCounts:
+    """计数接口"""
+
+    def test_count_by_status(self, seeded):
+        assert seeded.count_library("alice") == {"count": 25, "by_status": {"learning": 20, "mastered": 5}}
+        assert seeded.count_vocabulary("alice", VocabularyStatus.MASTERED) == {"count": 5, "by_status": {"mastered": 5}}
+        assert seeded.count_library("nobody") == {"count": 0, "by_status": {}}
+
+
+class TestService:
+    """应用服务层"""
+
+    def test_full_library_keeps_contexts(self, seeded):
+        library = UserApplicationService(seeded).get_library("alice")["library"]
+
+        assert len(library) == 25
+        assert next(i for i in library if i["word"] == "word03")["contexts"][0]["sentences"][0] == "First sentence here."
+
+    def test_unpaginated_listings_keep_insertion_order(self, seeded):
+        # Added last, but dated before every other entry
+        for model in (LibraryEntryModel, VocabularyEntryModel):
+            seeded.db.add(model(user_id="alice", word="older", added_at=START - timedelta(days=1)))
+        seeded.db.commit()
+        service = UserApplicationService(seeded)
+        inserted = [f"word{i:02d}" for i in range(25)] + ["older"]
+
+        assert [i["word"] for i in service.get_library("alice")["library"]] == inserted
+        assert [i["word"] for i in service.list_library("alice")["library"]] == inserted
+        assert [i["word"] for i in service.list_vocabulary("alice")["vocabulary"]] == inserted
+        # Paging (or an explicit order) is newest first
+        assert service.list_library("alice", limit=1)["library"][0]["word"] == "word24"
+        assert service.list_vocabulary("alice", order="asc")["vocabulary"][0]["word"] == "older"
+
+    def test_status_is_validated(self, seeded):
+        service = UserApplicationService(seeded)
+
+        assert service.list_library("alice", limit=5, status="Mastered")["library"][0]["word"] == "word20"
+        with pytest.raises(ValueError):
+            service.count_vocabulary("alice", status="forgotten")
@@ -0,0 +1,103 @@
+"""
+User Change Tracking Tests
+测试 User 聚合的变更追踪与按差异保存的 save_user
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from domain.models import User, VocabularyStatus
+from infrastructure.models import LibraryEntryModel, VocabularyEntryModel
+
+
+def seeded_user(repo, size=200):
+    user = repo.get_user("alice")
+    for i in range(size):
+        user.add_known_word(f"known{i}")
+        user.add_unknown_word(f"unknown{i}")
+        user.add_to_vocabulary(f"vocab{i}")
+        user.add_to_library([f"lib{i}"], [{"sentence": f"Sentence {i}."}])
+    repo.save_user(user)
+    return repo.get_user("alice")
+
+
+class TestDirtyTracking:
+    """测试领域模型记录的脏数据"""
+
+    def test_methods_record_touched_words(self):
+        user = User("alice")
+        assert not user.has_changes()
+
+        user.add_unknown_word("Apple")
+        assert user.dirty_words("unknown_words") == {"apple"}
+        # Marking unknown also clears known / vocabulary
+        assert user.dirty_words("known_words") == {"apple"}
+        assert user.dirty_words("vocabulary") == {"apple"}
+
+        user.add_to_library(["pear", "plum"], [{"sentence": "a"}, {"sentence": "b"}])
+        assert user.dirty_words("library") == {"pear", "plum"}
+
+        user.clear_changes()
+        assert not user.has_changes()
+
+    def test_loaded_user_is_clean(self, repo):
+        user = seeded_user(repo, size=3)
+        assert not user.has_changes()
+
+
+class TestDiffSave:
+    """测试 save_user 只写变更的行"""
+
+    def test_single_mark_touches_only_its_rows(self, repo, engine):
+        user = seeded_user(repo)
+        engine.statements.clear()
+
+        user.add_unknown_word("vocab5")
+        repo.save_user(user)
+
+        statements = " ".join(engine.statements).upper()
+        # No full-table reloads, no library rewrite
+        assert "LIBRARY_ENTRIES" not in statements
+        assert not [s for s in engine.statements if s.lstrip().upper().startswith("UPDATE")]
+        assert len(engine.statements) <= 8
+
+        reloaded = repo.get_user("alice")
+        assert "vocab5" in reloaded.unknown_words
+        assert "vocab5" not in reloaded.vocabulary
+        assert len(reloaded.vocabulary) == 199
+        assert len(reloaded.known_words) == 200
+
+    def test_updates_and_deletes_match_aggregate(self, repo):
+        user = seeded_user(repo, size=5)
+        user.add_to_library(["lib1"], [{"sentence": "Another."}])
+        user.remove_from_library("lib2")
+        user.add_known_word("unknown3")
+        user.remove_from_vocabulary("vocab4")
+        user.add_to_vocabulary("fresh")
+        repo.save_user(user)
+
+        reloaded = repo.get_user("alice")
+        assert [c["sentences"] for c in reloaded.library["lib1"].contexts] == [["Sentence 1."], ["Another."]]
+        assert "lib2" not in reloaded.library
+        assert "unknown3" in reloaded.known_words and "unknown3" not in reloaded.unknown_words
+        assert set(reloaded.vocabulary) == {"vocab0", "vocab1", "vocab2", "vocab3", "fresh"}
+        assert not user.has_changes()
+
+    def test_untouched_rows_keep_their_state(self, repo):
+        seeded_user(repo, size=3)
+        db = repo.db
+        db.query(LibraryEntryModel).filter_by(word="lib0").update({"status": VocabularyStatus.MASTERED})
+        db.query(VocabularyEntryModel).filter_by(word="vocab0").update({"attempt_count": 7})
+        db.commit()
+
+        # A stale aggregate saving an unrelated change must not overwrite them
+        stale = User("alice")
+        stale.add_known_word("kiwi")
+        repo.save_user(stale)
+
+        assert db.query(LibraryEntryModel.status).filter_by(word="lib0").scalar() == VocabularyStatus.MASTERED
+        assert db.query(VocabularyEntryModel.attempt_count).filter_by(word="vocab0").scalar() == 7
+        assert "kiwi" in repo.get_user("alice").known_words
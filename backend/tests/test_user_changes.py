@@ -0,0 +1,182 @@
+"""
+User Change Log Tests
+测试增量同步：变更序号与 /changes?since=N 的增删结果
+"""
+
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from application.services import UserApplicationService
+from infrastructure.models import UserChangeModel
+
+
+@pytest.fixture
+def service(repo):
+    return UserApplicationService(repo)
+
+
+def log(repo):
+    return [(c.collection, c.word, c.op) for c in repo.db.query(UserChangeModel).order_by(UserChangeModel.id)]
+
+
+class TestRecording:
+    """测试每次修改记录实际发生的增删"""
+
+    def test_single_word_commands(self, repo, service):
+        service.add_to_vocabulary("alice", "apple")
+        service.mark_word_as_unknown("alice", "apple")
+        service.mark_word_as_known("alice", "apple")
+
+        assert log(repo) == [
+            ("vocabulary", "apple", "add"),
+            ("unknown_words", "apple", "add"),
+            ("vocabulary", "apple", "remove"),
+            ("known_words", "apple", "add"),
+            ("unknown_words", "apple", "remove"),
+        ]
+
+    def test_no_op_records_nothing(self, repo, service):
+        service.mark_word_as_known("alice", "apple")
+        before = log(repo)
+
+        service.mark_word_as_known("alice", "apple")
+        service.unmark_word_as_unknown("alice", "pear")
+        service.remove_from_library("alice", "pear")
+
+        assert log(repo) == before
+
+    def test_bulk_and_library(self, repo, service):
+        service.mark_word_as_known("alice", "fig")
+        service.mark_words_as_unknown("alice", ["fig", "kiwi"])
+        service.add_to_library("alice", ["plum"])
+        service.remove_from_library("alice", "plum")
+
+        assert log(repo)[1:] == [
+            ("unknown_words", "fig", "add"),
+            ("unknown_words", "kiwi", "add"),
+            ("known_words", "fig", "remove"),
+            ("library", "plum", "add"),
+            ("library", "plum", "remove"),
+        ]
+
+    def test_save_user(self, repo):
+        user = repo.get_user("alice")
+        user.add_known_word("apple")
+        user.add_to_vocabulary("pear")
+        repo.save_user(user)
+
+        # Neither word was unknown: no unknown_words entries
+        assert set(log(repo)) == {
+            ("known_words", "apple", "add"),
+            ("vocabulary", "pear", "add"),
+        }
+
+    def test_save_user_re_mark_records_nothing(self, repo):
+        user = repo.get_user("alice")
+        user.add_known_word("apple")
+        repo.save_user(user)
+        before = log(repo)
+
+        user = repo.get_user("alice")
+        user.add_known_word("apple")
+        user.remove_unknown_word("never-marked")
+        user.remove_from_vocabulary("never-added")
+        repo.save_user(user)
+
+        assert log(repo) == before
+
+    def test_save_user_records_real_removals(self, repo):
+        user = repo.get_user("alice")
+        user.add_unknown_word("apple")
+        repo.save_user(user)
+
+        user = repo.get_user("alice")
+        user.add_known_word("apple")
+        repo.save_user(user)
+
+        assert log(repo)[-2:] == [
+            ("known_words", "apple", "add"),
+            ("unknown_words", "apple", "remove"),
+        ]
+
+
+class TestChangeFeed:
+    """测试按序号读取变更"""
+
+    def test_collapses_to_last_change(self, repo, service):
+        seq = service.get_user_data("alice")["seq"]
+        service.mark_word_as_known("alice", "apple")
+        service.unmark_word_as_known("alice", "apple")
+        service.mark_word_as_known("alice", "pear")
+
+        result = service.get_changes("alice", seq)
+        assert result["changes"]["known_words"] == {"added": ["pear"], "removed": ["apple"]}
+        assert result["changes"]["vocabulary"] == {"added": [], "removed": []}
+        assert result["seq"] == repo.get_change_seq("alice")
+        assert not result["has_more"] and not result["reset"]
+
+        # Nothing new since the returned seq
+        again = service.get_changes("alice", result["seq"])
+        assert again["seq"] == result["seq"]
+        assert again["changes"]["known_words"] == {"added": [], "removed": []}
+
+    def test_pages_with_has_more(self, service):
+        service.mark_words_as_known("alice", [f"word{i}" for i in range(25)])
+
+        seq, added = 0, []
+        while True:
+            result = service.get_changes("alice", seq, limit=10)
+            added += result["changes"]["known_words"]["added"]
+            seq = result["seq"]
+            if not result["has_more"]:
+                break
+        assert added == [f"word{i}" for i in range(25)]
+
+    def test_sequences_are_per_user_but_ordered(self, service):
+        service.mark_word_as_known("alice", "apple")
+        service.mark_word_as_known("bob", "pear")
+
+        assert service.get_changes("alice", 0)["changes"]["known_words"]["added"] == ["apple"]
+        assert service.get_changes("bob", 0)["seq"] > service.get_changes("alice", 0)["seq"]
+
+    def test_reset_when_ahead_of_log(self, service):
+        service.mark_word_as_known("alice", "apple")
+
+        assert service.get_changes("alice", 10_000)["reset"]
+
+    def test_deltas_reproduce_server_state(self, repo, service):
+        rng = random.Random(7)
+        words = [f"w{i}" for i in range(30)]
+        snapshot = service.get_user_data("alice")
+        client = {name: set(snapshot[name]) for name in ("known_words", "unknown_words", "vocabulary")}
+        seq = snapshot["seq"]
+
+        for _ in range(10):
+            for _ in range(20):
+                word = rng.choice(words)
+                rng.choice([
+                    service.mark_word_as_known,
+                    service.mark_word_as_unknown,
+                    service.add_to_vocabulary,
+                    service.unmark_word_as_known,
+                    service.remove_from_vocabulary,
+                ])("alice", word)
+
+            delta = service.get_changes("alice", seq)
+            for name, words_set in client.items():
+                words_set |= set(delta["changes"][name]["added"])
+                words_set -= set(delta["changes"][name]["removed"])
+            seq = delta["seq"]
+
+            user = repo.get_user("alice")
+            assert client == {
+                "known_words": user.known_words,
+                "unknown_words": user.unknown_words,
+                "vocabulary": set(user.vocabulary),
+            }
@@ -0,0 +1,139 @@
+"""
+Single-word Command Tests
+测试单词级窄事务命令（与领域模型规则一致、只触及相关行）
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from application.services import UserApplicationService
+from infrastructure.models import VocabularyEntryModel
+
+# (use case, domain method) pairs applied in the same order on both sides
+STEPS = [
+    ("mark_word_as_unknown", "add_unknown_word", "apple"),
+    ("add_to_vocabulary", "add_to_vocabulary", "apple"),
+    ("mark_word_as_known", "add_known_word", "pear"),
+    ("mark_word_as_unknown", "add_unknown_word", "Pear"),
+    ("add_to_vocabulary", "add_to_vocabulary", "plum"),
+    ("mark_word_as_unknown", "add_unknown_word", "plum"),
+    ("mark_word_as_known", "add_known_word", "plum"),
+    ("add_to_vocabulary", "add_to_vocabulary", "kiwi"),
+    ("remove_from_vocabulary", "remove_from_vocabulary", "kiwi"),
+    ("unmark_word_as_known", "remove_known_word", "plum"),
+]
+
+
+def snapshot(user):
+    return user.known_words, user.unknown_words, set(user.vocabulary), set(user.library)
+
+
+class TestCommandsMatchDomainRules:
+    """测试窄命令与 User 聚合方法结果一致"""
+
+    def test_same_state_as_aggregate(self, repo):
+        service = UserApplicationService(repo)
+        reference = repo.get_user("bob")
+        for use_case, method, word in STEPS:
+            getattr(service, use_case)("alice", word)
+            getattr(reference, method)(word)
+            assert snapshot(repo.get_user("alice")) == snapshot(reference), (use_case, word)
+
+    def test_remove_from_library(self, repo):
+        service = UserApplicationService(repo)
+        service.add_to_library("alice", ["apple", "pear"])
+        service.remove_from_library("alice", "APPLE")
+        assert set(repo.get_user("alice").library) == {"pear"}
+
+    def test_existing_vocabulary_entry_is_kept(self, repo):
+        service = UserApplicationService(repo)
+        service.add_to_vocabulary("alice", "apple")
+        repo.db.query(VocabularyEntryModel).filter_by(word="apple").update({"attempt_count": 3})
+        repo.db.commit()
+
+        service.add_to_vocabulary("alice", "apple")
+        assert repo.db.query(VocabularyEntryModel.attempt_count).filter_by(word="apple").scalar() == 3
+
+    def test_first_command_creates_user(self, repo):
+        UserApplicationService(repo).mark_word_as_known("newbie", "apple")
+        assert repo.get_user("newbie").known_words == {"apple"}
+
+
+class TestCommandCost:
+    """测试命令只触及单词相关的行"""
+
+    def test_statements_do_not_depend_on_list_size(self, repo, engine):
+        service = UserApplicationService(repo)
+        user = repo.get_user("alice")
+        for i in range(300):
+            user.add_known_word(f"known{i}")
+            user.add_to_vocabulary(f"vocab{i}")
+        user.add_to_library([f"lib{i}" for i in range(300)])
+        repo.save_user(user)
+
+        for use_case in ("mark_word_as_known", "mark_word_as_unknown", "add_to_vocabulary", "remove_from_library"):
+            engine.statements.clear()
+            getattr(service, use_case)("alice", "vocab7")
+            selects = [s for s in engine.statements if s.lstrip().upper().startswith("SELECT")]
+            # Only the users-row lookup; no list is loaded
+            assert len(selects) == 1, use_case
+            # At most three row writes plus the change log insert
+            assert len(engine.statements) <= 5, use_case
+
+
+class TestBulkCommands:
+    """测试批量标记（集合式 SQL、逐词结果）"""
+
+    def test_per_word_outcomes(self, repo):
+        service = UserApplicationService(repo)
+        service.mark_word_as_unknown("alice", "apple")
+        service.add_to_vocabulary("alice", "pear")
+        service.mark_word_as_unknown("alice", "plum")
+        service.mark_word_as_known("alice", "kiwi")
+
+        result = service.mark_words_as_known("alice", ["Apple", "kiwi", "fig", "", "APPLE", "plum"])
+        assert result["results"] == [
+            {"word": "apple", "status": "added", "removed_from": ["unknown_words"]},
+            {"word": "kiwi", "status": "unchanged", "removed_from": []},
+            {"word": "fig", "status": "added", "removed_from": []},
+            {"word": "", "status": "invalid", "removed_from": []},
+            {"word": "plum", "status": "added", "removed_from": ["unknown_words"]},
+        ]
+        assert result["counts"] == {"added": 3, "unchanged": 1, "invalid": 1}
+
+        result = service.mark_words_as_unknown("alice", ["pear", "fig"])
+        assert [r["removed_from"] for r in result["results"]] == [["vocabulary"], ["known_words"]]
+
+        user = repo.get_user("alice")
+        assert user.known_words == {"apple", "kiwi", "plum"}
+        assert user.unknown_words == {"pear", "fig"}
+        assert user.vocabulary == {}
+
+        result = service.unmark_words_as_unknown("alice", ["pear", "grape"])
+        assert [r["status"] for r in result["results"]] == ["removed", "unchanged"]
+        assert repo.get_user("alice").unknown_words == {"fig"}
+
+    def test_matches_single_word_commands(self, repo):
+        service = UserApplicationService(repo)
+        words = [f"word{i}" for i in range(20)]
+        for user_id in ("bulk", "single"):
+            service.add_to_vocabulary(user_id, "word3")
+            service.mark_word_as_known(user_id, "word5")
+
+        service.mark_words_as_unknown("bulk", words)
+        for word in words:
+            service.mark_word_as_unknown("single", word)
+        assert snapshot(repo.get_user("bulk")) == snapshot(repo.get_user("single"))
+
+    def test_statement_count_is_constant(self, repo, engine):
+        service = UserApplicationService(repo)
+        service.mark_word_as_known("alice", "seed")
+
+        engine.statements.clear()
+        service.mark_words_as_unknown("alice", [f"word{i}" for i in range(200)])
+        # users lookup, 3 existence checks, 2 deletes, 1 multi-row insert
+        assert len(engine.statements) <= 8
+        assert len(repo.get_user("alice").unknown_words) == 200
@@ -0,0 +1,71 @@
+"""
+New User Provisioning Tests
+测试新用户创建：默认黑名单一次批量写入，与老用户请求开销相当
+"""
+
+import sys
+from pathlib import Path
+
+from sqlalchemy.orm import sessionmaker
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from infrastructure.models import DomainManagementPolicy, DomainPolicyType, UserModel
+from infrastructure.repositories import DEFAULT_BLACKLIST, UserRepository
+
+
+def blacklist(repo, user_id):
+    return {
+        domain for (domain,) in repo.db.query(DomainManagementPolicy.domain).filter(
+            DomainManagementPolicy.user_id == user_id,
+            DomainManagementPolicy.policy_type == DomainPolicyType.BLACKLIST
+        )
+    }
+
+
+class TestFirstRequest:
+    """测试新用户首个请求的数据库开销"""
+
+    def test_defaults_in_one_insert(self, repo, engine):
+        engine.statements.clear()
+        repo.get_highlight_profile("newbie")
+
+        policy_statements = [s for s in engine.statements if "domain_management_policies" in s]
+        assert len(policy_statements) == 1
+        assert policy_statements[0].lstrip().upper().startswith("INSERT")
+        # change seq, users lookup, users insert, policies insert, known / unknown reads
+        assert len(engine.statements) <= 6
+        assert blacklist(repo, "newbie") == {item["domain"] for item in DEFAULT_BLACKLIST}
+
+    def test_get_user_creates_once(self, repo):
+        repo.get_user("newbie")
+        repo.get_user("newbie")
+
+        assert repo.db.query(UserModel).count() == 1
+        assert repo.db.query(DomainManagementPolicy).count() == len(DEFAULT_BLACKLIST)
+
+    def test_concurrent_creation_is_a_no_op(self, engine, repo):
+        other = UserRepository(sessionmaker(bind=engine)())
+        # Both requests saw no users row; the second one to create it does nothing
+        repo._create_user("newbie")
+        other._create_user("newbie")
+
+        assert repo.db.query(DomainManagementPolicy).count() == len(DEFAULT_BLACKLIST)
+        other.db.close()
+
+    def test_existing_domains_are_kept(self, repo):
+        repo.db.add(UserModel(user_id="newbie"))
+        repo.db.add(DomainManagementPolicy(
+            user_id="newbie",
+            domain="github.com",
+            policy_type=DomainPolicyType.BLACKLIST,
+            description="mine"
+        ))
+        repo.db.commit()
+
+        repo._import_default_blacklist("newbie")
+        repo.db.commit()
+
+        assert repo.db.query(DomainManagementPolicy.description).filter_by(domain="github.com").scalar() == "mine"
+        assert blacklist(repo, "newbie") == {item["domain"] for item in DEFAULT_BLACKLIST}
@@ -5,8 +5,10 @@ import sys
 backend_path = os.path.abspath(os.path.join(os.getcwd(), 'backend'))
 sys.path.insert(0, backend_path)
 
+from sqlalchemy import func
+
 from infrastructure.database import SessionLocal
-from infrastructure.models import LibraryEntryModel, UnknownWordModel, UserModel
+from infrastructure.models import KnownWordModel, LibraryContextModel, LibraryEntryModel, UnknownWordModel, UserModel
 
 
 def check_user(user_id):
@@ -20,16 +22,28 @@ def check_user(user_id):
         print(f"👤 User: {user_id}")
         print(f"📅 Created at: {user.created_at}")
         
-        known_words = user.get_known_words()
-        print(f"✅ Known words ({len(known_words)}): {list(known_words)}")
+        known_words = [w.word for w in db.query(KnownWordModel).filter_by(user_id=user_id).all()]
+        print(f"✅ Known words ({len(known_words)}): {known_words}")
+        legacy_known_words = user.get_legacy_known_words()
+        if legacy_known_words:
+            print(f"⏳ Known words not yet migrated ({len(legacy_known_words)}): {sorted(legacy_known_words)}")
 
         unknown_words = db.query(UnknownWordModel).filter_by(user_id=user_id).all()
         print(f"❓ Unknown words ({len(unknown_words)}): {[w.word for w in unknown_words]}")
 
         library_entries = db.query(LibraryEntryModel).filter_by(user_id=user_id).all()
+        context_counts = dict(
+            db.query(LibraryContextModel.entry_id, func.count(LibraryContextModel.id))
+            .join(LibraryEntryModel, LibraryContextModel.entry_id == LibraryEntryModel.id)
+            .filter(LibraryEntryModel.user_id == user_id)
+            .group_by(LibraryContextModel.entry_id)
+            .all()
+        )
         print(f"📚 Library entries ({len(library_entries)}):")
         for entry in library_entries:
-            print(f"  - {entry.word} (contexts: {len(entry.get_contexts())})")
+            legacy = len(entry.get_legacy_contexts())
+            pending = f", not yet migrated: {legacy}" if legacy else ""
+            print(f"  - {entry.word} (contexts: {context_counts.get(entry.id, 0)}{pending})")
 
     finally:
         db.close()